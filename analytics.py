@@ -2,10 +2,11 @@ import logging
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from user_agents import parse
-import requests
 import os
 import streamlit as st
 from user_journey_tracker import JourneyEventType
+from ip_tracker import IPTracker
+from services import get_journey_tracker
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -13,20 +14,18 @@ logger = logging.getLogger(__name__)
 class Analytics:
     def __init__(self, db):
         self.db = db
-        self.ip_api_url = "http://ip-api.com/json/"  # Free IP geolocation API
+        self.ip_tracker = IPTracker()
 
     def get_geo_data(self, ip_address: str) -> Dict[str, str]:
-        """Get geolocation data from IP address using free IP API"""
+        """Get geolocation data from IP address via the shared, cached IP lookup"""
         try:
             if ip_address and ip_address not in ('127.0.0.1', 'localhost', ''):
-                response = requests.get(f"{self.ip_api_url}{ip_address}")
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('status') == 'success':
-                        return {
-                            'country': data.get('country', 'Unknown'),
-                            'city': data.get('city', 'Unknown')
-                        }
+                details = self.ip_tracker.lookup_ip_details(ip_address)
+                if details:
+                    return {
+                        'country': details.get('country', 'Unknown'),
+                        'city': details.get('city', 'Unknown')
+                    }
         except Exception as e:
             logger.warning(f"Error getting geo data for IP {ip_address}: {str(e)}")
         
@@ -152,11 +151,13 @@ class Analytics:
             )
 
             # Track in journey if available
-            if hasattr(st.session_state, 'journey_tracker') and st.session_state.journey_tracker:
-                st.session_state.journey_tracker.track_event(
+            journey_tracker = get_journey_tracker()
+            if journey_tracker:
+                journey_tracker.track_event(
                     event_type=JourneyEventType.CUSTOM_EVENT,
                     event_name=event_type,
-                    event_data=event_data
+                    custom_params=event_data,
+                    session_id=st.session_state.get('journey_session_id')
                 )
 
             logger.info(f"Tracked event {event_type}: {event_data}")
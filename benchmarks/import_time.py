@@ -0,0 +1,148 @@
+"""
+Import-time benchmark and budget check for the app's entry points.
+
+Imports each entry point in a fresh interpreter under `python -X importtime`,
+parses the per-module timings from stderr and reports the cumulative import
+time (best of --repeat runs) with the heaviest modules it pulled in. Each
+entry point has a time budget and a list of modules it must not import at
+load time. --check exits non-zero when either is violated;
+tests/test_import_time.py runs the same check under pytest:
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --check --output imports.json
+    python benchmarks/import_time.py --check --budget-scale 2   # slower CI machines
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Any, Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Entry point -> cumulative import budget (ms) and modules it must not load
+ENTRY_POINTS = {
+    'database': {
+        'budget_ms': 150,
+        'forbidden': ('streamlit', 'pandas', 'plotly', 'requests', 'user_agents')
+    },
+    'redirect_server': {
+        'budget_ms': 200,
+        'forbidden': ('streamlit', 'pandas', 'plotly', 'requests', 'user_agents')
+    },
+    'click_writer': {
+        'budget_ms': 100,
+        'forbidden': ('streamlit', 'pandas', 'requests')
+    },
+    'enrichment_worker': {
+        'budget_ms': 300,
+        'forbidden': ('streamlit', 'pandas', 'plotly')
+    },
+    'app': {
+        'budget_ms': 1200,
+        'forbidden': ('pandas', 'plotly.express', 'qrcode', 'google.analytics', 'user_agents', 'requests')
+    }
+}
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """Parse -X importtime output into (module, self_us, cumulative_us, depth) rows"""
+    rows = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return rows
+
+
+def measure(entry_point: str) -> List[Tuple[str, int, int, int]]:
+    """Import an entry point in a fresh interpreter and return the timings of it and its imports"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1', ENRICHMENT_IN_PROCESS='0')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {entry_point}'],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {entry_point} failed:\n{result.stderr[-2000:]}")
+    rows = parse_importtime(result.stderr)
+    # Modules are listed after their imports, so the entry point's tree is the
+    # run of nested rows just before its own top-level row
+    end = next(i for i, row in enumerate(rows) if row[0] == entry_point and row[3] == 0)
+    start = end
+    while start > 0 and rows[start - 1][3] > 0:
+        start -= 1
+    return rows[start:end + 1]
+
+
+def run_benchmark(args) -> Dict[str, Any]:
+    """Measure every entry point and check it against its budget"""
+    results = {'meta': {'python': sys.version.split()[0], 'repeat': args.repeat,
+                        'budget_scale': args.budget_scale},
+               'entry_points': {}}
+    for entry_point, spec in ENTRY_POINTS.items():
+        if args.only and entry_point not in args.only:
+            continue
+        runs = [measure(entry_point) for _ in range(args.repeat)]
+        totals = [rows[-1][2] for rows in runs]
+        best = runs[totals.index(min(totals))]
+
+        loaded = {row[0] for row in best}
+        forbidden = sorted(
+            name for name in spec['forbidden']
+            if any(module == name or module.startswith(name + '.') for module in loaded)
+        )
+        budget_ms = spec['budget_ms'] * args.budget_scale
+        total_ms = round(min(totals) / 1000, 1)
+        heaviest = sorted(best[:-1], key=lambda row: row[2], reverse=True)
+        results['entry_points'][entry_point] = {
+            'total_ms': total_ms,
+            'budget_ms': budget_ms,
+            'modules': len(best) - 1,
+            'forbidden_loaded': forbidden,
+            'ok': total_ms <= budget_ms and not forbidden,
+            'heaviest': [
+                {'module': module, 'cumulative_ms': round(cumulative / 1000, 1)}
+                for module, _, cumulative, depth in heaviest if depth == 1
+            ][:args.top]
+        }
+    return results
+
+
+def report(results: Dict[str, Any]):
+    """Print a per-entry-point summary"""
+    print(f"{'entry point':20} {'import ms':>10} {'budget':>8} {'modules':>8}  status")
+    for entry_point, data in results['entry_points'].items():
+        status = 'ok' if data['ok'] else 'OVER BUDGET'
+        if data['forbidden_loaded']:
+            status = f"loads {', '.join(data['forbidden_loaded'])}"
+        print(f"{entry_point:20} {data['total_ms']:>10} {data['budget_ms']:>8g} {data['modules']:>8}  {status}")
+        for item in data['heaviest']:
+            print(f"{'':22}{item['module']:40} {item['cumulative_ms']:>8} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure entry-point import times against their budgets")
+    parser.add_argument('--repeat', type=int, default=3, help="Fresh interpreters per entry point (best is kept)")
+    parser.add_argument('--top', type=int, default=5, help="Heaviest direct imports to list")
+    parser.add_argument('--only', nargs='+', choices=list(ENTRY_POINTS), help="Entry points to measure")
+    parser.add_argument('--budget-scale', type=float, default=1.0, help="Multiply every time budget")
+    parser.add_argument('--check', action='store_true', help="Exit 1 if any budget is exceeded")
+    parser.add_argument('--output', help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    results = run_benchmark(args)
+    report(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.check and not all(data['ok'] for data in results['entry_points'].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
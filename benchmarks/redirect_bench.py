@@ -0,0 +1,324 @@
+"""
+Redirect-path load benchmark.
+
+Drives Database.handle_redirect -> record_click -> enrichment at a fixed
+concurrency against a synthetic urls.db in a temp directory. Local stub HTTP
+servers stand in for ip-api, ipapi.co and ipinfo, so nothing leaves the
+machine. Reports redirect latency percentiles, throughput, click-writer and
+enrichment lock waits, and writes JSON that can be compared across commits:
+
+    python benchmarks/redirect_bench.py --requests 20000 --concurrency 32 --output after.json
+    python benchmarks/redirect_bench.py --compare before.json after.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+logger = logging.getLogger('redirect_bench')
+
+STATES = ['Maharashtra', 'Delhi', 'Karnataka', 'Tamil Nadu', 'Telangana', 'Gujarat']
+USER_AGENTS = [
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 Mobile/15E148',
+    'Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 Chrome/120.0 Mobile Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120.0 Safari/537.36'
+]
+
+# Metrics shown by --compare, with whether lower is better
+COMPARE_METRICS = [
+    ('redirect.p50_ms', True),
+    ('redirect.p95_ms', True),
+    ('redirect.p99_ms', True),
+    ('redirect.throughput_rps', False),
+    ('redirect.errors', True),
+    ('click_writer.lock_wait_ms', True),
+    ('click_writer.max_lock_wait_ms', True),
+    ('enrichment.drain_seconds', True),
+    ('enrichment.lock_wait_ms', True),
+    ('enrichment.max_lock_wait_ms', True),
+    ('stubs.requests', True)
+]
+
+
+def start_stub(kind: str, latency_ms: float, error_rate: float) -> ThreadingHTTPServer:
+    """Start a stub geolocation provider answering in the given provider's format"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            Handler.server_ref.hits += 1
+            time.sleep(latency_ms / 1000.0)
+            if random.random() < error_rate:
+                self.send_response(503)
+                self.send_header('content-length', '0')
+                self.end_headers()
+                return
+
+            state = random.choice(STATES)
+            if kind == 'ip-api':
+                payload = {'status': 'success', 'country': 'India', 'regionName': state,
+                           'city': 'Stub City', 'isp': 'Stub ISP', 'as': 'AS64500 Stub'}
+            elif kind == 'ipapi.co':
+                payload = {'country_name': 'India', 'region': state, 'city': 'Stub City',
+                           'org': 'Stub ISP', 'asn': 'AS64500'}
+            else:
+                payload = {'country': 'IN', 'region': state, 'city': 'Stub City',
+                           'org': 'AS64500 Stub ISP', 'loc': '19.07,72.87'}
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(200)
+            self.send_header('content-type', 'application/json')
+            self.send_header('content-length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    server.hits = 0
+    Handler.server_ref = server
+    threading.Thread(target=server.serve_forever, name=f"stub:{kind}", daemon=True).start()
+    return server
+
+
+def create_synthetic_db(path: str, links: int) -> List[str]:
+    """Create a fresh urls.db with the given number of active links"""
+    import sqlite3
+    from database import Database
+
+    Database(path)
+    codes = [f"b{i:05d}" for i in range(links)]
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO urls (short_code, original_url, campaign_name, campaign_type) VALUES (?, ?, ?, ?)",
+        [(code, f"https://example.com/landing/{i}", f"bench-{i}", 'Bench') for i, code in enumerate(codes)]
+    )
+    conn.commit()
+    conn.close()
+    return codes
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def git_commit() -> str:
+    """Get the current commit hash, if the tree is a git checkout"""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return 'unknown'
+
+
+def run_benchmark(args) -> Dict[str, Any]:
+    """Run one benchmark and return the results"""
+    workdir = tempfile.mkdtemp(prefix='redirect-bench-')
+    db_path = os.path.join(workdir, 'urls.db')
+
+    # Keep every side effect inside the temp directory
+    os.environ['URLS_DB_PATH'] = db_path
+    os.environ['CLICK_LOG_DIR'] = os.path.join(workdir, 'click_logs')
+    os.environ['GEOIP_INDEX_PATH'] = args.geoip_index or os.path.join(workdir, 'no-geoip.idx')
+    os.environ['ENRICHMENT_IN_PROCESS'] = '1' if args.enrich else '0'
+
+    from ip_lookup_client import IPLookupClient, Provider, set_ip_lookup_client
+
+    stubs = {kind: start_stub(kind, args.stub_latency_ms, args.stub_error_rate)
+             for kind in ('ip-api', 'ipapi.co', 'ipinfo')}
+    templates = {
+        'ip-api': 'http://127.0.0.1:{port}/json/{{ip}}',
+        'ipapi.co': 'http://127.0.0.1:{port}/{{ip}}/json/',
+        'ipinfo': 'http://127.0.0.1:{port}/{{ip}}/json'
+    }
+    set_ip_lookup_client(IPLookupClient([
+        Provider(kind, templates[kind].format(port=server.server_port))
+        for kind, server in stubs.items()
+    ]))
+
+    from database import Database, url_cache
+    from click_writer import get_click_writer, stop_click_writers
+    from enrichment_worker import get_enrichment_worker, stop_enrichment_workers
+    from ip_tracker import ip_cache
+
+    codes = create_synthetic_db(db_path, args.links)
+    db = Database(db_path)
+    rng = random.Random(args.seed)
+    # A small hot set gets most of the traffic, like real campaigns
+    hot = codes[:max(1, len(codes) // 20)]
+    ips = [f"49.{36 + i // 65536 % 3}.{i // 256 % 256}.{i % 256}" for i in range(args.ips)]
+    plan = [
+        (rng.choice(hot) if rng.random() < 0.8 else rng.choice(codes), rng.choice(ips), rng.choice(USER_AGENTS))
+        for _ in range(args.requests)
+    ]
+
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def hit(item):
+        nonlocal errors
+        code, ip, user_agent = item
+        client_info = {
+            'ip_address': ip,
+            'user_agent': user_agent,
+            'referrer': 'https://www.google.com/',
+            'device_type': 'Mobile' if 'Mobile' in user_agent else 'Desktop',
+            'browser': 'Chrome',
+            'os': 'Android'
+        }
+        start = time.perf_counter()
+        target = db.handle_redirect(code, client_info)
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed)
+            if not target:
+                errors += 1
+
+    # Warm the process (imports, first connections) outside the measurement
+    for item in plan[:min(50, len(plan))]:
+        hit(item)
+    latencies.clear()
+    errors = 0
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(hit, plan))
+    duration = time.perf_counter() - start
+
+    writer = get_click_writer(db_path)
+    writer.flush(timeout=60)
+    persisted_at = time.perf_counter() - start
+
+    drain_seconds = None
+    enrichment_stats = {}
+    if args.enrich:
+        worker = get_enrichment_worker(db_path)
+        drain_start = time.perf_counter()
+        while worker.backlog() and time.perf_counter() - drain_start < args.drain_timeout:
+            time.sleep(0.05)
+        drain_seconds = round(time.perf_counter() - drain_start, 3)
+        enrichment_stats = worker.stats()
+    stop_enrichment_workers()
+    stop_click_writers()
+
+    latencies.sort()
+    results = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'config': {k: v for k, v in vars(args).items() if k not in ('compare', 'output')}
+        },
+        'redirect': {
+            'requests': len(latencies),
+            'errors': errors,
+            'duration_seconds': round(duration, 3),
+            'throughput_rps': round(len(latencies) / duration, 1) if duration else 0,
+            'mean_ms': round(sum(latencies) / len(latencies), 3) if latencies else 0,
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p95_ms': round(percentile(latencies, 95), 3),
+            'p99_ms': round(percentile(latencies, 99), 3),
+            'max_ms': round(latencies[-1], 3) if latencies else 0,
+            'persisted_seconds': round(persisted_at, 3)
+        },
+        'click_writer': writer.stats(),
+        'enrichment': {'drain_seconds': drain_seconds, **enrichment_stats},
+        'url_cache': url_cache.stats(),
+        'ip_cache': ip_cache.stats(),
+        'stubs': {'requests': sum(server.hits for server in stubs.values())}
+    }
+
+    for server in stubs.values():
+        server.shutdown()
+    if not args.keep:
+        shutil.rmtree(workdir, ignore_errors=True)
+    else:
+        results['meta']['workdir'] = workdir
+    return results
+
+
+def get_metric(results: Dict[str, Any], path: str):
+    value = results
+    for key in path.split('.'):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def compare(baseline: Dict[str, Any], candidate: Dict[str, Any]):
+    """Print a metric-by-metric comparison of two result files"""
+    print(f"{'metric':34} {'baseline':>12} {'candidate':>12} {'change':>9}")
+    for path, lower_is_better in COMPARE_METRICS:
+        before, after = get_metric(baseline, path), get_metric(candidate, path)
+        if before is None or after is None:
+            continue
+        if before:
+            change = (after - before) / before * 100
+            better = change < 0 if lower_is_better else change > 0
+            marker = '' if abs(change) < 1 else (' +' if better else ' -')
+            change_text = f"{change:+.1f}%{marker}"
+        else:
+            change_text = 'n/a'
+        print(f"{path:34} {before:>12} {after:>12} {change_text:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the redirect -> click -> enrichment path")
+    parser.add_argument('--requests', type=int, default=5000, help="Redirects to issue")
+    parser.add_argument('--concurrency', type=int, default=16, help="Concurrent redirect threads")
+    parser.add_argument('--links', type=int, default=1000, help="Links in the synthetic database")
+    parser.add_argument('--ips', type=int, default=500, help="Distinct client IPs")
+    parser.add_argument('--stub-latency-ms', type=float, default=50.0, help="Stub provider response time")
+    parser.add_argument('--stub-error-rate', type=float, default=0.0, help="Fraction of stub responses that are 503")
+    parser.add_argument('--geoip-index', help="Use this offline GeoIP index instead of the stubs")
+    parser.add_argument('--no-enrich', dest='enrich', action='store_false', help="Skip the enrichment phase")
+    parser.add_argument('--drain-timeout', type=float, default=120.0, help="Max seconds to wait for enrichment")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--keep', action='store_true', help="Keep the temp directory with the database")
+    parser.add_argument('--output', help="Write JSON results to this file")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CANDIDATE'),
+                        help="Compare two result files instead of running")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            candidate = json.load(f)
+        compare(baseline, candidate)
+        return
+
+    results = run_benchmark(args)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
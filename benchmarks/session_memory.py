@@ -0,0 +1,201 @@
+"""
+Per-session memory benchmark for the Streamlit dashboard.
+
+Opens --sessions logged-in dashboard sessions of app.py with Streamlit's
+AppTest harness against a synthetic urls.db in a temp directory, and keeps
+them all alive. It measures the Python memory they hold (tracemalloc, after
+a warm-up session has loaded modules and process-wide caches), the
+first-run time per session, and how many service objects (Database, Auth,
+URLShortener, ...) exist in the process. --root points at another checkout,
+so results can be compared across commits:
+
+    python benchmarks/session_memory.py --sessions 100 --output after.json
+    python benchmarks/session_memory.py --root ../shortlinks-old --output before.json
+    python benchmarks/session_memory.py --compare before.json after.json
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+logger = logging.getLogger('session_memory')
+
+USER = {'username': 'bench', 'role': 'admin', 'organization': 'bench', 'is_authenticated': True}
+
+# Classes whose instances should not grow with the number of sessions
+SERVICE_CLASSES = ('Database', 'QueryMemo', 'Auth', 'GoogleAnalytics', 'UserJourneyTracker', 'URLShortener', 'UI', 'Organization')
+
+COMPARE_METRICS = [
+    ('sessions.bytes_per_session', True),
+    ('sessions.total_bytes', True),
+    ('sessions.first_run_ms.mean', True),
+    ('sessions.first_run_ms.p95', True),
+    ('services.Database', True),
+    ('services.URLShortener', True),
+    ('services.Auth', True),
+    ('services.UserJourneyTracker', True),
+    ('session_state.service_objects_per_session', True)
+]
+
+
+def seed_database(links: int):
+    """Create the synthetic links the dashboard pages list"""
+    from database import Database
+    db = Database()
+    db.create_short_urls_bulk([
+        {'url': f"https://example.com/landing/{i}", 'campaign_name': f"bench-{i}", 'campaign_type': 'Email'}
+        for i in range(links)
+    ])
+
+
+def open_session(app_path: str, timeout: float):
+    """Open one logged-in dashboard session and run it once"""
+    from streamlit.testing.v1 import AppTest
+    session = AppTest.from_file(app_path, default_timeout=timeout)
+    session.session_state['user'] = dict(USER)
+    started = time.perf_counter()
+    session.run()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if session.exception:
+        raise RuntimeError(f"app raised: {session.exception[0].value}")
+    return session, elapsed_ms
+
+
+def count_services() -> Dict[str, int]:
+    """Count live instances of the service classes"""
+    counts = Counter(type(obj).__name__ for obj in gc.get_objects() if type(obj).__name__ in SERVICE_CLASSES)
+    return {name: counts.get(name, 0) for name in SERVICE_CLASSES}
+
+
+def run_benchmark(args) -> Dict[str, Any]:
+    """Open the sessions and collect the results"""
+    root = os.path.abspath(args.root)
+    sys.path.insert(0, root)
+    app_path = os.path.join(root, 'app.py')
+
+    workdir = tempfile.mkdtemp(prefix='session_memory_')
+    os.environ['URLS_DB_PATH'] = os.path.join(workdir, 'urls.db')
+    os.environ.setdefault('CLICK_LOG_ENABLED', '0')
+    os.environ.setdefault('ENRICHMENT_IN_PROCESS', '0')
+    os.chdir(workdir)
+    try:
+        seed_database(args.links)
+
+        # Load modules and process-wide caches before measuring
+        warmup, _ = open_session(app_path, args.timeout)
+        del warmup
+        gc.collect()
+
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        sessions, first_runs = [], []
+        for _ in range(args.sessions):
+            session, elapsed_ms = open_session(app_path, args.timeout)
+            sessions.append(session)
+            first_runs.append(elapsed_ms)
+        gc.collect()
+        total_bytes = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+
+        services = count_services()
+        state = sessions[-1].session_state
+        service_keys = sorted(key for key in state.keys() if type(state[key]).__name__ in SERVICE_CLASSES)
+        first_runs.sort()
+        results = {
+            'meta': {
+                'root': root,
+                'python': platform.python_version(),
+                'sessions': args.sessions,
+                'links': args.links
+            },
+            'sessions': {
+                'total_bytes': total_bytes,
+                'bytes_per_session': round(total_bytes / args.sessions),
+                'first_run_ms': {
+                    'mean': round(statistics.mean(first_runs), 1),
+                    'p50': round(first_runs[len(first_runs) // 2], 1),
+                    'p95': round(first_runs[min(len(first_runs) - 1, int(len(first_runs) * 0.95))], 1)
+                }
+            },
+            'services': services,
+            'session_state': {
+                'keys': sorted(state.keys()),
+                'service_keys': service_keys,
+                'service_objects_per_session': len(service_keys)
+            }
+        }
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def get_metric(results: Dict[str, Any], path: str):
+    value = results
+    for key in path.split('.'):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def compare(baseline: Dict[str, Any], candidate: Dict[str, Any]):
+    """Print a metric-by-metric comparison of two result files"""
+    print(f"{'metric':42} {'baseline':>12} {'candidate':>12} {'change':>9}")
+    for path, lower_is_better in COMPARE_METRICS:
+        before, after = get_metric(baseline, path), get_metric(candidate, path)
+        if before is None or after is None:
+            continue
+        if before:
+            change = (after - before) / before * 100
+            better = change < 0 if lower_is_better else change > 0
+            marker = '' if abs(change) < 1 else (' +' if better else ' -')
+            change_text = f"{change:+.1f}%{marker}"
+        else:
+            change_text = 'n/a'
+        print(f"{path:42} {before:>12} {after:>12} {change_text:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure memory held per dashboard session")
+    parser.add_argument('--sessions', type=int, default=50, help="Concurrent sessions to open")
+    parser.add_argument('--links', type=int, default=200, help="Links in the synthetic database")
+    parser.add_argument('--root', default=ROOT, help="Checkout whose app.py is measured")
+    parser.add_argument('--timeout', type=float, default=60.0, help="Seconds allowed per session run")
+    parser.add_argument('--output', help="Write JSON results to this file")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CANDIDATE'),
+                        help="Compare two result files instead of running")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            candidate = json.load(f)
+        compare(baseline, candidate)
+        return
+
+    results = run_benchmark(args)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
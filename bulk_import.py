@@ -0,0 +1,91 @@
+"""
+Bulk short-link import from CSV.
+
+CSV header (case-insensitive): url, campaign_name, and optionally
+campaign_type, utm_source, utm_medium, utm_campaign, utm_content, utm_term.
+
+    python bulk_import.py links.csv --output created.csv --errors errors.csv
+"""
+import argparse
+import csv
+import logging
+import os
+import sys
+from typing import Dict, Iterator, List, TextIO
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Accepted spellings for the columns create_short_urls_bulk reads
+HEADER_ALIASES = {
+    'original_url': 'url',
+    'long_url': 'url',
+    'campaign': 'campaign_name',
+    'name': 'campaign_name',
+    'type': 'campaign_type'
+}
+
+CREATED_FIELDS = ['row', 'short_code', 'campaign_name', 'original_url']
+ERROR_FIELDS = ['row', 'campaign_name', 'error']
+
+
+def normalize_header(name: str) -> str:
+    """Map a CSV header to the field name used by the bulk API"""
+    key = (name or '').strip().lower().replace(' ', '_').replace('-', '_')
+    return HEADER_ALIASES.get(key, key)
+
+
+def parse_rows(file_obj: TextIO) -> Iterator[Dict[str, str]]:
+    """Stream CSV rows as dicts keyed by normalized header names"""
+    reader = csv.reader(file_obj)
+    try:
+        header = [normalize_header(name) for name in next(reader)]
+    except StopIteration:
+        return
+    for values in reader:
+        if not any(value.strip() for value in values):
+            continue
+        yield dict(zip(header, values))
+
+
+def write_report(path: str, rows: List[Dict], fieldnames: List[str]):
+    """Write created links or errors as CSV"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create short links in bulk from a CSV file")
+    parser.add_argument('csv_path', help="CSV with url and campaign_name columns")
+    parser.add_argument('--db', default=os.getenv('URLS_DB_PATH', 'urls.db'), help="Path to urls.db")
+    parser.add_argument('--chunk-size', type=int, default=1000, help="Rows per transaction")
+    parser.add_argument('--output', help="Write created links to this CSV")
+    parser.add_argument('--errors', help="Write rejected rows to this CSV")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    from database import Database
+    db = Database(args.db)
+    with open(args.csv_path, newline='', encoding='utf-8-sig') as f:
+        result = db.create_short_urls_bulk(parse_rows(f), chunk_size=args.chunk_size)
+
+    if args.output:
+        write_report(args.output, result['created'], CREATED_FIELDS)
+    if args.errors:
+        write_report(args.errors, result['errors'], ERROR_FIELDS)
+    elif result['errors']:
+        for error in result['errors'][:20]:
+            logger.warning(f"Row {error['row']} ({error['campaign_name']}): {error['error']}")
+
+    logger.info(f"Created {len(result['created'])} links, rejected {len(result['errors'])} rows")
+    sys.exit(1 if result['errors'] and not result['created'] else 0)
+
+
+if __name__ == "__main__":
+    main()
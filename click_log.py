@@ -0,0 +1,371 @@
+"""
+Append-only JSONL click event log.
+
+Events are queued and written by a background thread in batches, one JSON
+object per line, to segments named clicks-<start time>-<pid>.jsonl. A
+segment is closed once it reaches CLICK_LOG_MAX_BYTES or CLICK_LOG_MAX_AGE
+seconds and then gzip-compressed. read_events() streams every segment back
+in order, and the log can be replayed into analytics with:
+    python click_log.py replay --db urls.db --since "2024-01-01 00:00:00"
+Replay skips clicks analytics already holds, so overlapping runs are safe.
+"""
+import argparse
+import atexit
+import glob
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = 'clicks-'
+
+
+class ClickLog:
+    """Buffered, rotating JSONL event log drained by a single background thread"""
+
+    def __init__(self, directory: str = 'click_logs', max_bytes: int = 64 * 1024 * 1024,
+                 max_age: float = 3600.0, flush_interval: float = 1.0,
+                 max_queue_size: int = 10000, compress: bool = True):
+        """Initialize rotation limits, queue and counters"""
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.flush_interval = flush_interval
+        self.compress = compress
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._stop = threading.Event()
+        self._thread = None
+
+        self._file = None
+        self._path = None
+        self._opened_at = 0.0
+        self._bytes = 0
+
+        self._pending = 0
+        self._pending_cond = threading.Condition()
+
+        self.logged = 0
+        self.written = 0
+        self.dropped = 0
+        self.segments = 0
+
+    def start(self):
+        """Start the background writer thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"click-log:{self.directory}", daemon=True)
+        self._thread.start()
+
+    def log(self, kind: str, data: Dict[str, Any]) -> bool:
+        """Queue an event without blocking; returns False if the buffer is full"""
+        with self._pending_cond:
+            self._pending += 1
+        try:
+            self._queue.put_nowait({'kind': kind, 'logged_at': time.time(), **data})
+        except queue.Full:
+            self.dropped += 1
+            self._done(1)
+            return False
+        self.logged += 1
+        return True
+
+    def flush(self, timeout: float = None) -> bool:
+        """Block until every queued event has been written"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._pending_cond:
+            while self._pending:
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._pending_cond.wait(remaining)
+        return True
+
+    def stop(self, timeout: float = 10.0):
+        """Flush, close the current segment and stop the writer thread"""
+        if not self._thread:
+            return
+        self.flush(timeout)
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get buffer and segment counters"""
+        return {
+            'queue_depth': self._queue.qsize(),
+            'logged': self.logged,
+            'written': self.written,
+            'dropped': self.dropped,
+            'segments': self.segments,
+            'current_segment': self._path,
+            'current_bytes': self._bytes
+        }
+
+    def _done(self, count: int):
+        """Mark events as fully processed"""
+        with self._pending_cond:
+            self._pending -= count
+            if self._pending <= 0:
+                self._pending_cond.notify_all()
+
+    def _run(self):
+        """Write queued events in batches until stopped"""
+        while not self._stop.is_set() or not self._queue.empty():
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                self._rotate_if_due()
+                continue
+            while len(batch) < 1000:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self._write(batch)
+            except Exception as e:
+                logger.error(f"Error writing click log: {str(e)}")
+            finally:
+                self._done(len(batch))
+        self._close_segment()
+
+    def _write(self, batch: List[Dict[str, Any]]):
+        """Append a batch of events to the current segment with a single write"""
+        if self._file is None:
+            self._open_segment()
+        data = ''.join(json.dumps(event, separators=(',', ':'), default=str) + '\n' for event in batch)
+        self._file.write(data)
+        self._file.flush()
+        self._bytes += len(data.encode('utf-8'))
+        self.written += len(batch)
+        self._rotate_if_due()
+
+    def _open_segment(self):
+        """Start a new segment file"""
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        self._path = os.path.join(self.directory, f"{SEGMENT_PREFIX}{stamp}-{os.getpid()}.jsonl")
+        self._file = open(self._path, 'a', encoding='utf-8')
+        self._opened_at = time.monotonic()
+        self._bytes = 0
+        self.segments += 1
+
+    def _rotate_if_due(self):
+        """Close the segment once it is too large or too old"""
+        if self._file is None:
+            return
+        if self._bytes >= self.max_bytes or time.monotonic() - self._opened_at >= self.max_age:
+            self._close_segment()
+
+    def _close_segment(self):
+        """Close the current segment and compress it in the background"""
+        if self._file is None:
+            return
+        self._file.close()
+        path = self._path
+        self._file = None
+        self._path = None
+        self._bytes = 0
+        if self.compress:
+            threading.Thread(target=compress_segment, args=(path,), name='click-log-gzip', daemon=True).start()
+
+
+def compress_segment(path: str):
+    """Gzip a closed segment and remove the original"""
+    tmp_path = f"{path}.gz.tmp"
+    try:
+        with open(path, 'rb') as src, gzip.open(tmp_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp_path, f"{path}.gz")
+        os.unlink(path)
+    except Exception as e:
+        logger.error(f"Error compressing click log segment {path}: {str(e)}")
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def list_segments(directory: str = 'click_logs') -> List[str]:
+    """Get segment paths, plain or compressed, in write order"""
+    paths = glob.glob(os.path.join(directory, f"{SEGMENT_PREFIX}*.jsonl"))
+    paths += glob.glob(os.path.join(directory, f"{SEGMENT_PREFIX}*.jsonl.gz"))
+    # A segment caught mid-compression exists in both forms; read the plain one
+    plain = {p for p in paths if p.endswith('.jsonl')}
+    paths = [p for p in paths if not (p.endswith('.gz') and p[:-3] in plain)]
+    return sorted(paths, key=lambda p: os.path.basename(p).replace('.gz', ''))
+
+
+def read_events(directory: str = 'click_logs', kinds: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """Stream events from every segment, skipping lines that are truncated or unreadable"""
+    for path in list_segments(directory):
+        opener = gzip.open if path.endswith('.gz') else open
+        try:
+            with opener(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        logger.warning(f"Skipping unreadable line in {path}")
+                        continue
+                    if kinds is None or event.get('kind') in kinds:
+                        yield event
+        except (OSError, EOFError) as e:
+            logger.error(f"Error reading click log segment {path}: {str(e)}")
+
+
+def click_key(short_code: str, clicked_at_epoch: int, session_id: str, ip_address: str):
+    """Identity of a click for replay: link, second, and session (or IP when there is none)"""
+    return short_code, clicked_at_epoch, session_id or ip_address
+
+
+def _stored_clicks(conn, batch: List[Dict[str, Any]]) -> Counter:
+    """Count the clicks of a batch's links and time span that analytics already holds"""
+    spans = {}
+    for event in batch:
+        low, high = spans.get(event['short_code'], (event['clicked_at_epoch'], event['clicked_at_epoch']))
+        spans[event['short_code']] = (min(low, event['clicked_at_epoch']), max(high, event['clicked_at_epoch']))
+
+    stored = Counter()
+    for short_code, (low, high) in spans.items():
+        rows = conn.execute("""
+            SELECT short_code, clicked_at_epoch, session_id, ip_address
+            FROM analytics
+            WHERE short_code = ?
+            AND clicked_at_epoch BETWEEN ? AND ?
+        """, (short_code, low, high))
+        stored.update(click_key(*row) for row in rows)
+    return stored
+
+
+def replay_clicks(db_path: str, directory: str = 'click_logs', since: str = None,
+                  until: str = None, batch_size: int = 500) -> int:
+    """Insert logged clicks that analytics does not hold yet (and their link counters); returns the number replayed"""
+    from click_time import stamp_click
+    from click_writer import ClickWriter
+    from db_pool import connect
+
+    writer = ClickWriter(db_path)
+    conn = connect(db_path, read_only=True)
+    replayed = skipped = 0
+
+    def write(batch):
+        nonlocal replayed, skipped
+        # Clicks already stored (matched on click_key) are skipped, so
+        # replaying overlapping ranges never double-counts
+        stored = _stored_clicks(conn, batch)
+        missing = []
+        for event in batch:
+            key = click_key(event['short_code'], event['clicked_at_epoch'],
+                            event.get('session_id'), event.get('ip_address'))
+            if stored[key] > 0:
+                stored[key] -= 1
+            else:
+                missing.append(event)
+        skipped += len(batch) - len(missing)
+        if missing:
+            replayed += writer.write_now(missing)
+
+    try:
+        batch = []
+        for event in read_events(directory, kinds=['click']):
+            clicked_at = event.get('clicked_at') or ''
+            if (since and clicked_at < since) or (until and clicked_at >= until):
+                continue
+            # Older logs lack clicked_at_epoch, which the match needs
+            batch.append(stamp_click(event))
+            if len(batch) >= batch_size:
+                write(batch)
+                batch = []
+        if batch:
+            write(batch)
+    finally:
+        conn.close()
+    if skipped:
+        logger.info(f"Skipped {skipped} logged clicks already in analytics")
+    return replayed
+
+
+_click_log: Optional[ClickLog] = None
+_click_log_lock = threading.Lock()
+
+
+def get_click_log() -> Optional[ClickLog]:
+    """Get the started process-wide click log, or None if disabled with CLICK_LOG_ENABLED=0"""
+    global _click_log
+    if os.getenv('CLICK_LOG_ENABLED', '1') == '0':
+        return None
+    with _click_log_lock:
+        if _click_log is None:
+            _click_log = ClickLog(
+                directory=os.getenv('CLICK_LOG_DIR', 'click_logs'),
+                max_bytes=int(os.getenv('CLICK_LOG_MAX_BYTES', str(64 * 1024 * 1024))),
+                max_age=float(os.getenv('CLICK_LOG_MAX_AGE', '3600'))
+            )
+            _click_log.start()
+        return _click_log
+
+
+def log_event(kind: str, data: Dict[str, Any]) -> bool:
+    """Queue an event on the process-wide click log"""
+    try:
+        click_log = get_click_log()
+        return click_log.log(kind, data) if click_log else False
+    except Exception as e:
+        logger.error(f"Error logging {kind} event: {str(e)}")
+        return False
+
+
+def stop_click_log():
+    """Flush and stop the process-wide click log"""
+    if _click_log is not None:
+        _click_log.stop()
+
+
+atexit.register(stop_click_log)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read or replay the click event log")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    cat_parser = subparsers.add_parser('cat', help="Print logged events as JSON lines")
+    cat_parser.add_argument('--dir', default=os.getenv('CLICK_LOG_DIR', 'click_logs'))
+    cat_parser.add_argument('--kind', action='append', help="Only events of this kind (repeatable)")
+
+    replay_parser = subparsers.add_parser('replay', help="Insert logged clicks into analytics")
+    replay_parser.add_argument('--db', default=os.getenv('URLS_DB_PATH', 'urls.db'), help="Path to urls.db")
+    replay_parser.add_argument('--dir', default=os.getenv('CLICK_LOG_DIR', 'click_logs'))
+    replay_parser.add_argument('--since', help="Only clicks at or after this time (YYYY-MM-DD HH:MM:SS)")
+    replay_parser.add_argument('--until', help="Only clicks before this time (YYYY-MM-DD HH:MM:SS)")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    if args.command == 'cat':
+        for event in read_events(args.dir, kinds=args.kind):
+            print(json.dumps(event, separators=(',', ':')))
+        return
+
+    # Make sure the analytics schema is current before inserting
+    from database import Database
+    Database(args.db)
+    replayed = replay_clicks(args.db, args.dir, since=args.since, until=args.until)
+    logger.info(f"Replayed {replayed} clicks into {args.db}")
+
+
+if __name__ == "__main__":
+    main()
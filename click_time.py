@@ -0,0 +1,53 @@
+"""
+Click timestamps for storage and reporting.
+
+Clicks are stored as an integer UTC epoch (clicked_at_epoch) plus the IST
+calendar day they fall on (click_day, 'YYYY-MM-DD'). Range filters compare
+these columns directly, so they can use indexes. clicked_at keeps the naive
+server-local string for display.
+"""
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+IST = timezone(timedelta(hours=5, minutes=30), 'IST')
+# SQLite modifier that shifts a 'unixepoch' value to IST
+IST_SQL_MODIFIER = '+330 minutes'
+
+
+def ist_datetime(epoch: float) -> datetime:
+    """Get the IST time (timezone-aware) of a UTC epoch"""
+    return datetime.fromtimestamp(epoch, IST)
+
+
+def click_day(epoch: float) -> str:
+    """Get the IST day ('YYYY-MM-DD') of a UTC epoch"""
+    return ist_datetime(epoch).strftime('%Y-%m-%d')
+
+
+def epoch_from_local(clicked_at: str) -> Optional[int]:
+    """Convert a naive server-local 'YYYY-MM-DD HH:MM:SS' string to a UTC epoch"""
+    try:
+        return int(datetime.strptime(str(clicked_at)[:19], '%Y-%m-%d %H:%M:%S').timestamp())
+    except ValueError:
+        return None
+
+
+def ist_day(days_ago: int = 0) -> str:
+    """Get the IST day a number of days before today"""
+    return (datetime.now(IST) - timedelta(days=days_ago)).strftime('%Y-%m-%d')
+
+
+def stamp_click(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill clicked_at, clicked_at_epoch and click_day on an event that lacks them"""
+    epoch = event.get('clicked_at_epoch')
+    if epoch is None:
+        epoch = epoch_from_local(event['clicked_at']) if event.get('clicked_at') else None
+        if epoch is None:
+            epoch = int(time.time())
+        event['clicked_at_epoch'] = epoch
+    if not event.get('clicked_at'):
+        event['clicked_at'] = datetime.fromtimestamp(epoch).strftime('%Y-%m-%d %H:%M:%S')
+    if not event.get('click_day'):
+        event['click_day'] = click_day(epoch)
+    return event
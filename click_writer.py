@@ -0,0 +1,263 @@
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Any, List
+
+from db_pool import begin_immediate, connect
+from rollups import record_events
+from dashboard_cache import bump_data_version
+from click_time import stamp_click
+from referrer import stamp_referrer
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Analytics columns written for every click, in insert order
+CLICK_COLUMNS = (
+    'short_code', 'clicked_at', 'clicked_at_epoch', 'click_day', 'ip_address', 'user_agent',
+    'referrer', 'referrer_domain', 'source_class', 'state', 'device_type', 'browser', 'os',
+    'event_type', 'session_id', 'is_bounce', 'time_on_page',
+    'is_conversion', 'enrichment_status'
+)
+
+
+class ClickWriter:
+    """Write-behind click queue drained by a single background writer thread"""
+
+    def __init__(self, db_path: str, flush_size: int = 200, flush_interval: float = 0.5,
+                 max_queue_size: int = 10000, put_timeout: float = 0.05):
+        """Initialize queue, batching limits and counters"""
+        self.db_path = db_path
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._stop = threading.Event()
+        self._thread = None
+        self._conn = None
+
+        # Pending counter so flush() can wait for in-flight batches too
+        self._pending = 0
+        self._pending_cond = threading.Condition()
+
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self.max_depth = 0
+        self.last_batch_size = 0
+        self.last_flush_ms = 0.0
+        self.lock_waits = 0
+        self.lock_wait_ms = 0.0
+        self.max_lock_wait_ms = 0.0
+
+    def start(self):
+        """Start the background writer thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"click-writer:{self.db_path}", daemon=True)
+        self._thread.start()
+        logger.info(f"Click writer started for {self.db_path}")
+
+    def enqueue(self, event: Dict[str, Any]) -> bool:
+        """Queue a click event; returns False if the queue stayed full"""
+        with self._pending_cond:
+            self._pending += 1
+        try:
+            self._queue.put(event, timeout=self.put_timeout)
+        except queue.Full:
+            self.dropped += 1
+            self._done(1)
+            logger.warning(f"Click queue full, dropped click for {event.get('short_code')}")
+            return False
+
+        self.enqueued += 1
+        depth = self._queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+        return True
+
+    def flush(self, timeout: float = None) -> bool:
+        """Block until every queued click has been written"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._pending_cond:
+            while self._pending:
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._pending_cond.wait(remaining)
+        return True
+
+    def write_now(self, batch: List[Dict[str, Any]]) -> int:
+        """Write a batch on the calling thread, bypassing the queue; returns the clicks written"""
+        written = self.written
+        self._write_batch(batch)
+        return self.written - written
+
+    def stop(self, timeout: float = 10.0):
+        """Flush remaining clicks and stop the writer thread"""
+        if not self._thread:
+            return
+        self.flush(timeout)
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        logger.info(f"Click writer stopped for {self.db_path}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get queue depth and throughput counters"""
+        return {
+            'queue_depth': self._queue.qsize(),
+            'max_queue_depth': self.max_depth,
+            'queue_capacity': self._queue.maxsize,
+            'enqueued': self.enqueued,
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'batches': self.batches,
+            'last_batch_size': self.last_batch_size,
+            'last_flush_ms': self.last_flush_ms,
+            'lock_waits': self.lock_waits,
+            'lock_wait_ms': round(self.lock_wait_ms, 2),
+            'max_lock_wait_ms': round(self.max_lock_wait_ms, 2)
+        }
+
+    def _done(self, count: int):
+        """Mark events as fully processed"""
+        with self._pending_cond:
+            self._pending -= count
+            if self._pending <= 0:
+                self._pending_cond.notify_all()
+
+    def _run(self):
+        """Collect batches until stopped"""
+        while not self._stop.is_set() or not self._queue.empty():
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.flush_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                self._write_batch(batch)
+            finally:
+                self._done(len(batch))
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get the writer's persistent connection"""
+        if self._conn is None:
+            self._conn = connect(self.db_path, timeout=30, isolation_level=None)
+        return self._conn
+
+    def _write_batch(self, batch: List[Dict[str, Any]], attempts: int = 3):
+        """Group-commit a batch of clicks and fold the per-link counter updates"""
+        insert_query = f"""
+            INSERT INTO analytics ({', '.join(CLICK_COLUMNS)})
+            VALUES ({', '.join('?' for _ in CLICK_COLUMNS)})
+        """
+        # Events replayed from older click logs lack the derived columns
+        for event in batch:
+            stamp_referrer(stamp_click(event))
+        rows = [tuple(event.get(column) for column in CLICK_COLUMNS) for event in batch]
+
+        clicks_per_link = defaultdict(int)
+        visitors_per_link = defaultdict(set)
+        for event in batch:
+            clicks_per_link[event['short_code']] += 1
+            if event.get('visitor_hash'):
+                visitors_per_link[event['short_code']].add(event['visitor_hash'])
+
+        visitor_query = """
+            INSERT OR IGNORE INTO link_visitors (short_code, visitor_hash)
+            VALUES (?, ?)
+        """
+        update_query = """
+            UPDATE urls
+            SET
+                total_clicks = total_clicks + ?,
+                last_clicked = CURRENT_TIMESTAMP,
+                unique_visitors = unique_visitors + ?
+            WHERE short_code = ?
+        """
+
+        for attempt in range(1, attempts + 1):
+            start = time.perf_counter()
+            conn = self._get_connection()
+            try:
+                begin_immediate(conn, self)
+                conn.executemany(insert_query, rows)
+                record_events(conn, batch)
+
+                # Only visitors not yet seen for the link bump unique_visitors
+                updates = []
+                for code, count in clicks_per_link.items():
+                    hashes = visitors_per_link.get(code)
+                    new_visitors = 0
+                    if hashes:
+                        cursor = conn.executemany(visitor_query, [(code, h) for h in hashes])
+                        new_visitors = cursor.rowcount
+                    updates.append((count, new_visitors, code))
+                conn.executemany(update_query, updates)
+                bump_data_version(conn)
+                conn.execute("COMMIT")
+
+                self.written += len(batch)
+                self.batches += 1
+                self.last_batch_size = len(batch)
+                self.last_flush_ms = round((time.perf_counter() - start) * 1000, 2)
+                return
+            except Exception as e:
+                logger.error(f"Error writing click batch (attempt {attempt}/{attempts}): {str(e)}")
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                time.sleep(0.1 * attempt)
+
+        self.failed += len(batch)
+
+
+_writers: Dict[str, ClickWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_click_writer(db_path: str) -> ClickWriter:
+    """Get the started process-wide click writer for a database"""
+    with _writers_lock:
+        writer = _writers.get(db_path)
+        if writer is None:
+            writer = ClickWriter(
+                db_path,
+                flush_size=int(os.getenv('CLICK_FLUSH_SIZE', '200')),
+                flush_interval=float(os.getenv('CLICK_FLUSH_INTERVAL', '0.5')),
+                max_queue_size=int(os.getenv('CLICK_QUEUE_SIZE', '10000'))
+            )
+            writer.start()
+            _writers[db_path] = writer
+        return writer
+
+
+def stop_click_writers():
+    """Flush and stop every click writer"""
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.stop()
+
+
+atexit.register(stop_click_writers)
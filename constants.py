@@ -0,0 +1,77 @@
+"""Campaign types, states and other constants shared by the app pages"""
+import os
+
+BASE_URL = "https://shortl.streamlit.app/"  # For local development
+
+# Rows per page in the campaign tables
+CAMPAIGN_PAGE_SIZE = 25
+
+# Seconds between timed refreshes of the live dashboard panels (0 disables the timer)
+METRICS_REFRESH_SECONDS = float(os.getenv('METRICS_REFRESH_SECONDS', '60'))
+ACTIVITY_REFRESH_SECONDS = float(os.getenv('ACTIVITY_REFRESH_SECONDS', '15'))
+
+CAMPAIGN_TYPES = {
+    "Social Media": "🔵",
+    "Email": "📧",
+    "Paid Ads": "💰",
+    "Blog": "📝",
+    "Affiliate": "🤝",
+    "Other": "🔗"
+}
+
+CAMPAIGN_FEATURES = {
+    "UTM Builder": "🎯",
+    "A/B Testing": "🔄",
+    "QR Codes": "📱",
+    "Link Retargeting": "🎪",
+    "Custom Domains": "🌐",
+    "Deep Links": "🔗"
+}
+
+CAMPAIGN_METRICS = {
+    "Clicks": "👆",
+    "Unique Visitors": "👥",
+    "Conversion Rate": "📈",
+    "Bounce Rate": "↩️",
+    "Avg. Time": "⏱️",
+    "ROI": "💰"
+}
+
+INDIAN_STATES = [
+    "Andhra Pradesh",
+    "Arunachal Pradesh",
+    "Assam",
+    "Bihar",
+    "Chhattisgarh",
+    "Goa",
+    "Gujarat",
+    "Haryana",
+    "Himachal Pradesh",
+    "Jharkhand",
+    "Karnataka",
+    "Kerala",
+    "Madhya Pradesh",
+    "Maharashtra",
+    "Manipur",
+    "Meghalaya",
+    "Mizoram",
+    "Nagaland",
+    "Odisha",
+    "Punjab",
+    "Rajasthan",
+    "Sikkim",
+    "Tamil Nadu",
+    "Telangana",
+    "Tripura",
+    "Uttar Pradesh",
+    "Uttarakhand",
+    "West Bengal",
+    "Delhi",
+    "Jammu and Kashmir",
+    "Ladakh",
+    "Puducherry",
+    "Andaman and Nicobar Islands",
+    "Chandigarh",
+    "Dadra and Nagar Haveli and Daman and Diu",
+    "Lakshadweep"
+]
@@ -0,0 +1,162 @@
+"""
+Process-wide cache for dashboard payloads.
+
+Entries are keyed by (db_path, payload name, filter parameters) and stamped
+with the database's data version. The data version is a counter that every
+write path affecting dashboard numbers bumps in its own transaction.
+
+- An entry whose version is current is served as is.
+- An entry that is behind but younger than the freshness budget
+  (DASHBOARD_MAX_STALENESS seconds) is served stale while one background
+  thread recomputes it.
+- Older or missing entries are recomputed by the caller.
+
+Concurrent recomputations of the same key always share one call.
+"""
+import copy
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from ttl_cache import _Flight
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+DATA_VERSION_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS data_version (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL
+    )
+'''
+
+
+def bump_data_version(conn):
+    """Mark dashboard data as changed; call inside the write transaction"""
+    conn.execute("UPDATE data_version SET version = version + 1 WHERE id = 1")
+
+
+def read_data_version(conn) -> Optional[int]:
+    """Read the current data version, or None if the database has none"""
+    row = conn.execute("SELECT version FROM data_version WHERE id = 1").fetchone()
+    return row[0] if row else None
+
+
+class DashboardCache:
+    """Version-stamped LRU cache with stale-while-revalidate and single-flight recomputes"""
+
+    def __init__(self, maxsize: int = 256, max_staleness: float = 10.0):
+        """Initialize cache limits and counters"""
+        self.maxsize = maxsize
+        self.max_staleness = max_staleness
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.loads = 0
+        self.load_errors = 0
+        self.coalesced = 0
+
+    def get(self, key: Hashable, version: Optional[int], loader: Callable[[], Any]) -> Any:
+        """Return a copy of the payload for key, recomputing it with loader when the data changed"""
+        if version is None:
+            return loader()
+
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, entry_version, computed_at = entry
+                if entry_version == version:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(value)
+                if time.monotonic() - computed_at <= self.max_staleness:
+                    self._data.move_to_end(key)
+                    self.stale_hits += 1
+                    if key not in self._inflight:
+                        self._inflight[key] = _Flight()
+                        self.refreshes += 1
+                        threading.Thread(
+                            target=self._load, args=(key, version, loader),
+                            name="dashboard-refresh", daemon=True
+                        ).start()
+                    return copy.deepcopy(value)
+
+            self.misses += 1
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if leader:
+            self._load(key, version, loader)
+        else:
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return copy.deepcopy(flight.value)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters"""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.stale_hits) / lookups * 100, 2) if lookups else 0,
+                'refreshes': self.refreshes,
+                'loads': self.loads,
+                'load_errors': self.load_errors,
+                'coalesced': self.coalesced,
+                'inflight': len(self._inflight)
+            }
+
+    def _load(self, key: Hashable, version: int, loader: Callable[[], Any]):
+        """Run loader for the flight registered under key and store the result"""
+        with self._lock:
+            flight = self._inflight[key]
+        started = time.monotonic()
+        try:
+            value = loader()
+            flight.value = value
+            with self._lock:
+                # The payload reflects the data as of the version read before
+                # loading; never replace a payload computed for a newer version
+                current = self._data.get(key)
+                if current is None or current[1] <= version:
+                    self._data[key] = (value, version, started)
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        except Exception as e:
+            flight.error = e
+            logger.error(f"Error computing dashboard payload {key}: {str(e)}")
+            with self._lock:
+                self.load_errors += 1
+        finally:
+            with self._lock:
+                self.loads += 1
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+
+dashboard_cache = DashboardCache(
+    maxsize=int(os.getenv('DASHBOARD_CACHE_SIZE', '256')),
+    max_staleness=float(os.getenv('DASHBOARD_MAX_STALENESS', '10'))
+)
@@ -1,315 +1,276 @@
 import sqlite3
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterable, Tuple
 import os
+import sys
 import logging
-import pandas as pd
+import threading
+import time
 import json
-import random
-import string
 from urllib.parse import urlparse, parse_qs, urlencode
-import streamlit as st
 import uuid
-from geo_service import GeoService
-from ip_tracker import IPTracker
+import validators
+from ttl_cache import TTLCache
+from click_writer import get_click_writer
+from click_log import log_event
+from short_codes import get_code_allocator
+from db_pool import connect, get_connection_pool
+from migrations import ensure_migrated, visitor_hash
+from rollups import record_events, remove_link as remove_rollups
+from dashboard_cache import bump_data_version, dashboard_cache, read_data_version
+from click_time import ist_datetime, ist_day, stamp_click
+from referrer import stamp_referrer
+from pagination import build_page, decode_cursor, keyset_query
+from lazy_imports import LazyModule
+
+# Only dashboard reads need pandas; the redirect and worker paths never load it
+pd = LazyModule('pandas')
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Process-wide cache of link records keyed by (db_path, short_code)
+url_cache = TTLCache(
+    maxsize=int(os.getenv('URL_CACHE_SIZE', '10000')),
+    ttl=float(os.getenv('URL_CACHE_TTL', '60')),
+    negative_ttl=float(os.getenv('URL_CACHE_NEGATIVE_TTL', '5'))
+)
+
+# How often (seconds) each process re-reads links_version and drops url_cache
+# entries that another process's link edits made stale
+LINKS_VERSION_CHECK_INTERVAL = float(os.getenv('LINKS_VERSION_CHECK_INTERVAL', '1'))
+
+# db_path -> (last links_version seen, monotonic time of that check)
+_links_versions: Dict[str, Tuple[Optional[int], float]] = {}
+_links_versions_lock = threading.Lock()
+
+# UTM keys accepted in utm_params dicts, stored as utm_<key>
+UTM_KEYS = ('source', 'medium', 'campaign', 'content', 'term')
+
+# get_urls_page sort keys -> urls column; id breaks ties
+URL_SORT_COLUMNS = {
+    'created': 'created_at',
+    'clicks': 'total_clicks',
+    'name': 'campaign_name'
+}
+
 class Database:
     """Database handler for URL shortener with analytics"""
     
-    def __init__(self):
-        """Initialize database connection and create tables if they don't exist"""
-        self.db_path = "urls.db"
+    def __init__(self, db_path: str = None):
+        """Initialize database connection and apply pending schema migrations"""
+        self.db_path = db_path or os.getenv('URLS_DB_PATH', 'urls.db')
         
         try:
-            # Only initialize if database doesn't exist
-            if not os.path.exists(self.db_path):
-                logger.info("Creating new database...")
-                self.initialize_database()
-            else:
-                # Check if tables exist
-                conn = self.get_connection()
-                c = conn.cursor()
-                c.execute("SELECT name FROM sqlite_master WHERE type='table'")
-                tables = [table[0] for table in c.fetchall()]
-                conn.close()
-                
-                # Initialize only if required tables are missing
-                required_tables = {'organizations', 'users', 'urls', 'analytics'}
-                if not required_tables.issubset(set(tables)):
-                    logger.info("Reinitializing database with missing tables...")
-                    self.initialize_database()
-            
+            self.initialize_database()
         except Exception as e:
             logger.error(f"Database initialization error: {str(e)}")
             raise
 
     def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get a standalone tuned connection; the caller must close it"""
+        return connect(self.db_path)
 
-    def initialize_database(self):
-        """Create necessary database tables"""
-        conn = self.get_connection()
-        c = conn.cursor()
-        try:
-            # Create organizations table
-            c.execute('''
-                CREATE TABLE IF NOT EXISTS organizations (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    domain TEXT NOT NULL UNIQUE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create users table
-            c.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT NOT NULL UNIQUE,
-                    password TEXT NOT NULL,
-                    organization_id INTEGER,
-                    role TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (organization_id) REFERENCES organizations(id)
-                )
-            ''')
-            
-            # Create URLs table with unique_visitors column
-            c.execute('''
-                CREATE TABLE IF NOT EXISTS urls (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    short_code TEXT UNIQUE NOT NULL,
-                    original_url TEXT NOT NULL,
-                    campaign_name TEXT NOT NULL,
-                    campaign_type TEXT,
-                    utm_source TEXT,
-                    utm_medium TEXT,
-                    utm_campaign TEXT,
-                    utm_content TEXT,
-                    utm_term TEXT,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    last_clicked DATETIME,
-                    total_clicks INTEGER DEFAULT 0,
-                    unique_visitors INTEGER DEFAULT 0,
-                    is_active BOOLEAN DEFAULT 1,
-                    UNIQUE(campaign_name)
-                )
-            ''')
+    def connection(self):
+        """Borrow a pooled read-write connection (use as a context manager)"""
+        return get_connection_pool(self.db_path).connection()
 
-            # Drop and recreate analytics tables
-            c.execute("DROP TABLE IF EXISTS analytics")
-            c.execute("DROP TABLE IF EXISTS engagement_metrics")
-            
-            # Create analytics table with all required fields
-            c.execute('''
-                CREATE TABLE IF NOT EXISTS analytics (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    short_code TEXT NOT NULL,
-                    clicked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    ip_address TEXT,
-                    user_agent TEXT,
-                    referrer TEXT,
-                    state TEXT,
-                    device_type TEXT,
-                    browser TEXT,
-                    os TEXT,
-                    event_type TEXT,
-                    event_data TEXT,
-                    session_id TEXT,
-                    time_on_page INTEGER DEFAULT 0,
-                    is_bounce BOOLEAN DEFAULT 1,
-                    is_conversion BOOLEAN DEFAULT 0,
-                    engagement_score FLOAT DEFAULT 0,
-                    FOREIGN KEY (short_code) REFERENCES urls(short_code)
-                )
-            ''')
+    def read_connection(self):
+        """Borrow a pooled read-only connection (use as a context manager)"""
+        return get_connection_pool(self.db_path, read_only=True).connection()
 
-            # Create engagement metrics table
-            c.execute('''
-                CREATE TABLE IF NOT EXISTS engagement_metrics (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    short_code TEXT NOT NULL,
-                    session_id TEXT NOT NULL,
-                    page_views INTEGER DEFAULT 1,
-                    time_spent INTEGER DEFAULT 0,
-                    actions_taken INTEGER DEFAULT 0,
-                    last_interaction TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    is_converted BOOLEAN DEFAULT 0,
-                    FOREIGN KEY (short_code) REFERENCES urls(short_code)
-                )
-            ''')
-
-            # Insert default organization and users
-            c.execute('''
-                INSERT OR IGNORE INTO organizations (id, name, domain) 
-                VALUES (1, 'VBG Game Studios', 'virtualbattleground.in')
-            ''')
-
-            c.execute('''
-                INSERT OR IGNORE INTO users (username, password, organization_id, role) 
-                VALUES ('admin', 'admin123', 1, 'admin')
-            ''')
-            
-            c.execute('''
-                INSERT OR IGNORE INTO users (username, password, organization_id, role)
-                VALUES ('nandan', 'nandan123', 1, 'user')
-            ''')
+    def initialize_database(self):
+        """Create or upgrade the schema (once per process)"""
+        ensure_migrated(self.db_path)
 
-            conn.commit()
-            logger.info("Database initialized successfully with all tables")
-            
+    def get_data_version(self) -> Optional[int]:
+        """Get the counter bumped by every write that changes dashboard data"""
+        try:
+            with self.read_connection() as conn:
+                return read_data_version(conn)
         except Exception as e:
-            logger.error(f"Error initializing database: {str(e)}")
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+            logger.error(f"Error reading data version: {str(e)}")
+            return None
 
     def get_analytics_summary(self, start_date=None, end_date=None, campaigns=None, states=None) -> Dict[str, Any]:
-        """Get analytics summary with optional filters"""
-        conn = self.get_connection()
-        c = conn.cursor()
-        try:
-            # Build base query parts
-            base_select = """
-                SELECT 
-                    COUNT(a.id) as total_clicks,
-                    COUNT(DISTINCT a.ip_address) as unique_visitors,
-                    COUNT(DISTINCT DATE(a.clicked_at)) as active_days
-                FROM urls u
-                LEFT JOIN analytics a ON u.short_code = a.short_code
-            """
-            
-            # Build WHERE clause dynamically
-            where_conditions = []
-            params = []
-            
-            if start_date:
-                where_conditions.append("DATE(a.clicked_at) >= DATE(?)")
-                params.append(start_date)
-            
-            if end_date:
-                where_conditions.append("DATE(a.clicked_at) <= DATE(?)")
-                params.append(end_date)
-            
-            if campaigns:
-                placeholders = ','.join(['?' for _ in campaigns])
-                where_conditions.append(f"u.campaign_name IN ({placeholders})")
-                params.extend(campaigns)
+        """Get analytics summary with optional filters (cached server-wide until the data changes)"""
+        start_day, end_day = self._day_range(start_date, end_date)
+        key = (
+            self.db_path, 'analytics_summary', start_day, end_day,
+            tuple(sorted(campaigns)) if campaigns else None,
+            tuple(sorted(states)) if states else None
+        )
+        return dashboard_cache.get(
+            key, self.get_data_version(),
+            lambda: self._load_analytics_summary(start_date, end_date, campaigns, states)
+        )
+
+    def _load_analytics_summary(self, start_date=None, end_date=None, campaigns=None, states=None) -> Dict[str, Any]:
+        """Compute the analytics summary with optional filters"""
+        with self.read_connection() as conn:
+            c = conn.cursor()
+            try:
+                # Filters are ranges on the stored IST day, so indexes apply
+                start_day, end_day = self._day_range(start_date, end_date)
+                url_conditions, url_params = [], []
+                rollup_conditions, rollup_params = [], []
+                click_conditions, click_params = [], []
             
-            if states:
-                placeholders = ','.join(['?' for _ in states])
-                where_conditions.append(f"a.state IN ({placeholders})")
-                params.extend(states)
+                if start_day:
+                    rollup_conditions.append("r.bucket >= ?")
+                    rollup_params.append(start_day)
+                    click_conditions.append("a.click_day >= ?")
+                    click_params.append(start_day)
             
-            where_clause = f"WHERE {' AND '.join(where_conditions)}" if where_conditions else ""
+                if end_day:
+                    rollup_conditions.append("r.bucket <= ?")
+                    rollup_params.append(end_day)
+                    click_conditions.append("a.click_day <= ?")
+                    click_params.append(end_day)
             
-            # Execute main metrics query
-            query = f"{base_select} {where_clause}"
-            c.execute(query, params)
-            row = c.fetchone()
+                if campaigns:
+                    placeholders = ','.join(['?' for _ in campaigns])
+                    url_conditions.append(f"u.campaign_name IN ({placeholders})")
+                    url_params.extend(campaigns)
             
-            summary = {
-                'total_clicks': row[0] or 0,
-                'unique_visitors': row[1] or 0,
-                'active_days': row[2] or 0,
-                'engagement_rate': (row[1] / row[0] * 100) if row[0] and row[1] else 0
-            }
-            
-            # Get daily stats
-            daily_query = f"""
-                SELECT 
-                    DATE(COALESCE(a.clicked_at, u.created_at)) as date,
-                    COUNT(a.id) as clicks
-                FROM urls u
-                LEFT JOIN analytics a ON u.short_code = a.short_code
-                {where_clause}
-                GROUP BY DATE(COALESCE(a.clicked_at, u.created_at))
-                ORDER BY date
-            """
-            c.execute(daily_query, params)
-            summary['daily_stats'] = {
-                row[0]: row[1] for row in c.fetchall()
-            }
-            
-            # Get state stats
-            state_query = f"""
-                SELECT 
-                    COALESCE(a.state, 'Unknown') as state,
-                    COUNT(a.id) as visits
-                FROM urls u
-                LEFT JOIN analytics a ON u.short_code = a.short_code
-                {where_clause}
-                GROUP BY COALESCE(a.state, 'Unknown')
-                HAVING state IS NOT NULL
-                ORDER BY visits DESC
-            """
-            c.execute(state_query, params)
-            summary['state_stats'] = {
-                row[0]: row[1] for row in c.fetchall()
-            }
-            
-            # Get campaign stats
-            campaign_query = f"""
-                SELECT 
-                    u.campaign_name,
-                    COUNT(a.id) as total_clicks,
-                    COUNT(DISTINCT a.ip_address) as unique_visitors,
-                    0 as avg_time,
-                    0 as bounce_rate
-                FROM urls u
-                LEFT JOIN analytics a ON u.short_code = a.short_code
-                {where_clause}
-                GROUP BY u.campaign_name
-                ORDER BY total_clicks DESC
-            """
-            c.execute(campaign_query, params)
-            summary['campaign_stats'] = [{
-                'campaign_name': row[0],
-                'total_clicks': row[1] or 0,
-                'unique_visitors': row[2] or 0,
-                'avg_time_on_page': "0s",  # Default value
-                'bounce_rate': 0,  # Default value
-                'conversion_rate': (row[2] / row[1] * 100) if row[1] and row[2] else 0
-            } for row in c.fetchall()]
+                if states:
+                    placeholders = ','.join(['?' for _ in states])
+                    rollup_conditions.append(f"r.state IN ({placeholders})")
+                    rollup_params.extend(states)
+                    click_conditions.append(f"a.state IN ({placeholders})")
+                    click_params.extend(states)
+
+                # One grouped scan of the daily rollup feeds all four result sets.
+                # Without click filters, links that were never clicked add a zero
+                # row on their creation date, as the urls LEFT JOIN analytics
+                # queries did.
+                params = url_params + rollup_params
+                unclicked = ""
+                if not rollup_conditions:
+                    unclicked = f"""
+                        UNION ALL
+                        SELECT u.campaign_name, DATE(u.created_at), NULL, 0
+                        FROM urls u
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM click_rollup_daily r WHERE r.short_code = u.short_code
+                        )
+                        {'AND ' + ' AND '.join(url_conditions) if url_conditions else ''}
+                    """
+                    params += url_params
+                c.execute(f"""
+                    SELECT u.campaign_name, r.bucket, NULLIF(r.state, ''), SUM(r.clicks)
+                    FROM urls u
+                    JOIN click_rollup_daily r ON r.short_code = u.short_code
+                    WHERE {' AND '.join(url_conditions + rollup_conditions) or '1'}
+                    GROUP BY u.campaign_name, r.bucket, r.state
+                    {unclicked}
+                """, params)
+                rows = c.fetchall()
+
+                # Distinct visitors are not additive. Without day/state filters
+                # they come from link_visitors (one row per link and visitor);
+                # otherwise from one grouped scan of the matching clicks. Either
+                # way the (campaign, visitor) pairs are built once and counted
+                # per campaign, plus a NULL-named row for the total.
+                if click_conditions:
+                    visitor_pairs = f"""
+                        SELECT DISTINCT u.campaign_name, a.ip_address AS visitor
+                        FROM urls u
+                        JOIN analytics a ON u.short_code = a.short_code
+                        WHERE {' AND '.join(url_conditions + click_conditions)}
+                        AND a.ip_address IS NOT NULL
+                        AND a.ip_address != ''
+                    """
+                    visitor_params = url_params + click_params
+                else:
+                    visitor_pairs = f"""
+                        SELECT u.campaign_name, v.visitor_hash AS visitor
+                        FROM urls u
+                        JOIN link_visitors v ON u.short_code = v.short_code
+                        WHERE {' AND '.join(url_conditions) or '1'}
+                    """
+                    visitor_params = url_params
+                c.execute(f"""
+                    WITH pairs AS MATERIALIZED ({visitor_pairs})
+                    SELECT campaign_name, COUNT(*) FROM pairs GROUP BY campaign_name
+                    UNION ALL
+                    SELECT NULL, COUNT(DISTINCT visitor) FROM pairs
+                """, visitor_params)
+                campaign_visitors = dict(c.fetchall())
+                unique_visitors = campaign_visitors.pop(None, 0)
+
+                total_clicks = 0
+                active_days = set()
+                daily_stats, state_stats, campaign_clicks = {}, {}, {}
+                for campaign_name, day, state, clicks in rows:
+                    total_clicks += clicks
+                    daily_stats[day] = daily_stats.get(day, 0) + clicks
+                    if clicks:
+                        active_days.add(day)
+                        # Clicks still waiting on enrichment have no state yet
+                        state = state or 'Unknown'
+                        state_stats[state] = state_stats.get(state, 0) + clicks
+                    campaign_clicks[campaign_name] = campaign_clicks.get(campaign_name, 0) + clicks
+
+                summary = {
+                    'total_clicks': total_clicks,
+                    'unique_visitors': unique_visitors,
+                    'active_days': len(active_days),
+                    'engagement_rate': (unique_visitors / total_clicks * 100) if total_clicks and unique_visitors else 0,
+                    'daily_stats': dict(sorted(daily_stats.items())),
+                    'state_stats': dict(sorted(state_stats.items(), key=lambda item: item[1], reverse=True)),
+                    'campaign_stats': []
+                }
+                for campaign_name, clicks in sorted(campaign_clicks.items(), key=lambda item: item[1], reverse=True):
+                    visitors = campaign_visitors.get(campaign_name, 0)
+                    summary['campaign_stats'].append({
+                        'campaign_name': campaign_name,
+                        'total_clicks': clicks,
+                        'unique_visitors': visitors,
+                        'avg_time_on_page': "0s",  # Default value
+                        'bounce_rate': 0,  # Default value
+                        'conversion_rate': (visitors / clicks * 100) if clicks and visitors else 0
+                    })
             
-            return summary
+                return summary
             
-        except Exception as e:
-            logger.error(f"Error getting analytics summary: {str(e)}")
-            return {
-                'total_clicks': 0,
-                'unique_visitors': 0,
-                'active_days': 0,
-                'engagement_rate': 0,
-                'daily_stats': {},
-                'state_stats': {},
-                'campaign_stats': []
-            }
-        finally:
-            conn.close()
+            except Exception as e:
+                logger.error(f"Error getting analytics summary: {str(e)}")
+                return {
+                    'total_clicks': 0,
+                    'unique_visitors': 0,
+                    'active_days': 0,
+                    'engagement_rate': 0,
+                    'daily_stats': {},
+                    'state_stats': {},
+                    'campaign_stats': []
+                }
+
+    @staticmethod
+    def _day_range(start_date=None, end_date=None):
+        """Normalize optional date filters to 'YYYY-MM-DD' strings"""
+        return tuple(
+            pd.Timestamp(value).strftime('%Y-%m-%d') if value else None
+            for value in (start_date, end_date)
+        )
 
     def get_recent_activity(self, limit: int = 5) -> List[Dict[str, Any]]:
         """Get recent activity"""
-        conn = self.get_connection()
-        c = conn.cursor()
-        try:
+        with self.read_connection() as conn:
+            c = conn.cursor()
             c.execute('''
                 WITH RankedClicks AS (
                     SELECT 
                         u.campaign_name,
                         u.short_code,
                         a.clicked_at,
+                        a.clicked_at_epoch,
                         a.state,
                         a.device_type,
-                        ROW_NUMBER() OVER (PARTITION BY u.short_code ORDER BY a.clicked_at DESC) as rn
+                        ROW_NUMBER() OVER (PARTITION BY u.short_code ORDER BY a.clicked_at_epoch DESC) as rn
                     FROM analytics a
                     JOIN urls u ON a.short_code = u.short_code
-                    WHERE a.clicked_at IS NOT NULL
+                    WHERE a.clicked_at_epoch IS NOT NULL
                 )
                 SELECT 
                     campaign_name,
@@ -319,7 +280,7 @@ class Database:
                     device_type
                 FROM RankedClicks
                 WHERE rn = 1
-                ORDER BY clicked_at DESC
+                ORDER BY clicked_at_epoch DESC
                 LIMIT ?
             ''', (limit,))
             
@@ -333,57 +294,221 @@ class Database:
                     "device_type": row[4] or "Unknown"
                 })
             return activities
-        finally:
-            conn.close()
 
     def get_all_urls(self) -> List[Dict[str, Any]]:
         """Get all URLs with their details"""
-        conn = self.get_connection()
-        c = conn.cursor()
+        with self.read_connection() as conn:
+            c = conn.cursor()
+            try:
+                c.execute('''
+                    SELECT 
+                        short_code,
+                        original_url,
+                        campaign_name,
+                        campaign_type,
+                        datetime(created_at) as created_at,
+                        datetime(last_clicked) as last_clicked,
+                        total_clicks,
+                        utm_source,
+                        utm_medium,
+                        utm_campaign,
+                        utm_content,
+                        is_active
+                    FROM urls
+                    ORDER BY created_at DESC
+                ''')
+            
+                urls = []
+                for row in c.fetchall():
+                    urls.append({
+                        'short_code': row[0],
+                        'original_url': row[1],
+                        'campaign_name': row[2],
+                        'campaign_type': row[3],
+                        'created_at': row[4],
+                        'last_clicked': row[5] if row[5] else None,
+                        'total_clicks': row[6],
+                        'utm_source': row[7],
+                        'utm_medium': row[8],
+                        'utm_campaign': row[9],
+                        'utm_content': row[10],
+                        'is_active': bool(row[11])
+                    })
+                return urls
+            except Exception as e:
+                logger.error(f"Error getting all URLs: {str(e)}")
+                return []
+
+    def get_urls_page(self, limit: int = 25, cursor: str = None, sort: str = 'created', descending: bool = True,
+                      search: str = None, campaign_types: List[str] = None, is_active: bool = None) -> Dict[str, Any]:
+        """Get one keyset-paginated page of links with server-side sort and filters"""
+        empty = {'items': [], 'next_cursor': None, 'prev_cursor': None}
+        sort_column = URL_SORT_COLUMNS.get(sort)
+        if sort_column is None:
+            logger.error(f"Unknown link sort: {sort}")
+            return empty
+
+        direction, key = decode_cursor(cursor)
+        seek, order_by, params = keyset_query((sort_column, 'id'), descending, direction, key)
+        conditions = [seek] if seek else []
+        if search:
+            conditions.append("campaign_name LIKE ? ESCAPE '\\'")
+            escaped = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params.append(f"%{escaped}%")
+        if campaign_types:
+            conditions.append(f"campaign_type IN ({','.join('?' for _ in campaign_types)})")
+            params.extend(campaign_types)
+        if is_active is not None:
+            conditions.append("is_active = ?")
+            params.append(1 if is_active else 0)
+
+        query = f"""
+            SELECT 
+                id,
+                short_code,
+                original_url,
+                campaign_name,
+                campaign_type,
+                datetime(created_at) as created_at,
+                datetime(last_clicked) as last_clicked,
+                total_clicks,
+                utm_source,
+                utm_medium,
+                utm_campaign,
+                utm_content,
+                is_active,
+                {sort_column} as sort_key
+            FROM urls
+            {'WHERE ' + ' AND '.join(conditions) if conditions else ''}
+            ORDER BY {order_by}
+            LIMIT ?
+        """
         try:
-            c.execute('''
+            rows = self.execute_query(query, tuple(params) + (limit + 1,))
+            for row in rows:
+                row['is_active'] = bool(row['is_active'])
+            page = build_page(rows, limit, direction, key is not None, ('sort_key', 'id'))
+            for row in page['items']:
+                del row['sort_key']
+            return page
+        except Exception as e:
+            logger.error(f"Error getting URL page: {str(e)}")
+            return empty
+
+    def get_recent_links(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Get the most recently created links"""
+        return self.get_urls_page(limit=limit)['items']
+
+    def get_last_click_dates(self, short_codes: Iterable[str]) -> Dict[str, datetime]:
+        """Get the latest click time (IST) of each link in one query per 500 codes; unclicked links are omitted"""
+        codes = list(dict.fromkeys(short_codes))
+        last_clicks = {}
+        try:
+            with self.read_connection() as conn:
+                for i in range(0, len(codes), 500):
+                    chunk = codes[i:i + 500]
+                    rows = conn.execute(f"""
+                        SELECT short_code, MAX(clicked_at_epoch)
+                        FROM analytics
+                        WHERE short_code IN ({','.join('?' * len(chunk))})
+                        GROUP BY short_code
+                    """, chunk)
+                    for short_code, epoch in rows:
+                        if epoch is not None:
+                            last_clicks[short_code] = ist_datetime(epoch)
+            return last_clicks
+        except Exception as e:
+            logger.error(f"Error getting last click dates: {str(e)}")
+            return {}
+
+    def get_campaign_names(self) -> List[str]:
+        """Get every campaign name, sorted, for filter dropdowns"""
+        try:
+            with self.read_connection() as conn:
+                return [row[0] for row in conn.execute("SELECT campaign_name FROM urls ORDER BY campaign_name")]
+        except Exception as e:
+            logger.error(f"Error getting campaign names: {str(e)}")
+            return []
+
+    def get_link_totals(self) -> Dict[str, int]:
+        """Get the number of links and their summed click counters"""
+        try:
+            result = self.execute_query(
+                "SELECT COUNT(*) as links, COALESCE(SUM(total_clicks), 0) as total_clicks FROM urls",
+                fetch_one=True
+            )
+            return {'links': result['links'], 'total_clicks': result['total_clicks']}
+        except Exception as e:
+            logger.error(f"Error getting link totals: {str(e)}")
+            return {'links': 0, 'total_clicks': 0}
+
+    def get_campaign_type_stats(self) -> List[Dict[str, Any]]:
+        """Get link counts and click counters per campaign type (cached server-wide until the data changes)"""
+        return dashboard_cache.get(
+            (self.db_path, 'campaign_type_stats'),
+            self.get_data_version(), self._load_campaign_type_stats
+        )
+
+    def _load_campaign_type_stats(self) -> List[Dict[str, Any]]:
+        """Compute link counts and click counters per campaign type"""
+        try:
+            return self.execute_query("""
                 SELECT 
-                    short_code,
-                    original_url,
-                    campaign_name,
                     campaign_type,
-                    datetime(created_at) as created_at,
-                    datetime(last_clicked) as last_clicked,
-                    total_clicks,
-                    utm_source,
-                    utm_medium,
-                    utm_campaign,
-                    utm_content,
-                    is_active
+                    COUNT(*) as count,
+                    SUM(total_clicks) as total_clicks
                 FROM urls
-                ORDER BY created_at DESC
-            ''')
-            
-            urls = []
-            for row in c.fetchall():
-                urls.append({
-                    'short_code': row[0],
-                    'original_url': row[1],
-                    'campaign_name': row[2],
-                    'campaign_type': row[3],
-                    'created_at': row[4],
-                    'last_clicked': row[5] if row[5] else None,
-                    'total_clicks': row[6],
-                    'utm_source': row[7],
-                    'utm_medium': row[8],
-                    'utm_campaign': row[9],
-                    'utm_content': row[10],
-                    'is_active': bool(row[11])
-                })
-            return urls
+                GROUP BY campaign_type
+            """)
         except Exception as e:
-            logger.error(f"Error getting all URLs: {str(e)}")
+            logger.error(f"Error getting campaign type stats: {str(e)}")
             return []
-        finally:
-            conn.close()
+
+    def links_version_check_due(self) -> bool:
+        """Whether url_cache must be checked against links_version before it is trusted"""
+        with _links_versions_lock:
+            checked_at = _links_versions.get(self.db_path, (None, float('-inf')))[1]
+        return time.monotonic() - checked_at >= LINKS_VERSION_CHECK_INTERVAL
+
+    def refresh_url_cache(self):
+        """Drop url_cache if any process changed a link since the last check (at most once per interval)"""
+        now = time.monotonic()
+        with _links_versions_lock:
+            seen, checked_at = _links_versions.get(self.db_path, (None, float('-inf')))
+            if now - checked_at < LINKS_VERSION_CHECK_INTERVAL:
+                return
+            # Claim this check so concurrent callers keep using the cache
+            _links_versions[self.db_path] = (seen, now)
+
+        try:
+            with self.read_connection() as conn:
+                row = conn.execute("SELECT version FROM links_version WHERE id = 1").fetchone()
+        except Exception as e:
+            logger.error(f"Error reading links version: {str(e)}")
+            return
+        version = row[0] if row else None
+        with _links_versions_lock:
+            _links_versions[self.db_path] = (version, now)
+        if seen is not None and version != seen:
+            url_cache.clear()
+
+    def get_cached_url_info(self, short_code: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Look a link up in url_cache only; returns (found, info) without touching the database"""
+        if self.links_version_check_due():
+            return False, None
+        cached = url_cache.get((self.db_path, short_code))
+        if url_cache.is_missing(cached):
+            return False, None
+        return True, dict(cached) if cached else None
 
     def get_url_info(self, short_code: str) -> Optional[Dict[str, Any]]:
-        """Get URL info including click stats"""
+        """Get URL info including click stats (served from url_cache, so click stats may lag by the cache TTL)"""
+        self.refresh_url_cache()
+        cache_key = (self.db_path, short_code)
+        cached = url_cache.get(cache_key)
+        if not url_cache.is_missing(cached):
+            return dict(cached) if cached else None
+
         try:
             query = """
                 SELECT 
@@ -398,144 +523,283 @@ class Database:
                 WHERE short_code = ?
             """
             result = self.execute_query(query, (short_code,), fetch_one=True)
-            return result if result else None
+            url_cache.set(cache_key, result if result else None)
+            return dict(result) if result else None
         except Exception as e:
             logger.error(f"Error getting URL info: {str(e)}")
             return None
 
-    def get_campaign_performance(self) -> pd.DataFrame:
+    def invalidate_url_cache(self, short_code: str):
+        """Drop a link record from the process-wide URL cache"""
+        url_cache.invalidate((self.db_path, short_code))
+
+    def get_campaign_performance(self) -> 'pd.DataFrame':
         """Get detailed campaign performance metrics"""
-        conn = self.get_connection()
-        try:
-            query = '''
-                WITH ClickStats AS (
+        with self.read_connection() as conn:
+            try:
+                # Per-link counters and the daily rollup replace the raw analytics join
+                query = '''
+                    WITH ClickStats AS (
+                        SELECT 
+                            u.short_code,
+                            u.campaign_name,
+                            u.campaign_type,
+                            u.total_clicks,
+                            u.unique_visitors,
+                            COUNT(DISTINCT NULLIF(r.state, '')) as states_reached,
+                            COUNT(DISTINCT r.bucket) as active_days,
+                            u.created_at,
+                            (SELECT a.clicked_at FROM analytics a
+                             WHERE a.short_code = u.short_code
+                             ORDER BY a.clicked_at_epoch DESC LIMIT 1) as last_activity
+                        FROM urls u
+                        LEFT JOIN click_rollup_daily r ON u.short_code = r.short_code
+                        GROUP BY u.short_code
+                    )
                     SELECT 
-                        u.short_code,
-                        u.campaign_name,
-                        u.campaign_type,
-                        u.total_clicks,
-                        COUNT(DISTINCT a.ip_address) as unique_visitors,
-                        COUNT(DISTINCT a.state) as states_reached,
-                        COUNT(DISTINCT date(a.clicked_at)) as active_days,
-                        u.created_at,
-                        MAX(a.clicked_at) as last_activity
-                    FROM urls u
-                    LEFT JOIN analytics a ON u.short_code = a.short_code
-                    GROUP BY u.short_code
-                )
-                SELECT 
-                    campaign_name,
-                    campaign_type,
-                    total_clicks,
-                    unique_visitors,
-                    states_reached,
-                    active_days,
-                    created_at,
-                    last_activity,
-                    ROUND(CAST(unique_visitors AS FLOAT) / 
-                          CASE WHEN total_clicks = 0 THEN 1 
-                               ELSE total_clicks END * 100, 2) as engagement_rate
-                FROM ClickStats
-                ORDER BY total_clicks DESC
-            '''
+                        campaign_name,
+                        campaign_type,
+                        total_clicks,
+                        unique_visitors,
+                        states_reached,
+                        active_days,
+                        created_at,
+                        last_activity,
+                        ROUND(CAST(unique_visitors AS FLOAT) / 
+                              CASE WHEN total_clicks = 0 THEN 1 
+                                   ELSE total_clicks END * 100, 2) as engagement_rate
+                    FROM ClickStats
+                    ORDER BY total_clicks DESC
+                '''
             
-            df = pd.read_sql_query(query, conn)
-            return df
-        except Exception as e:
-            logger.error(f"Error getting campaign performance: {str(e)}")
-            return pd.DataFrame()
-        finally:
-            conn.close()
-
-    def generate_short_code(self, length=6) -> str:
-        """Generate a unique short code"""
-        characters = string.ascii_letters + string.digits
-        while True:
-            code = ''.join(random.choice(characters) for _ in range(length))
-            # Check if code exists
-            c = self.get_connection()
-            cursor = c.cursor()
-            try:
-                cursor.execute("SELECT COUNT(*) FROM urls WHERE short_code = ?", (code,))
-                if cursor.fetchone()[0] == 0:
-                    return code
-            finally:
-                c.close()
+                df = pd.read_sql_query(query, conn)
+                return df
+            except Exception as e:
+                logger.error(f"Error getting campaign performance: {str(e)}")
+                return pd.DataFrame()
+
+    def generate_short_code(self) -> str:
+        """Allocate a unique short code from the shared block allocator"""
+        return get_code_allocator(self.db_path).allocate()
 
     def create_short_url(self, url: str, campaign_name: str, campaign_type: str = None, utm_params: dict = None) -> str:
         """Create a new short URL"""
-        conn = self.get_connection()
-        c = conn.cursor()
-        try:
-            # Generate unique short code
-            short_code = self.generate_short_code()
+        with self.connection() as conn:
+            c = conn.cursor()
+            try:
+                # Generate unique short code
+                short_code = self.generate_short_code()
             
-            # Add UTM parameters if provided
-            if utm_params:
-                parsed_url = urlparse(url)
-                query_params = parse_qs(parsed_url.query)
-                
-                # Add UTM parameters
-                if utm_params.get('source'): query_params['utm_source'] = [utm_params['source']]
-                if utm_params.get('medium'): query_params['utm_medium'] = [utm_params['medium']]
-                if utm_params.get('campaign'): query_params['utm_campaign'] = [utm_params['campaign']]
-                if utm_params.get('content'): query_params['utm_content'] = [utm_params['content']]
-                
-                # Reconstruct URL with UTM parameters
-                url = parsed_url._replace(query=urlencode(query_params, doseq=True)).geturl()
+                # Add UTM parameters if provided
+                url = self._apply_utm_params(url, utm_params)
             
-            # Insert new URL
-            c.execute('''
-                INSERT INTO urls (
-                    short_code, original_url, campaign_name, campaign_type,
-                    utm_source, utm_medium, utm_campaign, utm_content
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                short_code,
-                url,
-                campaign_name,
-                campaign_type,
-                utm_params.get('source') if utm_params else None,
-                utm_params.get('medium') if utm_params else None,
-                utm_params.get('campaign') if utm_params else None,
-                utm_params.get('content') if utm_params else None
-            ))
+                # Insert new URL; a custom code added after our block was reserved can still collide
+                for attempt in range(3):
+                    try:
+                        c.execute('''
+                            INSERT INTO urls (
+                                short_code, original_url, campaign_name, campaign_type,
+                                utm_source, utm_medium, utm_campaign, utm_content
+                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        ''', (
+                            short_code,
+                            url,
+                            campaign_name,
+                            campaign_type,
+                            utm_params.get('source') if utm_params else None,
+                            utm_params.get('medium') if utm_params else None,
+                            utm_params.get('campaign') if utm_params else None,
+                            utm_params.get('content') if utm_params else None
+                        ))
+                        break
+                    except sqlite3.IntegrityError as e:
+                        if "urls.short_code" not in str(e) or attempt == 2:
+                            raise
+                        short_code = self.generate_short_code()
             
-            conn.commit()
-            logger.info(f"Created short URL: {short_code} for campaign: {campaign_name}")
-            return short_code
+                bump_data_version(conn)
+                conn.commit()
+                # Drop any negative result cached while the code was being generated
+                self.invalidate_url_cache(short_code)
+                logger.info(f"Created short URL: {short_code} for campaign: {campaign_name}")
+                return short_code
             
-        except sqlite3.IntegrityError as e:
-            logger.error(f"Error creating short URL: {str(e)}")
-            if "UNIQUE constraint failed: urls.campaign_name" in str(e):
-                raise ValueError("Campaign name already exists")
-            raise
-        except Exception as e:
-            logger.error(f"Error creating short URL: {str(e)}")
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+            except sqlite3.IntegrityError as e:
+                logger.error(f"Error creating short URL: {str(e)}")
+                if "UNIQUE constraint failed: urls.campaign_name" in str(e):
+                    raise ValueError("Campaign name already exists")
+                raise
+            except Exception as e:
+                logger.error(f"Error creating short URL: {str(e)}")
+                conn.rollback()
+                raise
+
+    def _apply_utm_params(self, url: str, utm_params: dict = None) -> str:
+        """Merge UTM parameters into the URL's query string"""
+        if not utm_params:
+            return url
+        parsed_url = urlparse(url)
+        query_params = parse_qs(parsed_url.query)
+        for key in UTM_KEYS:
+            if utm_params.get(key):
+                query_params[f'utm_{key}'] = [utm_params[key]]
+        return parsed_url._replace(query=urlencode(query_params, doseq=True)).geturl()
+
+    def create_short_urls_bulk(self, rows: Iterable[Dict[str, Any]], chunk_size: int = 1000) -> Dict[str, List[Dict[str, Any]]]:
+        """Create many short URLs in chunked transactions; returns created links and per-row errors"""
+        created, errors = [], []
+        valid = []
+        seen_names = set()
+
+        # Validate every row and merge its UTM parameters once
+        for row_number, row in enumerate(rows, start=1):
+            url = str(row.get('url') or row.get('original_url') or '').strip()
+            campaign_name = str(row.get('campaign_name') or '').strip()
+            if url and not url.startswith(('http://', 'https://')):
+                url = 'https://' + url
+
+            if not campaign_name:
+                errors.append({'row': row_number, 'campaign_name': '', 'error': 'Missing campaign name'})
+                continue
+            if not url or not validators.url(url):
+                errors.append({'row': row_number, 'campaign_name': campaign_name, 'error': 'Invalid URL format'})
+                continue
+            if campaign_name in seen_names:
+                errors.append({'row': row_number, 'campaign_name': campaign_name, 'error': 'Duplicate campaign name in import'})
+                continue
+            seen_names.add(campaign_name)
+
+            utm_params = row.get('utm_params') or {
+                key: str(row.get(f'utm_{key}') or '').strip() or None for key in UTM_KEYS
+            }
+            valid.append({
+                'row': row_number,
+                'url': self._apply_utm_params(url, utm_params),
+                'campaign_name': campaign_name,
+                'campaign_type': str(row.get('campaign_type') or '').strip() or None,
+                'utm_params': utm_params
+            })
+
+        insert_query = '''
+            INSERT INTO urls (
+                short_code, original_url, campaign_name, campaign_type,
+                utm_source, utm_medium, utm_campaign, utm_content, utm_term
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        '''
+        allocator = get_code_allocator(self.db_path)
+        with self.connection() as conn:
+            try:
+                for i in range(0, len(valid), chunk_size):
+                    chunk = valid[i:i + chunk_size]
+
+                    # One query per chunk for names that already exist
+                    names = [item['campaign_name'] for item in chunk]
+                    existing = {r[0] for r in conn.execute(
+                        f"SELECT campaign_name FROM urls WHERE campaign_name IN ({','.join('?' * len(names))})",
+                        names
+                    )}
+                    pending = []
+                    for item in chunk:
+                        if item['campaign_name'] in existing:
+                            errors.append({'row': item['row'], 'campaign_name': item['campaign_name'],
+                                           'error': 'Campaign name already exists'})
+                        else:
+                            pending.append(item)
+                    if not pending:
+                        continue
+
+                    for item, code in zip(pending, allocator.allocate_many(len(pending))):
+                        item['short_code'] = code
+                    records = [(
+                        item['short_code'], item['url'], item['campaign_name'], item['campaign_type'],
+                        *(item['utm_params'].get(key) for key in UTM_KEYS)
+                    ) for item in pending]
+
+                    try:
+                        conn.executemany(insert_query, records)
+                        bump_data_version(conn)
+                        conn.commit()
+                        inserted = pending
+                    except sqlite3.IntegrityError:
+                        # Something raced us; insert row by row to report the conflicting rows
+                        conn.rollback()
+                        inserted = []
+                        for item, record in zip(pending, records):
+                            try:
+                                conn.execute(insert_query, record)
+                                bump_data_version(conn)
+                                conn.commit()
+                                inserted.append(item)
+                            except sqlite3.IntegrityError as e:
+                                conn.rollback()
+                                errors.append({'row': item['row'], 'campaign_name': item['campaign_name'], 'error': str(e)})
+
+                    for item in inserted:
+                        self.invalidate_url_cache(item['short_code'])
+                        created.append({
+                            'row': item['row'],
+                            'short_code': item['short_code'],
+                            'campaign_name': item['campaign_name'],
+                            'original_url': item['url']
+                        })
+
+                logger.info(f"Bulk created {len(created)} short URLs ({len(errors)} rows rejected)")
+            except Exception as e:
+                logger.error(f"Error bulk creating short URLs: {str(e)}")
+                conn.rollback()
+                raise
+
+        errors.sort(key=lambda error: error['row'])
+        return {'created': created, 'errors': errors}
 
     def get_dashboard_stats(self) -> Dict[str, Any]:
-        """Get comprehensive dashboard statistics"""
+        """Get comprehensive dashboard statistics (cached server-wide until the data changes)"""
+        return dashboard_cache.get(
+            # The day is part of the key because the payload covers the last 30 days
+            (self.db_path, 'dashboard_stats', ist_day()),
+            self.get_data_version(), self._load_dashboard_stats
+        )
+
+    def _load_dashboard_stats(self) -> Dict[str, Any]:
+        """Compute comprehensive dashboard statistics"""
         try:
             stats = {}
+            since = ist_day(30)
             
-            # Get basic stats with proper counting
+            # Get basic stats with proper counting. Clicks come from the daily
+            # rollup; links never clicked count as one row, as they did in the
+            # urls LEFT JOIN analytics version of this query.
             base_query = """
-                WITH base_stats AS (
+                WITH recent AS (
+                    SELECT 
+                        short_code,
+                        SUM(clicks) as clicks,
+                        SUM(bounces) as bounces,
+                        SUM(conversions) as conversions,
+                        SUM(time_on_page) as time_on_page,
+                        SUM(timed_clicks) as timed_clicks
+                    FROM click_rollup_daily
+                    WHERE bucket >= ?
+                    GROUP BY short_code
+                ),
+                base_stats AS (
                     SELECT 
-                        COUNT(DISTINCT a.id) as total_clicks,
-                        COUNT(DISTINCT a.ip_address) as unique_visitors,
-                        COUNT(DISTINCT u.short_code) as total_campaigns,
-                        COUNT(DISTINCT CASE WHEN u.last_clicked >= date('now', '-30 day') THEN u.short_code END) as active_campaigns,
-                        ROUND(AVG(CASE WHEN a.time_on_page > 0 THEN a.time_on_page ELSE NULL END), 2) as avg_time,
-                        ROUND(SUM(CASE WHEN a.is_bounce = 1 THEN 1 ELSE 0 END) * 100.0 / NULLIF(COUNT(*), 0), 2) as bounce_rate,
-                        COUNT(CASE WHEN a.is_conversion = 1 THEN 1 END) as conversions
+                        COALESCE(SUM(r.clicks), 0) as total_clicks,
+                        (
+                            SELECT COUNT(DISTINCT a.ip_address)
+                            FROM analytics a
+                            JOIN urls v ON v.short_code = a.short_code
+                            WHERE a.click_day >= ?
+                        ) as unique_visitors,
+                        COUNT(*) as total_campaigns,
+                        COUNT(CASE WHEN u.last_clicked >= date('now', '-30 day') THEN 1 END) as active_campaigns,
+                        ROUND(SUM(r.time_on_page) * 1.0 / NULLIF(SUM(r.timed_clicks), 0), 2) as avg_time,
+                        ROUND(COALESCE(SUM(r.bounces), 0) * 100.0 / NULLIF(SUM(COALESCE(r.clicks, 1)), 0), 2) as bounce_rate,
+                        COALESCE(SUM(r.conversions), 0) as conversions
                     FROM urls u
-                    LEFT JOIN analytics a ON u.short_code = a.short_code
-                    WHERE a.clicked_at >= date('now', '-30 day') OR a.clicked_at IS NULL
+                    LEFT JOIN recent r ON u.short_code = r.short_code
+                    WHERE r.short_code IS NOT NULL
+                    OR NOT EXISTS (SELECT 1 FROM click_rollup_daily d WHERE d.short_code = u.short_code)
                 )
                 SELECT 
                     *,
@@ -543,7 +807,7 @@ class Database:
                 FROM base_stats
             """
             
-            base_stats = self.execute_query(base_query, fetch_one=True)
+            base_stats = self.execute_query(base_query, (since, since), fetch_one=True)
             if base_stats:
                 stats.update({
                     'total_clicks': base_stats['total_clicks'] or 0,
@@ -558,25 +822,25 @@ class Database:
             # Get device stats
             device_query = """
                 SELECT 
-                    device_type,
-                    COUNT(*) as count
-                FROM analytics
-                WHERE clicked_at >= date('now', '-30 day')
+                    NULLIF(device_type, '') as device_type,
+                    SUM(clicks) as count
+                FROM click_rollup_daily
+                WHERE bucket >= ?
                 GROUP BY device_type
             """
-            device_stats = self.execute_query(device_query)
+            device_stats = self.execute_query(device_query, (since,))
             stats['device_stats'] = {row['device_type']: row['count'] for row in device_stats} if device_stats else {}
             
             # Get browser stats
             browser_query = """
                 SELECT 
-                    browser,
-                    COUNT(*) as count
-                FROM analytics
-                WHERE clicked_at >= date('now', '-30 day')
+                    NULLIF(browser, '') as browser,
+                    SUM(clicks) as count
+                FROM click_rollup_daily
+                WHERE bucket >= ?
                 GROUP BY browser
             """
-            browser_stats = self.execute_query(browser_query)
+            browser_stats = self.execute_query(browser_query, (since,))
             stats['browser_stats'] = {row['browser']: row['count'] for row in browser_stats} if browser_stats else {}
             
             # Get recent activities
@@ -589,11 +853,11 @@ class Database:
             campaign_query = """
                 SELECT 
                     u.campaign_name,
-                    COUNT(DISTINCT a.id) as clicks,
-                    COUNT(DISTINCT a.ip_address) as unique_visitors,
-                    ROUND(COUNT(CASE WHEN a.is_conversion = 1 THEN 1 END) * 100.0 / NULLIF(COUNT(*), 0), 2) as conversion_rate
+                    COALESCE(SUM(r.clicks), 0) as clicks,
+                    u.unique_visitors,
+                    ROUND(COALESCE(SUM(r.conversions), 0) * 100.0 / MAX(COALESCE(SUM(r.clicks), 0), 1), 2) as conversion_rate
                 FROM urls u
-                LEFT JOIN analytics a ON u.short_code = a.short_code
+                LEFT JOIN click_rollup_daily r ON u.short_code = r.short_code
                 GROUP BY u.campaign_name
                 ORDER BY clicks DESC
                 LIMIT 5
@@ -620,65 +884,46 @@ class Database:
             }
 
     def record_click(self, short_code: str, client_info: Dict[str, Any]):
-        """Record click analytics with engagement metrics"""
+        """Record click analytics through the write-behind click queue"""
         try:
-            # Get IP and click data
-            ip_tracker = IPTracker()
-            click_data = ip_tracker.get_click_data(client_info)
-            
-            # Enrich client info with geo data
-            geo_service = GeoService()
-            enriched_info = geo_service.enrich_client_info(click_data)
-            
             # Generate session ID if not exists
-            session_id = enriched_info.get('session_id', str(uuid.uuid4()))
+            session_id = client_info.get('session_id') or str(uuid.uuid4())
             current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
-            # Insert analytics record
-            insert_query = """
-                INSERT INTO analytics (
-                    short_code, clicked_at, ip_address, user_agent,
-                    referrer, state, device_type, browser, os,
-                    event_type, session_id, is_bounce, time_on_page,
-                    is_conversion
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            
-            self.execute_query(insert_query, (
-                short_code,
-                current_time,
-                enriched_info.get('ip_address'),
-                enriched_info.get('user_agent'),
-                enriched_info.get('referrer'),
-                enriched_info.get('state'),
-                enriched_info.get('device_type', 'Desktop'),
-                enriched_info.get('browser', 'Chrome'),
-                enriched_info.get('os', 'Unknown'),
-                'click',
-                session_id,
-                1,  # is_bounce
-                0,  # initial time_on_page
-                0   # is_conversion
-            ))
-
-            # Update URL stats with proper unique visitor counting
-            update_query = """
-                UPDATE urls 
-                SET 
-                    total_clicks = total_clicks + 1,
-                    last_clicked = CURRENT_TIMESTAMP,
-                    unique_visitors = (
-                        SELECT COUNT(DISTINCT ip_address) 
-                        FROM analytics 
-                        WHERE short_code = ? 
-                        AND ip_address IS NOT NULL
-                        AND ip_address != ''
-                    )
-                WHERE short_code = ?
-            """
-            self.execute_query(update_query, (short_code, short_code))
+            # Queue raw analytics record; the click writer batches the insert
+            # and the per-link counter updates, and state/city/isp are filled
+            # in later by the enrichment worker
+            event = {
+                'short_code': short_code,
+                'clicked_at': current_time,
+                'ip_address': client_info.get('ip_address'),
+                'user_agent': client_info.get('user_agent'),
+                'referrer': client_info.get('referrer'),
+                'state': None,
+                'device_type': client_info.get('device_type', 'Desktop'),
+                'browser': client_info.get('browser', 'Chrome'),
+                'os': client_info.get('os', 'Unknown'),
+                'event_type': 'click',
+                'session_id': session_id,
+                'visitor_hash': visitor_hash(client_info.get('ip_address')),
+                'is_bounce': 1,
+                'time_on_page': 0,
+                'is_conversion': 0,
+                'enrichment_status': 'pending'
+            }
+            stamp_referrer(stamp_click(event))
+            # The event log keeps a replayable copy even if the queue drops it
+            log_event('click', event)
+            queued = get_click_writer(self.db_path).enqueue(event)
+            if not queued:
+                return False
+
+            if os.getenv('ENRICHMENT_IN_PROCESS', '1') != '0':
+                # Imported here so processes that only read never load requests
+                from enrichment_worker import get_enrichment_worker
+                get_enrichment_worker(self.db_path)
             
-            logger.info(f"Recorded click with enhanced metrics for {short_code}")
+            logger.info(f"Queued click for {short_code}")
             return True
 
         except Exception as e:
@@ -700,7 +945,7 @@ class Database:
         except Exception as e:
             logger.error(f"Error updating URL stats: {str(e)}")
 
-    def handle_redirect(self, short_code: str) -> Optional[str]:
+    def handle_redirect(self, short_code: str, client_info: Dict[str, Any] = None) -> Optional[str]:
         """Handle URL redirect and record analytics"""
         try:
             # Get URL info
@@ -708,8 +953,10 @@ class Database:
             if not url_info or not url_info.get('is_active', False):
                 return None
 
-            # Get client info from session state
-            client_info = st.session_state.get('client_info', {})
+            # Fall back to client info from session state when running under Streamlit
+            if client_info is None:
+                st = sys.modules.get('streamlit')
+                client_info = st.session_state.get('client_info', {}) if st else {}
             
             # Record the click
             self.record_click(short_code, client_info)
@@ -723,42 +970,65 @@ class Database:
 
     def update_campaign(self, short_code: str, **kwargs) -> bool:
         """Update campaign details"""
-        conn = self.get_connection()
-        c = conn.cursor()
-        try:
-            # Build update query dynamically based on provided fields
-            update_fields = []
-            values = []
-            for key, value in kwargs.items():
-                if value is not None:
-                    update_fields.append(f"{key} = ?")
-                    values.append(value)
+        with self.connection() as conn:
+            c = conn.cursor()
+            try:
+                # Build update query dynamically based on provided fields
+                update_fields = []
+                values = []
+                for key, value in kwargs.items():
+                    if value is not None:
+                        update_fields.append(f"{key} = ?")
+                        values.append(value)
+            
+                if not update_fields:
+                    return True
             
-            if not update_fields:
+                # Add short_code to values
+                values.append(short_code)
+            
+                # Execute update
+                query = f"""
+                    UPDATE urls 
+                    SET {', '.join(update_fields)}
+                    WHERE short_code = ?
+                """
+                c.execute(query, values)
+            
+                bump_data_version(conn)
+                conn.commit()
+                self.invalidate_url_cache(short_code)
+                logger.info(f"Campaign {short_code} updated successfully")
                 return True
             
-            # Add short_code to values
-            values.append(short_code)
+            except Exception as e:
+                logger.error(f"Error updating campaign: {str(e)}")
+                conn.rollback()
+                return False
             
-            # Execute update
-            query = f"""
-                UPDATE urls 
-                SET {', '.join(update_fields)}
-                WHERE short_code = ?
-            """
-            c.execute(query, values)
+
+    def delete_campaign(self, short_code: str) -> bool:
+        """Delete a campaign and its analytics"""
+        with self.connection() as conn:
+            c = conn.cursor()
+            try:
+                c.execute("DELETE FROM analytics WHERE short_code = ?", (short_code,))
+                c.execute("DELETE FROM engagement_metrics WHERE short_code = ?", (short_code,))
+                c.execute("DELETE FROM link_visitors WHERE short_code = ?", (short_code,))
+                remove_rollups(conn, short_code)
+                c.execute("DELETE FROM urls WHERE short_code = ?", (short_code,))
             
-            conn.commit()
-            logger.info(f"Campaign {short_code} updated successfully")
-            return True
+                bump_data_version(conn)
+                conn.commit()
+                self.invalidate_url_cache(short_code)
+                logger.info(f"Campaign {short_code} deleted")
+                return True
             
-        except Exception as e:
-            logger.error(f"Error updating campaign: {str(e)}")
-            conn.rollback()
-            return False
+            except Exception as e:
+                logger.error(f"Error deleting campaign: {str(e)}")
+                conn.rollback()
+                return False
             
-        finally:
-            conn.close()
 
     def get_user(self, username: str) -> Optional[dict]:
         """Get user by username"""
@@ -814,28 +1084,29 @@ class Database:
 
     def execute_query(self, query: str, params: tuple = (), fetch_one: bool = False):
         """Execute a database query with parameters"""
-        conn = self.get_connection()
-        try:
-            conn.row_factory = sqlite3.Row  # This allows accessing columns by name
-            cursor = conn.cursor()
-            cursor.execute(query, params)
+        is_write = query.strip().upper().startswith(('INSERT', 'UPDATE', 'DELETE'))
+        is_read = query.strip().upper().startswith(('SELECT', 'WITH'))
+        with (self.read_connection() if is_read else self.connection()) as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row  # This allows accessing columns by name
+                cursor.execute(query, params)
             
-            if query.strip().upper().startswith(('INSERT', 'UPDATE', 'DELETE')):
-                conn.commit()
-                return cursor.lastrowid
-            else:
-                if fetch_one:
-                    row = cursor.fetchone()
-                    return dict(row) if row else None
-                return [dict(row) for row in cursor.fetchall()]
+                if is_write:
+                    bump_data_version(conn)
+                    conn.commit()
+                    return cursor.lastrowid
+                else:
+                    if fetch_one:
+                        row = cursor.fetchone()
+                        return dict(row) if row else None
+                    return [dict(row) for row in cursor.fetchall()]
             
-        except Exception as e:
-            logger.error(f"Database query error: {str(e)}")
-            if query.strip().upper().startswith(('INSERT', 'UPDATE', 'DELETE')):
-                conn.rollback()
-            raise
-        finally:
-            conn.close()
+            except Exception as e:
+                logger.error(f"Database query error: {str(e)}")
+                if is_write:
+                    conn.rollback()
+                raise
 
     def get_total_visitors(self) -> int:
         """Get total number of visitors"""
@@ -853,9 +1124,9 @@ class Database:
             query = """
                 SELECT COUNT(DISTINCT ip_address) as unique_visitors
                 FROM analytics
-                WHERE clicked_at >= date('now', '-30 day')
+                WHERE click_day >= ?
             """
-            result = self.execute_query(query, fetch_one=True)
+            result = self.execute_query(query, (ist_day(30),), fetch_one=True)
             return result['unique_visitors'] if result else 0
         except Exception as e:
             logger.error(f"Error getting unique visitors: {str(e)}")
@@ -879,8 +1150,8 @@ class Database:
         """Get device type distribution"""
         try:
             query = """
-                SELECT device_type, COUNT(*) as count
-                FROM analytics
+                SELECT NULLIF(device_type, '') as device_type, SUM(clicks) as count
+                FROM click_rollup_daily
                 GROUP BY device_type
             """
             results = self.execute_query(query)
@@ -893,8 +1164,8 @@ class Database:
         """Get browser distribution"""
         try:
             query = """
-                SELECT browser, COUNT(*) as count
-                FROM analytics
+                SELECT NULLIF(browser, '') as browser, SUM(clicks) as count
+                FROM click_rollup_daily
                 GROUP BY browser
             """
             results = self.execute_query(query)
@@ -907,8 +1178,8 @@ class Database:
         """Get OS distribution"""
         try:
             query = """
-                SELECT os, COUNT(*) as count
-                FROM analytics
+                SELECT NULLIF(os, '') as os, SUM(clicks) as count
+                FROM click_rollup_daily
                 GROUP BY os
             """
             results = self.execute_query(query)
@@ -921,9 +1192,9 @@ class Database:
         """Get geographical distribution"""
         try:
             query = """
-                SELECT state, COUNT(*) as count
-                FROM analytics
-                WHERE state IS NOT NULL
+                SELECT state, SUM(clicks) as count
+                FROM click_rollup_daily
+                WHERE state != ''
                 GROUP BY state
             """
             results = self.execute_query(query)
@@ -935,26 +1206,32 @@ class Database:
     def save_analytics_event(self, event_type: str, event_data: Dict[str, Any]):
         """Save analytics event to database"""
         try:
-            query = """
-                INSERT INTO analytics (
-                    short_code, clicked_at, ip_address, user_agent,
-                    referrer, state, device_type, browser, os,
-                    event_type, event_data
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            row = stamp_referrer(stamp_click({
+                'short_code': event_data.get('short_code'),
+                'ip_address': event_data.get('ip_address'),
+                'user_agent': event_data.get('user_agent'),
+                'referrer': event_data.get('referrer'),
+                'state': event_data.get('state'),
+                'device_type': event_data.get('device_type'),
+                'browser': event_data.get('browser'),
+                'os': event_data.get('os'),
+                'event_type': event_type,
+                'event_data': json.dumps(event_data)
+            }))
+            query = f"""
+                INSERT INTO analytics ({', '.join(row)})
+                VALUES ({', '.join('?' for _ in row)})
             """
-            self.execute_query(query, (
-                event_data.get('short_code'),
-                datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                event_data.get('ip_address'),
-                event_data.get('user_agent'),
-                event_data.get('referrer'),
-                event_data.get('state'),
-                event_data.get('device_type'),
-                event_data.get('browser'),
-                event_data.get('os'),
-                event_type,
-                json.dumps(event_data)
-            ))
+            with self.connection() as conn:
+                try:
+                    conn.execute(query, tuple(row.values()))
+                    # Column defaults for the rollup measures
+                    record_events(conn, [dict(row, is_bounce=1, is_conversion=0, time_on_page=0)])
+                    bump_data_version(conn)
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
             logger.info(f"Saved analytics event: {event_type}")
         except Exception as e:
             logger.error(f"Error saving analytics event: {str(e)}")
@@ -964,7 +1241,7 @@ class Database:
         try:
             query = """
                 SELECT * FROM analytics
-                ORDER BY clicked_at DESC
+                ORDER BY clicked_at_epoch DESC
                 LIMIT ?
             """
             return self.execute_query(query, (limit,))
@@ -972,6 +1249,32 @@ class Database:
             logger.error(f"Error getting recent events: {str(e)}")
             return []
 
+    def get_events_page(self, limit: int = 50, cursor: str = None, short_code: str = None,
+                        event_type: str = None) -> Dict[str, Any]:
+        """Get one keyset-paginated page of analytics events, newest first"""
+        direction, key = decode_cursor(cursor)
+        seek, order_by, params = keyset_query(('clicked_at_epoch', 'id'), True, direction, key)
+        conditions = ["clicked_at_epoch IS NOT NULL"] + ([seek] if seek else [])
+        if short_code:
+            conditions.append("short_code = ?")
+            params.append(short_code)
+        if event_type:
+            conditions.append("event_type = ?")
+            params.append(event_type)
+
+        query = f"""
+            SELECT * FROM analytics
+            WHERE {' AND '.join(conditions)}
+            ORDER BY {order_by}
+            LIMIT ?
+        """
+        try:
+            rows = self.execute_query(query, tuple(params) + (limit + 1,))
+            return build_page(rows, limit, direction, key is not None, ('clicked_at_epoch', 'id'))
+        except Exception as e:
+            logger.error(f"Error getting event page: {str(e)}")
+            return {'items': [], 'next_cursor': None, 'prev_cursor': None}
+
     def get_recent_activities(self, limit=10) -> List[Dict]:
         """Get recent activities with enhanced details"""
         try:
@@ -992,7 +1295,7 @@ class Database:
                     a.is_conversion
                 FROM analytics a
                 JOIN urls u ON a.short_code = u.short_code
-                ORDER BY a.clicked_at DESC
+                ORDER BY a.clicked_at_epoch DESC
                 LIMIT ?
             """
             activities = self.execute_query(query, (limit,))
@@ -1020,19 +1323,12 @@ class Database:
     def get_traffic_sources(self) -> Dict[str, int]:
         """Get traffic source distribution"""
         try:
+            # referrer_class is the source_class stored on each click at ingest
             query = """
                 SELECT 
-                    CASE
-                        WHEN referrer IS NULL OR referrer = '' THEN 'Direct'
-                        WHEN referrer LIKE '%google%' THEN 'Google'
-                        WHEN referrer LIKE '%facebook%' THEN 'Facebook'
-                        WHEN referrer LIKE '%twitter%' THEN 'Twitter'
-                        WHEN referrer LIKE '%linkedin%' THEN 'LinkedIn'
-                        WHEN referrer LIKE '%instagram%' THEN 'Instagram'
-                        ELSE 'Other'
-                    END as source,
-                    COUNT(*) as count
-                FROM analytics
+                    referrer_class as source,
+                    SUM(clicks) as count
+                FROM click_rollup_daily
                 GROUP BY source
                 ORDER BY count DESC
             """
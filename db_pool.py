@@ -0,0 +1,160 @@
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Tuple
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+POOL_SIZE = int(os.getenv('SQLITE_POOL_SIZE', '8'))
+BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT', '5000'))
+MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
+# Negative cache_size is in KiB
+CACHE_SIZE = int(os.getenv('SQLITE_CACHE_SIZE', '-65536'))
+CACHED_STATEMENTS = int(os.getenv('SQLITE_CACHED_STATEMENTS', '256'))
+
+
+def connect(db_path: str, read_only: bool = False, **kwargs) -> sqlite3.Connection:
+    """Open a connection with the tuned pragmas applied"""
+    kwargs.setdefault('timeout', BUSY_TIMEOUT_MS / 1000)
+    kwargs.setdefault('cached_statements', CACHED_STATEMENTS)
+    if read_only:
+        conn = sqlite3.connect(f"file:{os.path.abspath(db_path)}?mode=ro", uri=True, **kwargs)
+    else:
+        conn = sqlite3.connect(db_path, **kwargs)
+
+    # journal_mode is persistent in the file; readers cannot change it
+    if not read_only:
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size={CACHE_SIZE}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+def begin_immediate(conn: sqlite3.Connection, stats):
+    """Start a write transaction, adding the wait for the database lock to stats.lock_waits/lock_wait_ms/max_lock_wait_ms"""
+    start = time.perf_counter()
+    conn.execute("BEGIN IMMEDIATE")
+    waited = (time.perf_counter() - start) * 1000
+    stats.lock_waits += 1
+    stats.lock_wait_ms += waited
+    if waited > stats.max_lock_wait_ms:
+        stats.max_lock_wait_ms = waited
+
+
+class ConnectionPool:
+    """Thread-safe pool of persistent SQLite connections"""
+
+    def __init__(self, db_path: str, size: int = POOL_SIZE, read_only: bool = False, timeout: float = 30.0):
+        """Initialize pool limits; connections are opened on demand"""
+        self.db_path = db_path
+        self.size = size
+        self.read_only = read_only
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self.checkouts = 0
+        self.waits = 0
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection; any transaction left open is rolled back on return"""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._reset(conn)
+
+    def close(self):
+        """Close every idle connection"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pool counters"""
+        return {
+            'size': self.size,
+            'open': self._created,
+            'idle': self._idle.qsize(),
+            'checkouts': self.checkouts,
+            'waits': self.waits,
+            'read_only': self.read_only
+        }
+
+    def _acquire(self) -> sqlite3.Connection:
+        """Take an idle connection, open a new one, or wait for one to be returned"""
+        self.checkouts += 1
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._created < self.size
+            if can_open:
+                self._created += 1
+        if can_open:
+            try:
+                return connect(self.db_path, read_only=self.read_only, check_same_thread=False)
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        self.waits += 1
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(f"Timed out waiting for a connection to {self.db_path}")
+
+    def _reset(self, conn: sqlite3.Connection):
+        """Return a connection to the pool, discarding it if it is no longer usable"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+            self._idle.put(conn)
+        except sqlite3.Error as e:
+            logger.warning(f"Discarding pooled connection: {str(e)}")
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+            with self._lock:
+                self._created -= 1
+
+
+_pools: Dict[Tuple[str, bool], ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(db_path: str, read_only: bool = False) -> ConnectionPool:
+    """Get the process-wide read-write or read-only pool for a database"""
+    key = (db_path, read_only)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(db_path, read_only=read_only)
+        return pool
+
+
+def close_connection_pools():
+    """Close idle connections in every pool"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,315 @@
+"""
+Background IP/geo enrichment for clicks.
+
+Clicks are stored immediately with raw IP/UA and enrichment_status='pending'.
+This worker claims pending rows in batches, looks up each distinct IP on a
+thread pool and fills state/city/isp, retrying failed lookups with
+exponential backoff.
+
+Runs in-process by default (ENRICHMENT_IN_PROCESS=1), or standalone with:
+    python enrichment_worker.py --db urls.db --workers 4
+"""
+import argparse
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+from db_pool import begin_immediate, connect
+from ip_tracker import IPTracker, ip_cache
+from rollups import reassign_states
+from dashboard_cache import bump_data_version
+from geo_service import GeoService
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# IPs that can never be resolved by the lookup APIs
+LOCAL_IPS = ('', '127.0.0.1', 'localhost', '::1')
+
+
+class EnrichmentWorker:
+    """Claims pending clicks in batches and fills in state/city/isp asynchronously"""
+
+    def __init__(self, db_path: str, batch_size: int = 100, workers: int = 4,
+                 poll_interval: float = 1.0, max_attempts: int = 5,
+                 backoff_base: float = 30.0, backoff_max: float = 3600.0,
+                 lease_seconds: float = 300.0):
+        """Initialize batching, retry policy and counters"""
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease_seconds = lease_seconds
+        self.ip_tracker = IPTracker()
+        self.geo_service = GeoService()
+        self._pool = None
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.processed = 0
+        self.enriched = 0
+        self.retried = 0
+        self.failed = 0
+        self.lookups = 0
+        self.batches = 0
+        self.last_batch_ms = 0.0
+        self.lock_waits = 0
+        self.lock_wait_ms = 0.0
+        self.max_lock_wait_ms = 0.0
+
+    def start(self):
+        """Start the background polling thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='enrichment')
+        self._thread = threading.Thread(target=self._run, name=f"enrichment:{self.db_path}", daemon=True)
+        self._thread.start()
+        logger.info(f"Enrichment worker started for {self.db_path}")
+
+    def stop(self, timeout: float = 10.0):
+        """Stop polling and shut down the lookup pool"""
+        if not self._thread:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        self._pool.shutdown(wait=False)
+        self._pool = None
+        logger.info(f"Enrichment worker stopped for {self.db_path}")
+
+    def get_connection(self) -> sqlite3.Connection:
+        """Get a connection with explicit transaction control"""
+        return connect(self.db_path, timeout=30, isolation_level=None)
+
+    def backlog(self) -> int:
+        """Get the number of clicks still pending enrichment"""
+        conn = self.get_connection()
+        try:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM analytics WHERE enrichment_status = 'pending'"
+            ).fetchone()
+            return row[0] if row else 0
+        except Exception as e:
+            logger.error(f"Error getting enrichment backlog: {str(e)}")
+            return 0
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get backlog and throughput counters"""
+        return {
+            'backlog': self.backlog(),
+            'processed': self.processed,
+            'enriched': self.enriched,
+            'retried': self.retried,
+            'failed': self.failed,
+            'lookups': self.lookups,
+            'batches': self.batches,
+            'last_batch_ms': self.last_batch_ms,
+            'lock_waits': self.lock_waits,
+            'lock_wait_ms': round(self.lock_wait_ms, 2),
+            'max_lock_wait_ms': round(self.max_lock_wait_ms, 2),
+            'ip_cache': ip_cache.stats()
+        }
+
+    def run_once(self) -> int:
+        """Claim and enrich a single batch; returns the number of clicks processed"""
+        start = time.perf_counter()
+        conn = self.get_connection()
+        try:
+            rows = self._claim_batch(conn)
+            if not rows:
+                return 0
+
+            # Look up each distinct IP once per batch
+            ips = sorted({row[1] or '' for row in rows})
+            pool = self._pool or ThreadPoolExecutor(max_workers=self.workers)
+            try:
+                results = dict(zip(ips, pool.map(self._lookup, ips)))
+            finally:
+                if pool is not self._pool:
+                    pool.shutdown(wait=True)
+
+            self._apply_results(conn, rows, results)
+
+            self.processed += len(rows)
+            self.batches += 1
+            self.last_batch_ms = round((time.perf_counter() - start) * 1000, 2)
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Error enriching clicks: {str(e)}")
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            return 0
+        finally:
+            conn.close()
+
+    def _run(self):
+        """Poll for pending clicks until stopped"""
+        while not self._stop.is_set():
+            processed = self.run_once()
+            # Keep draining while batches come back full
+            if processed < self.batch_size:
+                self._stop.wait(self.poll_interval)
+
+    def _claim_batch(self, conn: sqlite3.Connection) -> List[tuple]:
+        """Lease a batch of due pending clicks so other workers skip them"""
+        now = time.time()
+        begin_immediate(conn, self)
+        rows = conn.execute("""
+            SELECT id, ip_address, enrichment_attempts
+            FROM analytics
+            WHERE enrichment_status = 'pending'
+            AND (enrichment_next_at IS NULL OR enrichment_next_at <= ?)
+            ORDER BY id
+            LIMIT ?
+        """, (now, self.batch_size)).fetchall()
+        if rows:
+            conn.executemany(
+                "UPDATE analytics SET enrichment_next_at = ? WHERE id = ?",
+                [(now + self.lease_seconds, row[0]) for row in rows]
+            )
+        conn.execute("COMMIT")
+        return rows
+
+    def _lookup(self, ip_address: str) -> Optional[Dict[str, str]]:
+        """Resolve one IP to state/city/isp, or None if the lookup failed"""
+        if ip_address in LOCAL_IPS:
+            # Nothing to look up; use the same fallback as GeoService
+            location = self.geo_service.get_location_from_ip(ip_address)
+            return {'state': location['state'], 'city': location['city'], 'isp': location['isp']}
+
+        self.lookups += 1
+        details = self.ip_tracker.lookup_ip_details(ip_address)
+        if not details:
+            if self.ip_tracker.has_offline_index():
+                # An index miss is final, so skip the retries
+                location = self.geo_service.get_location_from_ip(ip_address)
+                return {'state': location['state'], 'city': location['city'], 'isp': location['isp']}
+            return None
+        return {
+            'state': details.get('region'),
+            'city': details.get('city'),
+            'isp': details.get('isp')
+        }
+
+    def _apply_results(self, conn: sqlite3.Connection, rows: List[tuple], results: Dict[str, Optional[Dict]]):
+        """Write enrichment results and schedule retries with backoff"""
+        now = time.time()
+        done, retries, failures = [], [], []
+        for row_id, ip_address, attempts in rows:
+            result = results.get(ip_address or '')
+            attempts = (attempts or 0) + 1
+            if result:
+                done.append((result['state'], result['city'], result['isp'], attempts, row_id))
+            elif attempts >= self.max_attempts:
+                # Give up and keep the GeoService fallback location
+                location = self.geo_service.get_location_from_ip(ip_address or '')
+                failures.append((location['state'], location['city'], location['isp'], attempts, row_id))
+            else:
+                delay = min(self.backoff_base * (2 ** (attempts - 1)), self.backoff_max)
+                retries.append((attempts, now + delay, row_id))
+
+        begin_immediate(conn, self)
+        # Move rollup counts out of the pending (empty) state first
+        reassign_states(conn, {update[-1]: update[0] for update in done + failures})
+        conn.executemany("""
+            UPDATE analytics
+            SET state = ?, city = ?, isp = ?, enrichment_attempts = ?,
+                enrichment_status = 'done', enrichment_next_at = NULL
+            WHERE id = ?
+        """, done)
+        conn.executemany("""
+            UPDATE analytics
+            SET state = ?, city = ?, isp = ?, enrichment_attempts = ?,
+                enrichment_status = 'failed', enrichment_next_at = NULL
+            WHERE id = ?
+        """, failures)
+        conn.executemany("""
+            UPDATE analytics
+            SET enrichment_attempts = ?, enrichment_next_at = ?
+            WHERE id = ?
+        """, retries)
+        if done or failures:
+            bump_data_version(conn)
+        conn.execute("COMMIT")
+
+        self.enriched += len(done)
+        self.failed += len(failures)
+        self.retried += len(retries)
+
+
+_workers: Dict[str, EnrichmentWorker] = {}
+_workers_lock = threading.Lock()
+
+
+def get_enrichment_worker(db_path: str) -> EnrichmentWorker:
+    """Get the started process-wide enrichment worker for a database"""
+    with _workers_lock:
+        worker = _workers.get(db_path)
+        if worker is None:
+            worker = EnrichmentWorker(
+                db_path,
+                batch_size=int(os.getenv('ENRICHMENT_BATCH_SIZE', '100')),
+                workers=int(os.getenv('ENRICHMENT_WORKERS', '4'))
+            )
+            worker.start()
+            _workers[db_path] = worker
+        return worker
+
+
+def stop_enrichment_workers():
+    """Stop every enrichment worker"""
+    with _workers_lock:
+        workers = list(_workers.values())
+    for worker in workers:
+        worker.stop()
+
+
+atexit.register(stop_enrichment_workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enrich pending clicks with IP geo data")
+    parser.add_argument('--db', default=os.getenv('URLS_DB_PATH', 'urls.db'), help="Path to urls.db")
+    parser.add_argument('--workers', type=int, default=4, help="Concurrent IP lookups")
+    parser.add_argument('--batch-size', type=int, default=100, help="Clicks claimed per batch")
+    parser.add_argument('--once', action='store_true', help="Drain the due backlog once and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    # Make sure the enrichment columns exist before polling
+    from database import Database
+    Database(args.db)
+
+    worker = EnrichmentWorker(args.db, batch_size=args.batch_size, workers=args.workers)
+    if args.once:
+        while worker.run_once():
+            pass
+        logger.info(f"Enrichment stats: {worker.stats()}")
+        return
+
+    worker.start()
+    try:
+        while True:
+            time.sleep(30)
+            logger.info(f"Enrichment stats: {worker.stats()}")
+    except KeyboardInterrupt:
+        worker.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,9 @@ import socket
 from datetime import datetime
 import re
 
+from geoip_index import get_geoip_index
+from referrer import referrer_channel
+
 logger = logging.getLogger(__name__)
 
 class GeoService:
@@ -79,6 +82,19 @@ class GeoService:
             if not ip_address or ip_address == '127.0.0.1':
                 return self._get_smart_fallback_location()
 
+            # Prefer the offline range index; the prefix table is only used without one
+            index = get_geoip_index()
+            if index is not None:
+                record = index.lookup(ip_address)
+                if not record:
+                    return self._get_smart_fallback_location()
+                return {
+                    'country': record['country'],
+                    'state': record['region'],
+                    'city': record['city'],
+                    'isp': record['isp']
+                }
+
             # Try to determine location from IP patterns
             for state, data in self.india_geo_data.items():
                 if any(ip_address.startswith(prefix) for prefix in data['ip_ranges']):
@@ -151,14 +167,4 @@ class GeoService:
 
     def _classify_referrer(self, referrer: str) -> str:
         """Classify referrer into meaningful categories"""
-        referrer = referrer.lower() if referrer else ''
-        if not referrer:
-            return 'Direct'
-        elif 'google' in referrer:
-            return 'Search'
-        elif any(x in referrer for x in ['facebook', 'instagram', 'twitter', 'linkedin']):
-            return 'Social'
-        elif 'email' in referrer or 'mail' in referrer:
-            return 'Email'
-        else:
-            return 'Other'
\ No newline at end of file
+        return referrer_channel(referrer)
\ No newline at end of file
@@ -0,0 +1,304 @@
+"""
+Offline IP-range geolocation index.
+
+Imports a CSV of IPv4/IPv6 CIDR ranges into a compact, memory-mapped file of
+sorted range arrays, so lookups are a binary search with no network calls.
+
+CSV columns (header required): network,country,region,city,isp,asn
+
+Build or atomically replace the index:
+    python geoip_index.py build ranges.csv geoip.idx
+Look up an address:
+    python geoip_index.py lookup geoip.idx 103.168.1.10
+"""
+import argparse
+import csv
+import ipaddress
+import json
+import logging
+import mmap
+import os
+import socket
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from typing import Dict, Optional, List, Tuple
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+MAGIC = b'GEOIDX01'
+# magic, v4 range count, v6 range count, record table length
+HEADER = struct.Struct('<8sIIQ')
+RECORD_FIELDS = ('country', 'region', 'city', 'isp', 'asn')
+V6_KEY_SIZE = 16
+# IPv4 ranges are bucketed by /16 so each bisect only scans a few entries
+V4_BUCKET_SHIFT = 16
+V4_BUCKETS = 1 << (32 - V4_BUCKET_SHIFT)
+
+
+def _align(offset: int) -> int:
+    """Round an offset up to 8 bytes"""
+    return (offset + 7) & ~7
+
+
+def _flatten(ranges: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
+    """Turn nested CIDR ranges into disjoint ranges where the most specific one wins"""
+    ranges.sort(key=lambda r: (r[0], -r[1]))
+    flat = []
+    # Open ranges as [next uncovered address, end, record]
+    stack = []
+
+    def close_top():
+        start, end, record = stack.pop()
+        if start <= end:
+            flat.append((start, end, record))
+        if stack:
+            stack[-1][0] = end + 1
+
+    for start, end, record in ranges:
+        while stack and stack[-1][1] < start:
+            close_top()
+        if stack:
+            parent = stack[-1]
+            if parent[0] <= start - 1:
+                flat.append((parent[0], start - 1, parent[2]))
+            parent[0] = end + 1
+        stack.append([start, end, record])
+    while stack:
+        close_top()
+    return flat
+
+
+class _V6Keys:
+    """Sequence view over fixed-width big-endian IPv6 keys, for bisect"""
+
+    def __init__(self, view: memoryview, count: int):
+        self._view = view
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> bytes:
+        offset = i * V6_KEY_SIZE
+        return self._view[offset:offset + V6_KEY_SIZE].tobytes()
+
+
+class GeoIPIndex:
+    """Memory-mapped sorted-range index answering IP lookups by binary search"""
+
+    def __init__(self, path: str):
+        """Map the index file and set up array views over it"""
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+
+        magic, v4_count, v6_count, records_length = HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a GeoIP index file")
+        if sys.byteorder != 'little':
+            raise ValueError("GeoIP index files are little-endian only")
+
+        offset = _align(HEADER.size)
+        self.v4_buckets = view[offset:offset + 4 * (V4_BUCKETS + 1)].cast('I')
+        offset += 4 * (V4_BUCKETS + 1)
+        self.v4_starts = view[offset:offset + 4 * v4_count].cast('I')
+        offset += 4 * v4_count
+        self.v4_ends = view[offset:offset + 4 * v4_count].cast('I')
+        offset += 4 * v4_count
+        self.v4_records = view[offset:offset + 4 * v4_count].cast('I')
+        offset = _align(offset + 4 * v4_count)
+
+        self.v6_starts = _V6Keys(view[offset:offset + V6_KEY_SIZE * v6_count], v6_count)
+        offset += V6_KEY_SIZE * v6_count
+        self.v6_ends = _V6Keys(view[offset:offset + V6_KEY_SIZE * v6_count], v6_count)
+        offset += V6_KEY_SIZE * v6_count
+        self.v6_records = view[offset:offset + 4 * v6_count].cast('I')
+        offset = _align(offset + 4 * v6_count)
+
+        raw_records = json.loads(bytes(view[offset:offset + records_length]).decode('utf-8'))
+        self.records = [dict(zip(RECORD_FIELDS, record)) for record in raw_records]
+        self.v4_count = v4_count
+        self.v6_count = v6_count
+
+    def lookup(self, ip_address: str) -> Optional[Dict[str, str]]:
+        """Get country/region/city/isp/asn for an address, or None if it is not covered"""
+        try:
+            if ':' not in ip_address:
+                key = int.from_bytes(socket.inet_pton(socket.AF_INET, ip_address), 'big')
+                bucket = key >> V4_BUCKET_SHIFT
+                # Falls back to the last range of earlier buckets when none starts in this one
+                i = bisect_right(self.v4_starts, key, self.v4_buckets[bucket], self.v4_buckets[bucket + 1]) - 1
+                if i >= 0 and key <= self.v4_ends[i]:
+                    return self.records[self.v4_records[i]]
+                return None
+
+            packed = socket.inet_pton(socket.AF_INET6, ip_address)
+            if packed[:12] == b'\x00' * 10 + b'\xff\xff':
+                # IPv4-mapped IPv6 address
+                return self.lookup(socket.inet_ntop(socket.AF_INET, packed[12:]))
+            i = bisect_right(self.v6_starts, packed) - 1
+            if i >= 0 and packed <= self.v6_ends[i]:
+                return self.records[self.v6_records[i]]
+            return None
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def close(self):
+        """Release the memory map"""
+        self.v4_buckets = self.v4_starts = self.v4_ends = self.v4_records = self.v6_records = None
+        self.v6_starts = self.v6_ends = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Views still referenced elsewhere; the map is freed with them
+            pass
+
+
+def build_index(csv_path: str, output_path: str) -> Dict[str, int]:
+    """Build an index from a CSV of CIDR ranges and atomically swap it into place"""
+    records = []
+    record_ids = {}
+    v4_ranges, v6_ranges = [], []
+    skipped = 0
+
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            try:
+                network = ipaddress.ip_network(row['network'].strip(), strict=False)
+            except (KeyError, ValueError, AttributeError):
+                skipped += 1
+                continue
+
+            record = tuple((row.get(field) or 'Unknown').strip() for field in RECORD_FIELDS)
+            if record not in record_ids:
+                record_ids[record] = len(records)
+                records.append(record)
+
+            entry = (int(network.network_address), int(network.broadcast_address), record_ids[record])
+            (v4_ranges if network.version == 4 else v6_ranges).append(entry)
+
+    v4_ranges = _flatten(v4_ranges)
+    v6_ranges = _flatten(v6_ranges)
+    records_blob = json.dumps(records, separators=(',', ':')).encode('utf-8')
+
+    directory = os.path.dirname(os.path.abspath(output_path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.geoip-', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, len(v4_ranges), len(v6_ranges), len(records_blob)))
+            f.write(b'\0' * (_align(f.tell()) - f.tell()))
+
+            v4_starts = array('I', (r[0] for r in v4_ranges))
+            buckets = array('I', bytes(4 * (V4_BUCKETS + 1)))
+            position = 0
+            for bucket in range(V4_BUCKETS + 1):
+                base = bucket << V4_BUCKET_SHIFT
+                while position < len(v4_starts) and v4_starts[position] < base:
+                    position += 1
+                buckets[bucket] = position
+
+            for values in (buckets, v4_starts,
+                           array('I', (r[1] for r in v4_ranges)),
+                           array('I', (r[2] for r in v4_ranges))):
+                if sys.byteorder != 'little':
+                    values.byteswap()
+                f.write(values.tobytes())
+            f.write(b'\0' * (_align(f.tell()) - f.tell()))
+
+            for column in range(2):
+                f.write(b''.join(r[column].to_bytes(V6_KEY_SIZE, 'big') for r in v6_ranges))
+            values = array('I', (r[2] for r in v6_ranges))
+            if sys.byteorder != 'little':
+                values.byteswap()
+            f.write(values.tobytes())
+            f.write(b'\0' * (_align(f.tell()) - f.tell()))
+
+            f.write(records_blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, output_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    stats = {
+        'v4_ranges': len(v4_ranges),
+        'v6_ranges': len(v6_ranges),
+        'records': len(records),
+        'skipped_rows': skipped
+    }
+    logger.info(f"Built GeoIP index {output_path}: {stats}")
+    return stats
+
+
+_index: Optional[GeoIPIndex] = None
+_index_key = None
+_index_checked_at = 0.0
+_index_lock = threading.Lock()
+
+
+def get_geoip_index(path: str = None, check_interval: float = 1.0) -> Optional[GeoIPIndex]:
+    """Get the shared index, reopening it when the file has been swapped; None if absent"""
+    global _index, _index_key, _index_checked_at
+    path = path or os.getenv('GEOIP_INDEX_PATH', 'geoip.idx')
+
+    now = time.monotonic()
+    if _index is not None and _index.path == path and now - _index_checked_at < check_interval:
+        return _index
+
+    with _index_lock:
+        _index_checked_at = now
+        try:
+            st = os.stat(path)
+        except OSError:
+            _index, _index_key = None, None
+            return None
+
+        key = (path, st.st_ino, st.st_mtime_ns, st.st_size)
+        if key != _index_key:
+            try:
+                _index = GeoIPIndex(path)
+                _index_key = key
+                logger.info(f"Loaded GeoIP index {path} ({_index.v4_count} IPv4 / {_index.v6_count} IPv6 ranges)")
+            except Exception as e:
+                logger.error(f"Error loading GeoIP index {path}: {str(e)}")
+                _index, _index_key = None, None
+        return _index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline IP-range geolocation index")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help="Build (or atomically replace) an index from a CSV")
+    build_parser.add_argument('csv_path', help="CSV with network,country,region,city,isp,asn columns")
+    build_parser.add_argument('output', nargs='?', default=os.getenv('GEOIP_INDEX_PATH', 'geoip.idx'))
+
+    lookup_parser = subparsers.add_parser('lookup', help="Look up addresses in an index")
+    lookup_parser.add_argument('index')
+    lookup_parser.add_argument('ips', nargs='+')
+
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    if args.command == 'build':
+        print(json.dumps(build_index(args.csv_path, args.output)))
+    else:
+        index = GeoIPIndex(args.index)
+        for ip in args.ips:
+            print(ip, json.dumps(index.lookup(ip)))
+
+
+if __name__ == "__main__":
+    main()
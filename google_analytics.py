@@ -1,5 +1,3 @@
-from google.analytics.data_v1beta import BetaAnalyticsDataClient
-from google.analytics.data_v1beta.types import RunReportRequest
 import streamlit as st
 import os
 import logging
@@ -9,10 +7,14 @@ logger = logging.getLogger(__name__)
 class GoogleAnalytics:
     def __init__(self):
         """Initialize Google Analytics client"""
+        self.measurement_id = os.getenv('GA_MEASUREMENT_ID')
+        self.api_secret = os.getenv('GA_API_SECRET')
+        if not self.measurement_id:
+            logger.warning("GA4 measurement ID not found in environment variables")
+
+    def render_tag(self):
+        """Add the GA4 tracking code to the current page"""
         try:
-            self.measurement_id = os.getenv('GA_MEASUREMENT_ID')
-            self.api_secret = os.getenv('GA_API_SECRET')
-            
             if self.measurement_id:
                 # Add GA4 tracking code to Streamlit
                 ga_script = f"""
@@ -26,11 +28,9 @@ class GoogleAnalytics:
                     </script>
                 """
                 st.markdown(ga_script, unsafe_allow_html=True)
-            else:
-                logger.warning("GA4 measurement ID not found in environment variables")
             
         except Exception as e:
-            logger.error(f"Error initializing Google Analytics: {str(e)}")
+            logger.error(f"Error rendering Google Analytics tag: {str(e)}")
             
     def track_event(self, event_category: str, event_action: str, event_label: str = None):
         """Track an event in GA4"""
@@ -0,0 +1,285 @@
+"""
+Pooled, timeout-bounded HTTP client for the IP geolocation providers.
+
+Requests go through one keep-alive requests.Session. If the first provider
+has not answered within the hedge delay, the next provider is queried in
+parallel and the first usable answer wins. Each endpoint has a circuit
+breaker so a failing provider is skipped until its cool-down expires.
+
+Provider URLs are plain templates, so the client can be pointed at a local
+stub server:
+    IPLookupClient([Provider('stub', 'http://127.0.0.1:8000/json/{ip}', kind='ip-api')])
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures and lets one trial request through after a cool-down"""
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        """Initialize thresholds and state"""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Get 'closed', 'open' or 'half-open'"""
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self) -> bool:
+        """Check whether a request may be sent now"""
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        """Close the breaker"""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        """Count a failure, opening (or re-opening) the breaker at the threshold"""
+        with self._lock:
+            self.failures += 1
+            if self.trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+
+@dataclass
+class Provider:
+    """An IP lookup endpoint; url_template contains an {ip} placeholder"""
+    name: str
+    url_template: str
+    kind: str = ''
+    timeout: float = 2.0
+    connect_timeout: float = 1.0
+    breaker: CircuitBreaker = field(default_factory=CircuitBreaker)
+
+    def __post_init__(self):
+        self.kind = self.kind or self.name
+
+    def url(self, ip_address: str) -> str:
+        return self.url_template.format(ip=ip_address)
+
+
+def default_providers() -> List[Provider]:
+    """Get the public providers in preference order"""
+    timeout = float(os.getenv('IP_LOOKUP_TIMEOUT', '2.0'))
+    return [
+        Provider('ip-api', 'http://ip-api.com/json/{ip}', timeout=timeout),  # Free API, no key needed
+        Provider('ipapi.co', 'https://ipapi.co/{ip}/json/', timeout=timeout),
+        Provider('ipinfo', 'https://ipinfo.io/{ip}/json', timeout=timeout)
+    ]
+
+
+def normalize_ip_response(kind: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Map a provider's JSON response onto common fields, or None if it holds no location"""
+    if not isinstance(data, dict):
+        return None
+
+    if kind == 'ip-api':
+        if data.get('status', 'success') != 'success':
+            return None
+        result = {
+            'country': data.get('country'),
+            'region': data.get('regionName') or data.get('region'),
+            'city': data.get('city'),
+            'isp': data.get('isp'),
+            'org': data.get('org'),
+            'latitude': data.get('lat'),
+            'longitude': data.get('lon'),
+            'timezone': data.get('timezone'),
+            'asn': data.get('as')
+        }
+    elif kind == 'ipapi.co':
+        if data.get('error'):
+            return None
+        result = {
+            'country': data.get('country_name') or data.get('country'),
+            'region': data.get('region'),
+            'city': data.get('city'),
+            'isp': data.get('org'),
+            'org': data.get('org'),
+            'latitude': data.get('latitude'),
+            'longitude': data.get('longitude'),
+            'timezone': data.get('timezone'),
+            'asn': data.get('asn')
+        }
+    elif kind == 'ipinfo':
+        if data.get('bogon') or data.get('error'):
+            return None
+        # org looks like "AS55836 Reliance Jio Infocomm Limited"
+        org = data.get('org') or ''
+        asn, _, isp = org.partition(' ') if org.startswith('AS') else ('', '', org)
+        latitude, _, longitude = (data.get('loc') or '').partition(',')
+        result = {
+            'country': data.get('country'),
+            'region': data.get('region'),
+            'city': data.get('city'),
+            'isp': isp or None,
+            'org': org or None,
+            'latitude': float(latitude) if latitude else None,
+            'longitude': float(longitude) if longitude else None,
+            'timezone': data.get('timezone'),
+            'asn': asn or None
+        }
+    else:
+        return None
+
+    if not result['country']:
+        return None
+    for key in ('country', 'region', 'city', 'isp', 'org', 'timezone', 'asn'):
+        result[key] = result[key] or 'Unknown'
+    result['latitude'] = result['latitude'] or 0
+    result['longitude'] = result['longitude'] or 0
+    return result
+
+
+class IPLookupClient:
+    """Hedged IP lookups over a pooled session with per-provider timeouts and circuit breakers"""
+
+    def __init__(self, providers: List[Provider] = None, hedge_delay: float = None,
+                 pool_size: int = 20, max_workers: int = 16):
+        """Initialize the session, providers and request pool"""
+        self.providers = providers if providers is not None else default_providers()
+        self.hedge_delay = hedge_delay if hedge_delay is not None else float(os.getenv('IP_LOOKUP_HEDGE_DELAY', '0.3'))
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(self.providers) or 1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ip-lookup')
+
+        self._stats_lock = threading.Lock()
+        self.lookups = 0
+        self.requests = 0
+        self.hedged = 0
+        self.failures = 0
+        self.short_circuited = 0
+
+    def lookup(self, ip_address: str) -> Optional[Dict[str, Any]]:
+        """Look up an IP, returning the first usable provider answer or None"""
+        with self._stats_lock:
+            self.lookups += 1
+
+        remaining = list(self.providers)
+        first = self._submit_next(remaining, ip_address)
+        if first is None:
+            return None
+
+        pending = {first}
+        while pending:
+            done, pending = wait(pending, timeout=self.hedge_delay if remaining else None,
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                # Slow provider: hedge with the next one
+                hedge = self._submit_next(remaining, ip_address)
+                if hedge is not None:
+                    with self._stats_lock:
+                        self.hedged += 1
+                    pending.add(hedge)
+                continue
+
+            for future in done:
+                result = future.result()
+                if result:
+                    return result
+            # Every finished request failed; move on without waiting for the hedge delay
+            future = self._submit_next(remaining, ip_address)
+            if future is not None:
+                pending.add(future)
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get request counters and breaker states"""
+        return {
+            'lookups': self.lookups,
+            'requests': self.requests,
+            'hedged': self.hedged,
+            'failures': self.failures,
+            'short_circuited': self.short_circuited,
+            'breakers': {p.name: p.breaker.state for p in self.providers}
+        }
+
+    def close(self):
+        """Close pooled connections and the request pool"""
+        self._pool.shutdown(wait=False)
+        self.session.close()
+
+    def _submit_next(self, remaining: List[Provider], ip_address: str):
+        """Start a request to the next provider whose breaker allows it, or return None"""
+        while remaining:
+            provider = remaining.pop(0)
+            if provider.breaker.allow():
+                with self._stats_lock:
+                    self.requests += 1
+                return self._pool.submit(self._fetch, provider, ip_address)
+            with self._stats_lock:
+                self.short_circuited += 1
+        return None
+
+    def _fetch(self, provider: Provider, ip_address: str) -> Optional[Dict[str, Any]]:
+        """Query one provider, updating its circuit breaker"""
+        try:
+            response = self.session.get(provider.url(ip_address),
+                                        timeout=(provider.connect_timeout, provider.timeout))
+            if response.status_code == 200:
+                provider.breaker.record_success()
+                # A healthy provider may still have no location for the IP
+                return normalize_ip_response(provider.kind, response.json())
+            logger.warning(f"IP lookup provider {provider.name} returned {response.status_code}")
+        except Exception as e:
+            logger.error(f"Error with IP lookup provider {provider.name}: {str(e)}")
+
+        provider.breaker.record_failure()
+        with self._stats_lock:
+            self.failures += 1
+        return None
+
+
+_client: Optional[IPLookupClient] = None
+_client_lock = threading.Lock()
+
+
+def get_ip_lookup_client() -> IPLookupClient:
+    """Get the process-wide lookup client"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = IPLookupClient()
+        return _client
+
+
+def set_ip_lookup_client(client: IPLookupClient):
+    """Replace the process-wide lookup client (e.g. with one pointed at stub servers)"""
+    global _client
+    with _client_lock:
+        _client = client
@@ -1,55 +1,88 @@
-import requests
-import json
 from datetime import datetime
 import logging
 from typing import Dict, Optional
 import os
 
+from geoip_index import get_geoip_index
+from ttl_cache import TTLCache
+from click_log import log_event
+from ip_lookup_client import IPLookupClient, get_ip_lookup_client
+
 logger = logging.getLogger(__name__)
 
+# Process-wide cache of IP lookups shared by every session and worker thread
+ip_cache = TTLCache(
+    maxsize=int(os.getenv('IP_CACHE_SIZE', '50000')),
+    ttl=float(os.getenv('IP_CACHE_TTL', '86400')),
+    negative_ttl=float(os.getenv('IP_CACHE_NEGATIVE_TTL', '30'))
+)
+
 class IPTracker:
-    def __init__(self):
-        self.log_file = "click_data.txt"
-        self.api_endpoints = [
-            "http://ip-api.com/json/",  # Free API, no key needed
-            "https://ipapi.co/json/",    # Backup API
-            "https://ipinfo.io/json"     # Another backup
-        ]
+    def __init__(self, client: IPLookupClient = None):
+        # Pooled, hedged client shared by the process unless one is injected
+        self.client = client or get_ip_lookup_client()
 
     def get_ip_details(self, ip_address: str) -> Dict:
         """Get detailed information about an IP address"""
+        ip_data = self.lookup_ip_details(ip_address)
+        # If all APIs fail, return default India-based data
+        return ip_data if ip_data else self._get_default_india_data(ip_address)
+
+    def has_offline_index(self) -> bool:
+        """Check whether lookups are served from the offline GeoIP index"""
+        return get_geoip_index() is not None
+
+    def lookup_ip_details(self, ip_address: str) -> Optional[Dict]:
+        """Look up an IP address, returning None when every API fails"""
+        # The offline index replaces the external APIs whenever it is installed
+        index = get_geoip_index()
+        if index is not None:
+            record = index.lookup(ip_address)
+            return self._from_index_record(ip_address, record) if record else None
+
+        # Concurrent misses for the same IP share one upstream call
         try:
-            # Try multiple APIs in case of failure
-            for endpoint in self.api_endpoints:
-                try:
-                    response = requests.get(f"{endpoint}{ip_address}" if ip_address != "127.0.0.1" else endpoint)
-                    if response.status_code == 200:
-                        data = response.json()
-                        ip_data = {
-                            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                            'ip_address': ip_address,
-                            'country': data.get('country', 'Unknown'),
-                            'region': data.get('region', 'Unknown'),
-                            'city': data.get('city', 'Unknown'),
-                            'isp': data.get('isp', 'Unknown'),
-                            'org': data.get('org', 'Unknown'),
-                            'latitude': data.get('lat', 0),
-                            'longitude': data.get('lon', 0),
-                            'timezone': data.get('timezone', 'Unknown'),
-                            'asn': data.get('as', 'Unknown')
-                        }
-                        self._log_ip_data(ip_data)
-                        return ip_data
-                except Exception as e:
-                    logger.error(f"Error with API endpoint {endpoint}: {str(e)}")
-                    continue
+            ip_data = ip_cache.get_or_load(ip_address, lambda: self._fetch_ip_details(ip_address))
+        except Exception as e:
+            logger.error(f"Error getting IP details: {str(e)}")
+            return None
+        if not ip_data:
+            return None
+        return {**ip_data, 'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
-            # If all APIs fail, return default India-based data
-            return self._get_default_india_data(ip_address)
+    def _fetch_ip_details(self, ip_address: str) -> Optional[Dict]:
+        """Query the lookup providers, returning None when every provider fails"""
+        try:
+            data = self.client.lookup(ip_address)
+            if not data:
+                return None
+            ip_data = {
+                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'ip_address': ip_address,
+                **data
+            }
+            self._log_ip_data(ip_data)
+            return ip_data
 
         except Exception as e:
             logger.error(f"Error getting IP details: {str(e)}")
-            return self._get_default_india_data(ip_address)
+            return None
+
+    def _from_index_record(self, ip_address: str, record: Dict) -> Dict:
+        """Build IP details from an offline index record"""
+        return {
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'ip_address': ip_address,
+            'country': record['country'],
+            'region': record['region'],
+            'city': record['city'],
+            'isp': record['isp'],
+            'org': record['isp'],
+            'latitude': 0,
+            'longitude': 0,
+            'timezone': 'Unknown',
+            'asn': record['asn']
+        }
 
     def _get_default_india_data(self, ip_address: str) -> Dict:
         """Return default India-based data when APIs fail"""
@@ -68,21 +101,8 @@ class IPTracker:
         }
 
     def _log_ip_data(self, data: Dict):
-        """Log IP data to file with formatted output"""
-        try:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write("\n" + "="*50 + "\n")
-                f.write(f"Timestamp: {data['timestamp']}\n")
-                f.write(f"IP Address: {data['ip_address']}\n")
-                f.write(f"Location: {data['city']}, {data['region']}, {data['country']}\n")
-                f.write(f"ISP: {data['isp']}\n")
-                f.write(f"Organization: {data['org']}\n")
-                f.write(f"Coordinates: {data['latitude']}, {data['longitude']}\n")
-                f.write(f"Timezone: {data['timezone']}\n")
-                f.write(f"ASN: {data['asn']}\n")
-                f.write("="*50 + "\n")
-        except Exception as e:
-            logger.error(f"Error logging IP data: {str(e)}")
+        """Append IP lookup data to the click event log"""
+        log_event('ip_lookup', data)
 
     def get_click_data(self, client_info: Dict) -> Dict:
         """Get comprehensive click data including IP details"""
@@ -109,13 +129,5 @@ class IPTracker:
             return client_info
 
     def _log_click_data(self, data: Dict):
-        """Log comprehensive click data"""
-        try:
-            with open("click_data.txt", 'a', encoding='utf-8') as f:
-                f.write("\n" + "*"*50 + "\n")
-                f.write("CLICK EVENT DATA\n")
-                f.write("*"*50 + "\n")
-                f.write(json.dumps(data, indent=2))
-                f.write("\n" + "*"*50 + "\n")
-        except Exception as e:
-            logger.error(f"Error logging click data: {str(e)}") 
\ No newline at end of file
+        """Append comprehensive click data to the click event log"""
+        log_event('click_data', data)
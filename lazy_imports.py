@@ -0,0 +1,45 @@
+"""
+Deferred imports for heavy optional dependencies.
+
+    px = LazyModule('plotly.express')
+
+binds a placeholder that imports the real module on first attribute access,
+so modules that only sometimes draw charts (or build DataFrames) do not pay
+for the import at load time. The redirect path imports app.py but never
+touches these names.
+"""
+import importlib
+import threading
+from types import ModuleType
+from typing import Any, Optional
+
+
+class LazyModule:
+    """Module placeholder that imports the named module on first attribute access"""
+
+    def __init__(self, name: str):
+        """Record the module to import later"""
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+        self.__dict__['_lock'] = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        """Import the module once and cache it"""
+        module: Optional[ModuleType] = self.__dict__['_module']
+        if module is None:
+            with self.__dict__['_lock']:
+                module = self.__dict__['_module']
+                if module is None:
+                    module = importlib.import_module(self.__dict__['_name'])
+                    self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value: Any):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.__dict__['_module'] is not None else 'not loaded'
+        return f"<LazyModule {self.__dict__['_name']!r} ({state})>"
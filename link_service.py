@@ -1,5 +1,3 @@
-import string
-import random
 import validators
 import logging
 from typing import Optional, Dict, Any
@@ -15,13 +13,9 @@ class LinkService:
         """Initialize LinkService with database connection"""
         self.db = database
         
-    def generate_short_code(self, length=6) -> str:
+    def generate_short_code(self) -> str:
         """Generate a unique short code"""
-        characters = string.ascii_letters + string.digits
-        while True:
-            code = ''.join(random.choice(characters) for _ in range(length))
-            if not self.db.get_url_info(code):
-                return code
+        return self.db.generate_short_code()
 
     def create_short_url(self, url: str, campaign_name: str, campaign_type: str = None, utm_params: dict = None) -> str:
         """Create a new short URL"""
@@ -0,0 +1,431 @@
+"""
+Versioned, non-destructive schema migrations.
+
+The schema version is stored in PRAGMA user_version. Each migration runs
+once, in its own BEGIN IMMEDIATE transaction, and bumps the version in the
+same transaction, so concurrent processes starting together apply it only
+once. Migrations only create or extend objects; they never drop data
+(superseded indexes excepted).
+Databases created before versioning start at 0 and every step is written to
+be safe on tables that already exist.
+
+    python migrations.py --db urls.db
+"""
+import argparse
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from typing import Callable, List, Optional, Tuple
+
+from dashboard_cache import DATA_VERSION_SCHEMA
+from db_pool import connect
+from click_time import IST_SQL_MODIFIER
+from referrer import register_functions as register_referrer_functions
+from rollups import create_rollup_tables, populate as populate_rollups
+from short_codes import CODE_SEQUENCE_SCHEMA
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+LINK_VISITORS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS link_visitors (
+        short_code TEXT NOT NULL,
+        visitor_hash TEXT NOT NULL,
+        first_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (short_code, visitor_hash)
+    ) WITHOUT ROWID
+'''
+
+# Columns added to analytics for asynchronous IP enrichment
+ENRICHMENT_COLUMNS = {
+    'city': 'TEXT',
+    'isp': 'TEXT',
+    'enrichment_status': 'TEXT',
+    'enrichment_attempts': 'INTEGER DEFAULT 0',
+    'enrichment_next_at': 'REAL'
+}
+
+ENRICHMENT_PENDING_INDEX = '''
+    CREATE INDEX IF NOT EXISTS idx_analytics_enrichment_pending
+    ON analytics (enrichment_next_at)
+    WHERE enrichment_status = 'pending'
+'''
+
+# Covering indexes for the dashboard query shapes
+ANALYTICS_INDEXES = {
+    # Per-link joins filtered on date/state and counting distinct IPs
+    # (get_analytics_summary, top campaigns, get_recent_activity)
+    'idx_analytics_short_code_clicked':
+        'analytics (short_code, clicked_at, state, ip_address, device_type)',
+    # 30-day device and browser breakdowns in get_dashboard_stats
+    'idx_analytics_clicked_device': 'analytics (clicked_at, device_type)',
+    'idx_analytics_clicked_browser': 'analytics (clicked_at, browser)',
+    # Distinct visitor counts and per-IP lookups
+    'idx_analytics_ip_address': 'analytics (ip_address)',
+    # State breakdowns and state filters
+    'idx_analytics_state': 'analytics (state, clicked_at)'
+}
+
+# Stored click time: integer UTC epoch plus the IST day it falls on
+CLICK_TIME_COLUMNS = {
+    'clicked_at_epoch': 'INTEGER',
+    'click_day': 'TEXT'
+}
+
+# Indexes on the stored click time, replacing the clicked_at ones above
+CLICK_TIME_INDEXES = {
+    # Per-link visitor counts filtered on day/state (get_analytics_summary)
+    'idx_analytics_short_code_day': 'analytics (short_code, click_day, state, ip_address)',
+    # Visitor counts over a day range across all links
+    'idx_analytics_day': 'analytics (click_day, short_code, state, ip_address)',
+    # Latest clicks per link (get_recent_activity, last_activity)
+    'idx_analytics_short_code_epoch': 'analytics (short_code, clicked_at_epoch)',
+    # Latest clicks overall (get_recent_events, get_recent_activities)
+    'idx_analytics_epoch': 'analytics (clicked_at_epoch)'
+}
+
+# Referrer host and traffic source, classified once at ingest
+REFERRER_COLUMNS = {
+    'referrer_domain': 'TEXT',
+    'source_class': 'TEXT'
+}
+
+# Sort orders of the paginated link lists; the rowid (id) breaks ties,
+# and the UNIQUE(campaign_name) index serves the name sort
+URL_SORT_INDEXES = {
+    'idx_urls_created_at': 'urls (created_at)',
+    'idx_urls_total_clicks': 'urls (total_clicks)'
+}
+
+# Trigger name -> urls event that changes a field served from url_cache
+LINKS_VERSION_TRIGGERS = {
+    'trg_urls_links_version_insert': 'INSERT',
+    'trg_urls_links_version_update': 'UPDATE OF short_code, original_url, campaign_name, campaign_type, is_active',
+    'trg_urls_links_version_delete': 'DELETE'
+}
+
+SUPERSEDED_INDEXES = (
+    'idx_analytics_short_code_clicked',
+    'idx_analytics_clicked_device',
+    'idx_analytics_clicked_browser',
+    'idx_analytics_state'
+)
+
+
+def visitor_hash(ip_address: Optional[str]) -> Optional[str]:
+    """Hash a visitor's IP address for per-link unique visitor tracking"""
+    if not ip_address:
+        return None
+    return hashlib.blake2b(ip_address.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _create_base_tables(conn: sqlite3.Connection):
+    """Create the core tables and default accounts"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS organizations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            domain TEXT NOT NULL UNIQUE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL UNIQUE,
+            password TEXT NOT NULL,
+            organization_id INTEGER,
+            role TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (organization_id) REFERENCES organizations(id)
+        )
+    ''')
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS urls (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            short_code TEXT UNIQUE NOT NULL,
+            original_url TEXT NOT NULL,
+            campaign_name TEXT NOT NULL,
+            campaign_type TEXT,
+            utm_source TEXT,
+            utm_medium TEXT,
+            utm_campaign TEXT,
+            utm_content TEXT,
+            utm_term TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            last_clicked DATETIME,
+            total_clicks INTEGER DEFAULT 0,
+            unique_visitors INTEGER DEFAULT 0,
+            is_active BOOLEAN DEFAULT 1,
+            UNIQUE(campaign_name)
+        )
+    ''')
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS analytics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            short_code TEXT NOT NULL,
+            clicked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            ip_address TEXT,
+            user_agent TEXT,
+            referrer TEXT,
+            state TEXT,
+            device_type TEXT,
+            browser TEXT,
+            os TEXT,
+            event_type TEXT,
+            event_data TEXT,
+            session_id TEXT,
+            time_on_page INTEGER DEFAULT 0,
+            is_bounce BOOLEAN DEFAULT 1,
+            is_conversion BOOLEAN DEFAULT 0,
+            engagement_score FLOAT DEFAULT 0,
+            FOREIGN KEY (short_code) REFERENCES urls(short_code)
+        )
+    ''')
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS engagement_metrics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            short_code TEXT NOT NULL,
+            session_id TEXT NOT NULL,
+            page_views INTEGER DEFAULT 1,
+            time_spent INTEGER DEFAULT 0,
+            actions_taken INTEGER DEFAULT 0,
+            last_interaction TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            is_converted BOOLEAN DEFAULT 0,
+            FOREIGN KEY (short_code) REFERENCES urls(short_code)
+        )
+    ''')
+
+    conn.execute('''
+        INSERT OR IGNORE INTO organizations (id, name, domain)
+        VALUES (1, 'VBG Game Studios', 'virtualbattleground.in')
+    ''')
+    conn.execute('''
+        INSERT OR IGNORE INTO users (username, password, organization_id, role)
+        VALUES ('admin', 'admin123', 1, 'admin')
+    ''')
+    conn.execute('''
+        INSERT OR IGNORE INTO users (username, password, organization_id, role)
+        VALUES ('nandan', 'nandan123', 1, 'user')
+    ''')
+
+
+def _add_enrichment_columns(conn: sqlite3.Connection):
+    """Add the asynchronous enrichment columns and their work-queue index"""
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(analytics)")}
+    for column, column_type in ENRICHMENT_COLUMNS.items():
+        if column not in existing:
+            logger.info(f"Adding analytics.{column} column...")
+            conn.execute(f"ALTER TABLE analytics ADD COLUMN {column} {column_type}")
+    conn.execute(ENRICHMENT_PENDING_INDEX)
+
+
+def _create_link_visitors(conn: sqlite3.Connection):
+    """Create link_visitors from existing analytics rows and resync unique_visitors"""
+    conn.create_function('visitor_hash', 1, visitor_hash, deterministic=True)
+    conn.execute(LINK_VISITORS_SCHEMA)
+    inserted = conn.execute('''
+        INSERT OR IGNORE INTO link_visitors (short_code, visitor_hash, first_seen)
+        SELECT short_code, visitor_hash(ip_address), MIN(clicked_at)
+        FROM analytics
+        WHERE ip_address IS NOT NULL
+        AND ip_address != ''
+        GROUP BY short_code, ip_address
+    ''').rowcount
+    conn.execute('''
+        UPDATE urls
+        SET unique_visitors = (
+            SELECT COUNT(*)
+            FROM link_visitors v
+            WHERE v.short_code = urls.short_code
+        )
+    ''')
+    logger.info(f"Backfilled {inserted} link visitors")
+
+
+def _create_code_sequence(conn: sqlite3.Connection):
+    """Create the short-code block sequence table"""
+    conn.execute(CODE_SEQUENCE_SCHEMA)
+
+
+def _create_analytics_indexes(conn: sqlite3.Connection):
+    """Add covering indexes for the dashboard queries"""
+    for name, definition in ANALYTICS_INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+    conn.execute("ANALYZE analytics")
+
+
+def _create_click_rollups(conn: sqlite3.Connection):
+    """Create the hourly/daily click rollups (filled by the referrer migration)"""
+    create_rollup_tables(conn)
+
+
+def _create_data_version(conn: sqlite3.Connection):
+    """Create the counter that write paths bump to invalidate cached dashboards"""
+    conn.execute(DATA_VERSION_SCHEMA)
+    conn.execute("INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)")
+
+
+def _add_click_time_columns(conn: sqlite3.Connection):
+    """Store click time as a UTC epoch and IST day and backfill them"""
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(analytics)")}
+    for column, column_type in CLICK_TIME_COLUMNS.items():
+        if column not in existing:
+            logger.info(f"Adding analytics.{column} column...")
+            conn.execute(f"ALTER TABLE analytics ADD COLUMN {column} {column_type}")
+
+    # clicked_at holds naive server-local time, as 'utc' expects
+    updated = conn.execute(f'''
+        UPDATE analytics
+        SET
+            clicked_at_epoch = CAST(strftime('%s', clicked_at, 'utc') AS INTEGER),
+            click_day = date(strftime('%s', clicked_at, 'utc'), 'unixepoch', '{IST_SQL_MODIFIER}')
+        WHERE clicked_at_epoch IS NULL
+        AND clicked_at IS NOT NULL
+    ''').rowcount
+    logger.info(f"Backfilled click time for {updated} analytics rows")
+
+    for name in SUPERSEDED_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    for name, definition in CLICK_TIME_INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+    conn.execute("ANALYZE analytics")
+
+
+def _add_referrer_columns(conn: sqlite3.Connection):
+    """Store the classified referrer, backfill it and regenerate the rollups"""
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(analytics)")}
+    for column, column_type in REFERRER_COLUMNS.items():
+        if column not in existing:
+            logger.info(f"Adding analytics.{column} column...")
+            conn.execute(f"ALTER TABLE analytics ADD COLUMN {column} {column_type}")
+
+    register_referrer_functions(conn)
+    updated = conn.execute('''
+        UPDATE analytics
+        SET
+            referrer_domain = referrer_domain(referrer),
+            source_class = source_class(referrer)
+        WHERE source_class IS NULL
+    ''').rowcount
+    logger.info(f"Backfilled referrer classes for {updated} analytics rows")
+
+    # Rollups pick up the IST buckets and the stored referrer classes
+    for table, count in populate_rollups(conn).items():
+        logger.info(f"Backfilled {count} {table} rows")
+
+
+
+def _create_url_sort_indexes(conn: sqlite3.Connection):
+    """Add indexes for keyset pagination of the link lists"""
+    for name, definition in URL_SORT_INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+    conn.execute("ANALYZE urls")
+
+
+def _create_links_version(conn: sqlite3.Connection):
+    """Create the counter that link edits bump so every process can drop stale url_cache entries"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS links_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+    ''')
+    conn.execute("INSERT OR IGNORE INTO links_version (id, version) VALUES (1, 0)")
+    # Triggers catch every writer; click counters are not in the column list,
+    # so clicks never bump it
+    for name, event in LINKS_VERSION_TRIGGERS.items():
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON urls
+            BEGIN
+                UPDATE links_version SET version = version + 1 WHERE id = 1;
+            END
+        ''')
+
+
+# Append only: a migration's position is its version number
+MIGRATIONS: List[Tuple[str, Callable[[sqlite3.Connection], None]]] = [
+    ('base tables', _create_base_tables),
+    ('analytics enrichment columns', _add_enrichment_columns),
+    ('link_visitors', _create_link_visitors),
+    ('code_sequence', _create_code_sequence),
+    ('analytics indexes', _create_analytics_indexes),
+    ('click rollups', _create_click_rollups),
+    ('data version', _create_data_version),
+    ('click time columns', _add_click_time_columns),
+    ('referrer columns', _add_referrer_columns),
+    ('url sort indexes', _create_url_sort_indexes),
+    ('links version', _create_links_version),
+]
+
+LATEST_VERSION = len(MIGRATIONS)
+
+_migrated = set()
+_migrated_lock = threading.Lock()
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Read the schema version stored in the database"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(db_path: str) -> int:
+    """Apply pending migrations; returns the number applied"""
+    conn = connect(db_path, timeout=30, isolation_level=None)
+    applied = 0
+    try:
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            # Re-read under the write lock in case another process migrated first
+            version = get_schema_version(conn)
+            if version >= LATEST_VERSION:
+                conn.execute("COMMIT")
+                break
+            name, step = MIGRATIONS[version]
+            try:
+                logger.info(f"Applying migration {version + 1}: {name}")
+                step(conn)
+                conn.execute(f"PRAGMA user_version = {version + 1}")
+                conn.execute("COMMIT")
+                applied += 1
+            except Exception as e:
+                logger.error(f"Migration {version + 1} ({name}) failed: {str(e)}")
+                conn.execute("ROLLBACK")
+                raise
+        return applied
+    finally:
+        conn.close()
+
+
+def ensure_migrated(db_path: str):
+    """Migrate a database once per process"""
+    key = os.path.abspath(db_path)
+    with _migrated_lock:
+        if key in _migrated:
+            return
+        migrate(db_path)
+        _migrated.add(key)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations")
+    parser.add_argument('--db', default=os.getenv('URLS_DB_PATH', 'urls.db'), help="Path to urls.db")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    applied = migrate(args.db)
+    logger.info(f"Applied {applied} migrations; schema is at version {LATEST_VERSION}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A page is ordered by (sort column, id). A cursor records the key of the row a
+page starts after or ends before, so the next query seeks straight to it with
+a row-value comparison that an index on (sort column, id) can serve. Cost
+stays flat however deep the page is, and rows inserted or deleted between
+requests never shift later pages the way OFFSET does.
+"""
+import base64
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+AFTER = 'after'
+BEFORE = 'before'
+
+
+def encode_cursor(direction: str, key: Sequence[Any]) -> str:
+    """Encode a page boundary as an opaque URL-safe string"""
+    payload = json.dumps([direction, list(key)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: Optional[str]) -> Tuple[str, Optional[List[Any]]]:
+    """Decode a cursor into (direction, key); a missing or invalid cursor is the first page"""
+    if not cursor:
+        return AFTER, None
+    try:
+        direction, key = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, TypeError):
+        return AFTER, None
+    if direction not in (AFTER, BEFORE) or not isinstance(key, list):
+        return AFTER, None
+    return direction, key
+
+
+def keyset_query(columns: Sequence[str], descending: bool, direction: str,
+                 key: Optional[Sequence[Any]]) -> Tuple[str, str, List[Any]]:
+    """Build the seek predicate and ORDER BY for one page
+
+    Returns (predicate, order_by, params); the predicate is '' on the first page.
+    BEFORE pages are read in reverse order and must be flipped by the caller.
+    """
+    forward = direction == AFTER
+    # Rows after the cursor in display order sort below it when descending
+    seek_below = descending == forward
+    predicate = ''
+    params: List[Any] = []
+    if key is not None:
+        predicate = f"({', '.join(columns)}) {'<' if seek_below else '>'} ({', '.join('?' for _ in columns)})"
+        params = list(key)
+    read_descending = descending == forward
+    order_by = ', '.join(f"{column} {'DESC' if read_descending else 'ASC'}" for column in columns)
+    return predicate, order_by, params
+
+
+def build_page(rows: List[Dict[str, Any]], limit: int, direction: str, has_cursor: bool,
+               key_fields: Sequence[str]) -> Dict[str, Any]:
+    """Trim a limit + 1 fetch to a page and attach next/prev cursors"""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if direction == BEFORE:
+        rows.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, has_cursor
+
+    def key(row):
+        return [row[field] for field in key_fields]
+
+    return {
+        'items': rows,
+        'next_cursor': encode_cursor(AFTER, key(rows[-1])) if rows and has_next else None,
+        'prev_cursor': encode_cursor(BEFORE, key(rows[0])) if rows and has_prev else None
+    }
@@ -0,0 +1,111 @@
+"""
+Per-script-run memo in front of Database read methods.
+
+A Streamlit page often asks for the same data from several widgets in one
+rerun. QueryMemo wraps a Database and answers repeated identical read calls
+from a memo that the app clears at the start of every run (begin_run). Any
+other method call may write, so it clears the memo after it returns.
+Everything else is forwarded to the wrapped Database unchanged.
+
+The memo is kept per thread. Streamlit runs each session's script on its
+own thread, so one QueryMemo can be shared by every session without their
+memos mixing.
+"""
+import copy
+import logging
+import threading
+from typing import Any, Dict, Hashable
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Database methods that only read and can be answered from the memo
+MEMOIZED_METHODS = frozenset({
+    'get_all_urls',
+    'get_analytics_summary',
+    'get_browser_stats',
+    'get_campaign_names',
+    'get_campaign_performance',
+    'get_campaign_type_stats',
+    'get_dashboard_stats',
+    'get_device_stats',
+    'get_events_page',
+    'get_geo_stats',
+    'get_last_click_dates',
+    'get_link_totals',
+    'get_os_stats',
+    'get_recent_activities',
+    'get_recent_activity',
+    'get_recent_events',
+    'get_recent_links',
+    'get_traffic_sources',
+    'get_unique_visitors',
+    'get_url_info',
+    'get_urls_page'
+})
+
+
+def _freeze(value: Any) -> Hashable:
+    """Turn call arguments into a hashable memo key"""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(_freeze(item) for item in value))
+    return value
+
+
+class QueryMemo:
+    """Database proxy that dedupes identical read calls within one script run"""
+
+    def __init__(self, db):
+        """Wrap a Database"""
+        self._db = db
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def _memo(self) -> Dict[Hashable, Any]:
+        """The calling thread's memo"""
+        memo = getattr(self._local, 'memo', None)
+        if memo is None:
+            memo = self._local.memo = {}
+        return memo
+
+    def begin_run(self):
+        """Forget results from the previous script run"""
+        self._memo.clear()
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._db, name)
+        if not callable(attr):
+            return attr
+        if name in MEMOIZED_METHODS:
+            return lambda *args, **kwargs: self._call_memoized(name, attr, args, kwargs)
+        if name.startswith('_'):
+            return attr
+
+        def call_and_invalidate(*args, **kwargs):
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                self._memo.clear()
+        return call_and_invalidate
+
+    def _call_memoized(self, name: str, method, args: tuple, kwargs: Dict[str, Any]) -> Any:
+        """Return a copy of the memoized result, calling through on the first use"""
+        try:
+            key = (name, _freeze(args), _freeze(kwargs))
+            hash(key)
+        except TypeError:
+            return method(*args, **kwargs)
+
+        if key in self._memo:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self._memo[key] = method(*args, **kwargs)
+        # Callers may mutate what they get back
+        return copy.deepcopy(self._memo[key])
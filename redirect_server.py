@@ -0,0 +1,171 @@
+"""
+Standalone ASGI redirect server for short links.
+
+Resolves `/<short_code>` (and the legacy `/?r=<short_code>` form) straight
+from urls.db and answers with a real HTTP redirect, so link hits never go
+through the Streamlit script. The dashboard keeps running on Streamlit.
+
+Run with:
+    uvicorn redirect_server:app --host 0.0.0.0 --port 8080 --workers 4
+"""
+import asyncio
+import logging
+import os
+from typing import Dict, Any, Optional
+from urllib.parse import parse_qs, quote, urlsplit, urlunsplit
+
+from database import Database
+from click_writer import stop_click_writers
+from lazy_imports import LazyModule
+
+# Loaded on the first request that carries a User-Agent
+user_agents = LazyModule('user_agents')
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+REDIRECT_STATUS = int(os.getenv('REDIRECT_STATUS', '302'))
+REDIRECT_CACHE_CONTROL = os.getenv('REDIRECT_CACHE_CONTROL', 'private, max-age=0')
+
+# Reserved and already-escaped characters stay as they are in Location headers
+LOCATION_SAFE_CHARS = ":/?#[]@!$&'()*+,;=%~"
+
+_db: Optional[Database] = None
+
+
+def get_database() -> Database:
+    """Get the per-process database handle"""
+    global _db
+    if _db is None:
+        _db = Database()
+        logger.info(f"Redirect server using database: {_db.db_path}")
+    return _db
+
+
+def get_short_code(scope: Dict[str, Any]) -> Optional[str]:
+    """Extract the short code from the request path or the legacy ?r= parameter"""
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    if query.get('r'):
+        return query['r'][0].strip() or None
+
+    path = scope.get('path', '/').strip('/')
+    if path and '/' not in path:
+        return path
+    return None
+
+
+def get_client_info(scope: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
+    """Build click client info from the request headers"""
+    forwarded_for = headers.get('x-forwarded-for', '')
+    client = scope.get('client') or ('', 0)
+    user_agent = headers.get('user-agent', '')
+    ua_parser = user_agents.parse(user_agent) if user_agent else None
+
+    if ua_parser and ua_parser.is_mobile:
+        device_type = 'Mobile'
+    elif ua_parser and ua_parser.is_tablet:
+        device_type = 'Tablet'
+    else:
+        device_type = 'Desktop'
+
+    return {
+        'ip_address': forwarded_for.split(',')[0].strip() or client[0],
+        'user_agent': user_agent,
+        'referrer': headers.get('referer', ''),
+        'device_type': device_type,
+        'browser': ua_parser.browser.family if ua_parser else 'Unknown',
+        'os': ua_parser.os.family if ua_parser else 'Unknown'
+    }
+
+
+def location_header(url: str) -> str:
+    """Make a target URL safe for a latin-1 Location header (IDNA host, percent-encoded rest)"""
+    if url.isascii():
+        return url
+    try:
+        parts = urlsplit(url)
+        netloc = parts.netloc
+        if parts.hostname and not parts.hostname.isascii():
+            host = parts.hostname.encode('idna').decode('ascii')
+            userinfo = netloc.rpartition('@')[0]
+            port = f":{parts.port}" if parts.port else ''
+            netloc = f"{userinfo}@{host}{port}" if userinfo else f"{host}{port}"
+        url = urlunsplit(parts._replace(netloc=netloc))
+    except (ValueError, UnicodeError):
+        pass
+    return quote(url, safe=LOCATION_SAFE_CHARS)
+
+
+async def send_response(send, status: int, headers: Dict[str, str], body: bytes = b''):
+    """Send a complete HTTP response"""
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(k.encode('latin-1'), v.encode('latin-1')) for k, v in headers.items()]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def lifespan(receive, send):
+    """Handle ASGI lifespan events"""
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            try:
+                get_database()
+                await send({'type': 'lifespan.startup.complete'})
+            except Exception as e:
+                logger.error(f"Redirect server startup failed: {str(e)}")
+                await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                return
+        elif message['type'] == 'lifespan.shutdown':
+            # Flush queued clicks before the worker exits
+            stop_click_writers()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI entry point"""
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    if scope['method'] not in ('GET', 'HEAD'):
+        await send_response(send, 405, {'allow': 'GET, HEAD', 'content-type': 'text/plain'}, b'Method not allowed')
+        return
+
+    short_code = get_short_code(scope)
+    db = get_database()
+    url_info = None
+    if short_code:
+        cached, url_info = db.get_cached_url_info(short_code)
+        if not cached:
+            # Cache misses hit SQLite; keep that off the event loop
+            loop = asyncio.get_running_loop()
+            url_info = await loop.run_in_executor(None, db.get_url_info, short_code)
+
+    if not url_info or not url_info.get('is_active', False):
+        await send_response(send, 404, {
+            'content-type': 'text/plain; charset=utf-8',
+            'cache-control': 'no-store'
+        }, b'Invalid short URL')
+        return
+
+    target_url = url_info['original_url']
+    await send_response(send, REDIRECT_STATUS, {
+        'location': location_header(target_url),
+        'cache-control': REDIRECT_CACHE_CONTROL,
+        'content-length': '0'
+    })
+
+    # Record the click after the redirect has been sent
+    headers = {k.decode('latin-1').lower(): v.decode('latin-1') for k, v in scope.get('headers', [])}
+    client_info = get_client_info(scope, headers)
+    try:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, db.record_click, short_code, client_info)
+    except Exception as e:
+        logger.error(f"Error recording click for {short_code}: {str(e)}")
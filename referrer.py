@@ -0,0 +1,113 @@
+"""
+Referrer classification shared by ingest, rollups and GeoService.
+
+A referrer is reduced to its host (referrer_domain). The host's suffixes are
+then looked up from longest to shortest in SOURCE_DOMAINS, so
+'mail.google.com' is Email while 'www.google.com' is Google. Hosts that match
+no suffix fall back to a brand label anywhere in the host, e.g. google.de.
+Clicks store both values at ingest, so dashboards never pattern-match
+referrer strings.
+"""
+import sqlite3
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+from urllib.parse import urlsplit
+
+DIRECT = 'Direct'
+OTHER = 'Other'
+
+# Domain suffix -> traffic source
+SOURCE_DOMAINS = {
+    'google.com': 'Google',
+    'google.co.in': 'Google',
+    'facebook.com': 'Facebook',
+    'fb.com': 'Facebook',
+    'fb.me': 'Facebook',
+    'twitter.com': 'Twitter',
+    'x.com': 'Twitter',
+    't.co': 'Twitter',
+    'linkedin.com': 'LinkedIn',
+    'lnkd.in': 'LinkedIn',
+    'instagram.com': 'Instagram',
+    'mail.google.com': 'Email',
+    'mail.yahoo.com': 'Email',
+    'outlook.live.com': 'Email',
+    'outlook.office.com': 'Email',
+    'mail.zoho.com': 'Email',
+    'mail.zoho.in': 'Email'
+}
+
+# Host label -> traffic source, for hosts under other country domains
+SOURCE_LABELS = {
+    'google': 'Google',
+    'facebook': 'Facebook',
+    'twitter': 'Twitter',
+    'linkedin': 'LinkedIn',
+    'instagram': 'Instagram'
+}
+
+# Traffic source -> channel reported by GeoService
+SOURCE_CHANNELS = {
+    DIRECT: 'Direct',
+    'Google': 'Search',
+    'Facebook': 'Social',
+    'Twitter': 'Social',
+    'LinkedIn': 'Social',
+    'Instagram': 'Social',
+    'Email': 'Email'
+}
+
+
+def referrer_domain(referrer: str) -> str:
+    """Get the lowercased host of a referrer, without a leading 'www.'"""
+    referrer = (referrer or '').strip()
+    if not referrer:
+        return ''
+    if '//' not in referrer:
+        referrer = '//' + referrer
+    try:
+        host = urlsplit(referrer).hostname or ''
+    except ValueError:
+        return ''
+    return host[4:] if host.startswith('www.') else host
+
+
+@lru_cache(maxsize=4096)
+def classify_referrer(referrer: str) -> Tuple[str, str]:
+    """Get (referrer_domain, source_class) for a referrer"""
+    domain = referrer_domain(referrer)
+    if not domain:
+        return '', DIRECT if not (referrer or '').strip() else OTHER
+    labels = domain.split('.')
+    for i in range(len(labels)):
+        source = SOURCE_DOMAINS.get('.'.join(labels[i:]))
+        if source:
+            return domain, source
+    for label in labels:
+        source = SOURCE_LABELS.get(label)
+        if source:
+            return domain, source
+    return domain, OTHER
+
+
+def source_class(referrer: str) -> str:
+    """Classify a referrer into the traffic sources shown on the dashboard"""
+    return classify_referrer(referrer or '')[1]
+
+
+def referrer_channel(referrer: str) -> str:
+    """Classify a referrer into Direct/Search/Social/Email/Other"""
+    return SOURCE_CHANNELS.get(source_class(referrer), OTHER)
+
+
+def stamp_referrer(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill referrer_domain and source_class on an event that lacks them"""
+    if not event.get('source_class'):
+        event['referrer_domain'], event['source_class'] = classify_referrer(event.get('referrer') or '')
+    return event
+
+
+def register_functions(conn: sqlite3.Connection):
+    """Expose the classifier to SQL as referrer_domain() and source_class()"""
+    conn.create_function('referrer_domain', 1, lambda r: classify_referrer(r or '')[0], deterministic=True)
+    conn.create_function('source_class', 1, source_class, deterministic=True)
@@ -0,0 +1,243 @@
+"""
+Hourly and daily click rollups.
+
+Each rollup row counts analytics rows for one combination of
+(short_code, bucket, state, device_type, browser, os, referrer_class), where
+referrer_class is the click's stored source_class (see referrer.py).
+The click writer upserts rollup deltas in the same transaction that inserts
+the raw rows. The enrichment worker moves counts from the pending (empty)
+state to the resolved state when it fills analytics.state. Dashboard queries
+read the daily table, so their cost grows with links x days rather than with
+clicks.
+
+NULL dimensions are stored as '' so they take part in the primary key.
+Distinct-visitor counts are not additive and still come from analytics or
+link_visitors.
+
+    python rollups.py rebuild --db urls.db
+"""
+import argparse
+import logging
+import os
+import sqlite3
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+from dashboard_cache import bump_data_version
+from click_time import IST, IST_SQL_MODIFIER, epoch_from_local
+from db_pool import connect
+from referrer import register_functions as register_referrer_functions, source_class
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Rollup table -> strftime format of its IST bucket
+ROLLUP_TABLES = {
+    'click_rollup_hourly': '%Y-%m-%d %H',
+    'click_rollup_daily': '%Y-%m-%d'
+}
+
+DIMENSIONS = ('short_code', 'bucket', 'state', 'device_type', 'browser', 'os', 'referrer_class')
+MEASURES = ('clicks', 'conversions', 'bounces', 'time_on_page', 'timed_clicks')
+
+ROLLUP_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        short_code TEXT NOT NULL,
+        bucket TEXT NOT NULL,
+        state TEXT NOT NULL DEFAULT '',
+        device_type TEXT NOT NULL DEFAULT '',
+        browser TEXT NOT NULL DEFAULT '',
+        os TEXT NOT NULL DEFAULT '',
+        referrer_class TEXT NOT NULL DEFAULT '',
+        clicks INTEGER NOT NULL DEFAULT 0,
+        conversions INTEGER NOT NULL DEFAULT 0,
+        bounces INTEGER NOT NULL DEFAULT 0,
+        time_on_page INTEGER NOT NULL DEFAULT 0,
+        timed_clicks INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (short_code, bucket, state, device_type, browser, os, referrer_class)
+    ) WITHOUT ROWID
+'''
+
+# Bucket-first index for date-range scans across all links
+ROLLUP_BUCKET_INDEX = '''
+    CREATE INDEX IF NOT EXISTS idx_{table}_bucket ON {table} (bucket)
+'''
+
+# Analytics columns needed to place a row in its rollup
+CLICK_DIMENSION_COLUMNS = (
+    'short_code', 'clicked_at', 'clicked_at_epoch', 'state', 'device_type', 'browser', 'os',
+    'referrer', 'source_class', 'is_conversion', 'is_bounce', 'time_on_page'
+)
+
+
+def create_rollup_tables(conn: sqlite3.Connection):
+    """Create the rollup tables if they do not exist"""
+    for table in ROLLUP_TABLES:
+        conn.execute(ROLLUP_SCHEMA.format(table=table))
+        conn.execute(ROLLUP_BUCKET_INDEX.format(table=table))
+
+
+def rollup_deltas(events: Iterable[Dict[str, Any]], sign: int = 1) -> Dict[str, Dict[tuple, List[int]]]:
+    """Aggregate analytics rows into per-table rollup deltas"""
+    deltas = {table: defaultdict(lambda: [0] * len(MEASURES)) for table in ROLLUP_TABLES}
+    for event in events:
+        epoch = event.get('clicked_at_epoch')
+        if epoch is None and event.get('clicked_at'):
+            epoch = epoch_from_local(event['clicked_at'])
+        if epoch is None:
+            continue
+        clicked_at = datetime.fromtimestamp(epoch, IST)
+        time_on_page = event.get('time_on_page') or 0
+        measures = (
+            1,
+            1 if event.get('is_conversion') == 1 else 0,
+            1 if event.get('is_bounce') == 1 else 0,
+            time_on_page if time_on_page > 0 else 0,
+            1 if time_on_page > 0 else 0
+        )
+        dimensions = (
+            event.get('state') or '',
+            event.get('device_type') or '',
+            event.get('browser') or '',
+            event.get('os') or '',
+            event.get('source_class') or source_class(event.get('referrer'))
+        )
+        for table, bucket_format in ROLLUP_TABLES.items():
+            key = (event.get('short_code') or '', clicked_at.strftime(bucket_format)) + dimensions
+            totals = deltas[table][key]
+            for i, value in enumerate(measures):
+                totals[i] += sign * value
+    return deltas
+
+
+def apply_deltas(conn: sqlite3.Connection, deltas: Dict[str, Dict[tuple, List[int]]]):
+    """Upsert rollup deltas inside the caller's transaction"""
+    for table, rows in deltas.items():
+        if not rows:
+            continue
+        conn.executemany(f"""
+            INSERT INTO {table} ({', '.join(DIMENSIONS + MEASURES)})
+            VALUES ({', '.join('?' for _ in DIMENSIONS + MEASURES)})
+            ON CONFLICT ({', '.join(DIMENSIONS)}) DO UPDATE SET
+                {', '.join(f'{m} = {m} + excluded.{m}' for m in MEASURES)}
+        """, [key + tuple(totals) for key, totals in rows.items()])
+
+        # Rows whose counts were moved elsewhere are dropped
+        emptied = [key for key, totals in rows.items() if totals[0] < 0]
+        if emptied:
+            conn.executemany(f"""
+                DELETE FROM {table}
+                WHERE {' AND '.join(f'{d} = ?' for d in DIMENSIONS)}
+                AND clicks <= 0
+            """, emptied)
+
+
+def record_events(conn: sqlite3.Connection, events: Iterable[Dict[str, Any]]):
+    """Count newly inserted analytics rows in the rollups"""
+    apply_deltas(conn, rollup_deltas(events))
+
+
+def reassign_states(conn: sqlite3.Connection, new_states: Dict[int, str]):
+    """Move rollup counts for analytics rows whose state is about to change
+
+    Call inside the write transaction, before analytics.state is updated.
+    """
+    removed, added = [], []
+    ids = list(new_states)
+    for i in range(0, len(ids), 500):
+        chunk = ids[i:i + 500]
+        rows = conn.execute(f"""
+            SELECT id, {', '.join(CLICK_DIMENSION_COLUMNS)}
+            FROM analytics
+            WHERE id IN ({','.join('?' * len(chunk))})
+        """, chunk).fetchall()
+        for row in rows:
+            event = dict(zip(CLICK_DIMENSION_COLUMNS, row[1:]))
+            new_state = new_states[row[0]] or ''
+            if (event['state'] or '') == new_state:
+                continue
+            removed.append(event)
+            added.append(dict(event, state=new_state))
+
+    if not removed:
+        return
+    deltas = rollup_deltas(removed, sign=-1)
+    for table, rows in rollup_deltas(added).items():
+        for key, totals in rows.items():
+            merged = deltas[table][key]
+            for j, value in enumerate(totals):
+                merged[j] += value
+    apply_deltas(conn, deltas)
+
+
+def remove_link(conn: sqlite3.Connection, short_code: str):
+    """Drop every rollup row for a link"""
+    for table in ROLLUP_TABLES:
+        conn.execute(f"DELETE FROM {table} WHERE short_code = ?", (short_code,))
+
+
+def populate(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Regenerate the rollups from raw analytics inside the caller's transaction"""
+    register_referrer_functions(conn)
+    create_rollup_tables(conn)
+    counts = {}
+    for table, bucket_format in ROLLUP_TABLES.items():
+        conn.execute(f"DELETE FROM {table}")
+        counts[table] = conn.execute(f"""
+            INSERT INTO {table} ({', '.join(DIMENSIONS + MEASURES)})
+            SELECT
+                COALESCE(short_code, ''),
+                strftime('{bucket_format}', clicked_at_epoch, 'unixepoch', '{IST_SQL_MODIFIER}'),
+                COALESCE(state, ''),
+                COALESCE(device_type, ''),
+                COALESCE(browser, ''),
+                COALESCE(os, ''),
+                COALESCE(source_class, source_class(referrer)),
+                COUNT(*),
+                SUM(CASE WHEN is_conversion = 1 THEN 1 ELSE 0 END),
+                SUM(CASE WHEN is_bounce = 1 THEN 1 ELSE 0 END),
+                SUM(CASE WHEN time_on_page > 0 THEN time_on_page ELSE 0 END),
+                SUM(CASE WHEN time_on_page > 0 THEN 1 ELSE 0 END)
+            FROM analytics
+            WHERE clicked_at_epoch IS NOT NULL
+            GROUP BY 1, 2, 3, 4, 5, 6, 7
+        """).rowcount
+    return counts
+
+
+def rebuild(db_path: str) -> Dict[str, int]:
+    """Regenerate the rollups from raw analytics in one transaction"""
+    conn = connect(db_path, timeout=30, isolation_level=None)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        counts = populate(conn)
+        bump_data_version(conn)
+        conn.execute("COMMIT")
+        return counts
+    except Exception as e:
+        logger.error(f"Error rebuilding rollups: {str(e)}")
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain click rollup tables")
+    parser.add_argument('command', choices=['rebuild'], help="Regenerate rollups from raw analytics")
+    parser.add_argument('--db', default=os.getenv('URLS_DB_PATH', 'urls.db'), help="Path to urls.db")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    for table, count in rebuild(args.db).items():
+        logger.info(f"Rebuilt {table}: {count} rows")
+
+
+if __name__ == "__main__":
+    main()
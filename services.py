@@ -0,0 +1,71 @@
+"""
+Process-wide services shared by every dashboard session.
+
+Each getter builds its service once per process with st.cache_resource and
+hands the same instance to every session. None of these keep per-user
+state: Database goes through thread-safe connection pools, QueryMemo keeps
+its memo per script-run thread, and Auth reads the logged-in user from
+st.session_state, which is the only thing a session stores besides the
+journey session ID that journey events are recorded under.
+"""
+import streamlit as st
+import logging
+from typing import Optional
+from database import Database
+from query_memo import QueryMemo
+from auth import Auth
+from google_analytics import GoogleAnalytics
+from shortener import URLShortener
+from user_journey_tracker import UserJourneyTracker
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+
+@st.cache_resource
+def get_database() -> QueryMemo:
+    """Shared database, behind a per-run read memo"""
+    db = QueryMemo(Database())
+    logger.info("Database initialized")
+    return db
+
+
+@st.cache_resource
+def get_auth() -> Auth:
+    """Shared authentication service"""
+    auth = Auth(get_database())
+    logger.info("Auth initialized")
+    return auth
+
+
+@st.cache_resource
+def get_google_analytics() -> Optional[GoogleAnalytics]:
+    """Shared Google Analytics client, or None if it cannot be set up"""
+    try:
+        ga = GoogleAnalytics()
+        logger.info("Google Analytics initialized successfully")
+        return ga
+    except Exception as e:
+        logger.warning(f"Google Analytics initialization failed: {str(e)}")
+        return None
+
+
+@st.cache_resource
+def get_shortener() -> URLShortener:
+    """Shared URL shortener"""
+    return URLShortener(get_database())
+
+
+@st.cache_resource
+def get_journey_tracker() -> Optional[UserJourneyTracker]:
+    """Shared user journey tracker, or None if GA or journey storage is not available"""
+    if get_google_analytics() is None:
+        logger.warning("Journey Tracker not initialized - GA not available")
+        return None
+    db = get_database()
+    if not hasattr(db, 'record_journey_event'):
+        logger.warning("Journey Tracker not initialized - database has no journey event storage")
+        return None
+    tracker = UserJourneyTracker(db)
+    logger.info("User Journey Tracker initialized successfully")
+    return tracker
@@ -0,0 +1,182 @@
+"""
+Collision-free short-code allocation.
+
+Each process reserves a block of sequence numbers from the code_sequence
+table in one BEGIN IMMEDIATE transaction, so processes never hand out the
+same number. Numbers are permuted over 62^6 by a keyed Feistel network and
+encoded as 6 base62 characters, so codes are unique without a per-code
+lookup. One IN query per block drops numbers that collide with older
+randomly generated or custom codes.
+
+The key is SHORT_CODE_SECRET, or else a random secret stored in the
+database on first use. Without it, known codes reveal neither the sequence
+numbers nor any other link's code, so links (including per-recipient ones)
+cannot be enumerated from a few samples.
+"""
+import hashlib
+import logging
+import os
+import secrets
+import sqlite3
+import string
+import threading
+import time
+from collections import deque
+from typing import Dict, List
+
+from db_pool import connect
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+ALPHABET = string.ascii_letters + string.digits
+CODE_LENGTH = 6
+CODE_SPACE = len(ALPHABET) ** CODE_LENGTH
+# The Feistel network works on the two halves of a code: 3 base62 digits each
+HALF_SPACE = len(ALPHABET) ** (CODE_LENGTH // 2)
+FEISTEL_ROUNDS = 4
+
+CODE_SEQUENCE_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS code_sequence (
+        name TEXT PRIMARY KEY,
+        next_value INTEGER NOT NULL
+    )
+'''
+
+CODE_SECRET_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS code_secret (
+        name TEXT PRIMARY KEY,
+        secret TEXT NOT NULL
+    )
+'''
+
+
+def derive_key(secret: str) -> bytes:
+    """Turn a configured or stored secret into a Feistel round key"""
+    return hashlib.sha256(secret.encode('utf-8')).digest()
+
+
+def permute(n: int, key: bytes) -> int:
+    """Keyed bijection over [0, CODE_SPACE): a balanced Feistel network with modular addition"""
+    left, right = divmod(n, HALF_SPACE)
+    for round_number in range(FEISTEL_ROUNDS):
+        digest = hashlib.blake2b(
+            round_number.to_bytes(1, 'big') + right.to_bytes(4, 'big'), key=key, digest_size=8
+        ).digest()
+        left, right = right, (left + int.from_bytes(digest, 'big')) % HALF_SPACE
+    return left * HALF_SPACE + right
+
+
+def encode_code(n: int, key: bytes) -> str:
+    """Map a sequence number to its fixed-width base62 short code"""
+    n = permute(n, key)
+    chars = []
+    for _ in range(CODE_LENGTH):
+        n, remainder = divmod(n, len(ALPHABET))
+        chars.append(ALPHABET[remainder])
+    return ''.join(reversed(chars))
+
+
+class ShortCodeAllocator:
+    """Hands out unique short codes from blocks reserved in the database"""
+
+    def __init__(self, db_path: str, block_size: int = 100, sequence: str = 'urls'):
+        """Initialize the block size and local block"""
+        self.db_path = db_path
+        self.block_size = block_size
+        self.sequence = sequence
+        self._block = deque()
+        self._lock = threading.Lock()
+        self.reserved = 0
+        self.skipped = 0
+
+    def allocate(self) -> str:
+        """Get the next unused short code"""
+        return self.allocate_many(1)[0]
+
+    def allocate_many(self, count: int) -> List[str]:
+        """Get count unused short codes, reserving more blocks as needed"""
+        with self._lock:
+            while len(self._block) < count:
+                self._reserve_block(max(self.block_size, count - len(self._block)))
+            return [self._block.popleft() for _ in range(count)]
+
+    def stats(self) -> Dict[str, int]:
+        """Get allocation counters"""
+        return {
+            'available': len(self._block),
+            'reserved': self.reserved,
+            'skipped_collisions': self.skipped
+        }
+
+    def _key(self, conn: sqlite3.Connection) -> bytes:
+        """Get the Feistel key from SHORT_CODE_SECRET, or the secret stored for this sequence (created on first use)"""
+        secret = os.getenv('SHORT_CODE_SECRET')
+        if not secret:
+            conn.execute(
+                "INSERT OR IGNORE INTO code_secret (name, secret) VALUES (?, ?)",
+                (self.sequence, secrets.token_hex(32))
+            )
+            secret = conn.execute(
+                "SELECT secret FROM code_secret WHERE name = ?", (self.sequence,)
+            ).fetchone()[0]
+        return derive_key(secret)
+
+    def _reserve_block(self, size: int, attempts: int = 3):
+        """Claim the next range of sequence numbers and queue their codes"""
+        for attempt in range(1, attempts + 1):
+            conn = connect(self.db_path, timeout=30, isolation_level=None)
+            try:
+                conn.execute(CODE_SEQUENCE_SCHEMA)
+                conn.execute(CODE_SECRET_SCHEMA)
+                conn.execute("BEGIN IMMEDIATE")
+                key = self._key(conn)
+                row = conn.execute(
+                    "SELECT next_value FROM code_sequence WHERE name = ?", (self.sequence,)
+                ).fetchone()
+                start = row[0] if row else 0
+                if start + size > CODE_SPACE:
+                    raise RuntimeError("Short code space exhausted")
+                conn.execute(
+                    "INSERT OR REPLACE INTO code_sequence (name, next_value) VALUES (?, ?)",
+                    (self.sequence, start + size)
+                )
+                conn.execute("COMMIT")
+
+                codes = [encode_code(n, key) for n in range(start, start + size)]
+                # Older random and custom codes can land on a scrambled number
+                existing = set()
+                for i in range(0, len(codes), 500):
+                    chunk = codes[i:i + 500]
+                    rows = conn.execute(
+                        f"SELECT short_code FROM urls WHERE short_code IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    ).fetchall()
+                    existing.update(r[0] for r in rows)
+
+                self._block.extend(code for code in codes if code not in existing)
+                self.reserved += size
+                self.skipped += len(existing)
+                return
+            except sqlite3.OperationalError as e:
+                logger.error(f"Error reserving short codes (attempt {attempt}/{attempts}): {str(e)}")
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                if attempt == attempts:
+                    raise
+                time.sleep(0.1 * attempt)
+            finally:
+                conn.close()
+
+
+_allocators: Dict[str, ShortCodeAllocator] = {}
+_allocators_lock = threading.Lock()
+
+
+def get_code_allocator(db_path: str) -> ShortCodeAllocator:
+    """Get the process-wide allocator for a database"""
+    with _allocators_lock:
+        allocator = _allocators.get(db_path)
+        if allocator is None:
+            allocator = _allocators[db_path] = ShortCodeAllocator(db_path)
+        return allocator
@@ -0,0 +1,674 @@
+import streamlit as st
+import validators
+from urllib.parse import urlparse, parse_qs, urlencode
+import logging
+import time
+from typing import Optional, Dict, Any
+from datetime import datetime
+from io import BytesIO
+from organization import Organization
+from ui import UI
+from lazy_imports import LazyModule
+from constants import BASE_URL, CAMPAIGN_PAGE_SIZE, CAMPAIGN_TYPES
+from views.common import page_cursor, render_page_controls
+
+pd = LazyModule('pandas')
+px = LazyModule('plotly.express')
+go = LazyModule('plotly.graph_objects')
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+class URLShortener:
+    def __init__(self, db):
+        """Initialize URL shortener with database connection"""
+        try:
+            # Use the process-wide database instead of creating a new one
+            self.db = db
+            self.organization = Organization(self.db)
+            logger.info("URLShortener initialized successfully")
+        except Exception as e:
+            logger.error(f"Error initializing URLShortener: {str(e)}", exc_info=True)
+            raise
+        self.ui = UI(self)
+
+    def generate_short_code(self):
+        """Generate a unique short code"""
+        return self.db.generate_short_code()
+
+    def create_short_url(self, url: str, campaign_name: str, campaign_type: str = None, utm_params: dict = None) -> str:
+        """Create a new short URL"""
+        try:
+            # Validate URL
+            if not validators.url(url):
+                raise ValueError("Invalid URL format")
+
+            # Create short URL using database method
+            short_code = self.db.create_short_url(
+                url=url,
+                campaign_name=campaign_name,
+                campaign_type=campaign_type,
+                utm_params=utm_params
+            )
+            
+            logger.info(f"Created short URL for {url}: {short_code}")
+            return short_code
+
+        except Exception as e:
+            logger.error(f"Error creating short URL: {str(e)}")
+            raise
+
+    def handle_redirect(self, short_code: str):
+        """Handle URL redirection"""
+        logger.info(f"Attempting to redirect short_code: {short_code}")
+        url_info = self.db.get_url_info(short_code)
+        
+        if url_info:
+            original_url = url_info['original_url']
+            logger.info(f"Redirecting to: {original_url}")
+            
+            # Track click before redirect
+            self.db.increment_clicks(short_code)
+            
+            # Use JavaScript for immediate redirect with analytics parameters
+            html = f"""
+                <html>
+                <head>
+                    <title>Redirecting...</title>
+                    <script>
+                        // Capture basic analytics
+                        var analyticsData = {{
+                            userAgent: navigator.userAgent,
+                            language: navigator.language,
+                            platform: navigator.platform,
+                            screenSize: window.screen.width + 'x' + window.screen.height
+                        }};
+                        
+                        // Store analytics data in query params
+                        var url = new URL("{original_url}");
+                        url.searchParams.append('user_agent', analyticsData.userAgent);
+                        url.searchParams.append('ref', document.referrer);
+                        
+                        // Redirect with analytics data
+                        window.location.href = url.toString();
+                    </script>
+                    <meta http-equiv="refresh" content="0;url={original_url}">
+                </head>
+                <body>
+                    <p>Redirecting to {original_url}...</p>
+                    <p>Click <a href="{original_url}">here</a> if not redirected automatically.</p>
+                </body>
+                </html>
+            """
+            st.markdown(html, unsafe_allow_html=True)
+            return True
+        else:
+            st.error("Invalid or expired link")
+            st.markdown(f"[← Back to Campaign Dashboard]({BASE_URL})")
+            return False
+
+    def render_campaign_dashboard(self):
+        """Enhanced campaign management dashboard"""
+        st.title("🚀 Campaign Management")
+        
+        # Top-level metrics
+        metrics = st.columns(4)
+        link_totals = self.db.get_link_totals()
+        with metrics[0]:
+            st.metric("Active Campaigns", link_totals['links'], "↑2")
+        with metrics[1]:
+            total_clicks = link_totals['total_clicks']
+            st.metric("Total Clicks", f"{total_clicks:,}", "↑15%")
+        with metrics[2]:
+            st.metric("Conversion Rate", "4.2%", "↑0.8%")
+        with metrics[3]:
+            st.metric("ROI", "$1,245", "↑23%")
+
+        # Campaign Management Tabs
+        management_tabs = st.tabs(["📊 Overview", "⚙️ Settings", "📈 Analytics"])
+        
+        with management_tabs[0]:
+            # Active Campaigns Table
+            st.markdown("### 📈 Active Campaigns")
+            self.render_active_campaigns()
+            
+        with management_tabs[1]:
+            # Settings Section
+            st.markdown("### ⚙️ Campaign Settings")
+            col1, col2 = st.columns(2)
+            with col1:
+                st.selectbox("Default UTM Source", ["facebook", "twitter", "linkedin"])
+                st.selectbox("Default Campaign Type", list(CAMPAIGN_TYPES.keys()))
+                st.text_input("Custom Domain", placeholder="links.yourdomain.com")
+            with col2:
+                st.checkbox("Auto-generate QR Codes")
+                st.checkbox("Enable Link Retargeting")
+                st.number_input("Default Link Expiry (days)", value=30)
+                
+        with management_tabs[2]:
+            # Analytics Section
+            st.markdown("### 📊 Campaign Analytics")
+            
+            # Analytics filters
+            col1, col2 = st.columns(2)
+            with col1:
+                date_range = st.date_input("Date Range", [])
+            with col2:
+                campaign_filter = st.multiselect("Filter Campaigns", 
+                                               self.db.get_campaign_names())
+            
+            # Analytics metrics
+            metrics_cols = st.columns(3)
+            with metrics_cols[0]:
+                st.metric("Total Clicks", total_clicks)
+            with metrics_cols[1]:
+                st.metric("Conversion Rate", "4.2%")
+            with metrics_cols[2]:
+                st.metric("Avg. Time on Page", "2m 34s")
+                
+            # Analytics charts
+            chart_cols = st.columns(2)
+            with chart_cols[0]:
+                st.markdown("#### Click Distribution")
+                # Add your click distribution chart here
+                
+            with chart_cols[1]:
+                st.markdown("#### Traffic Sources")
+                # Add your traffic sources chart here
+
+    def render_active_campaigns(self):
+        """Display active campaigns in a modern table view"""
+        # Filters and search
+        col1, col2, col3 = st.columns([2,1,1])
+        with col1:
+            search = st.text_input("🔍 Search", placeholder="Search campaigns...")
+        with col2:
+            status_filter = st.selectbox("Status", ["All", "Active", "Inactive"])
+        with col3:
+            sort_by = st.selectbox("Sort by", ["Created", "Clicks", "Campaign Name"])
+
+        # Search, status and sort run in the database, one page at a time
+        sort = {"Created": "created", "Clicks": "clicks", "Campaign Name": "name"}[sort_by]
+        filters = (search, status_filter, sort)
+        page = self.db.get_urls_page(
+            limit=CAMPAIGN_PAGE_SIZE,
+            cursor=page_cursor("active_campaigns", filters),
+            sort=sort,
+            descending=sort != "name",
+            search=search,
+            is_active=None if status_filter == "All" else status_filter == "Active"
+        )
+        campaigns = page['items']
+
+        if not campaigns:
+            st.info("No active campaigns yet. Create your first campaign above!")
+            return
+
+        # Create DataFrame for campaigns
+        df = pd.DataFrame([
+            {
+                'Campaign Name': c.get('campaign_name', c['short_code']),
+                'Original URL': c['original_url'],
+                'Short URL': f"{BASE_URL}?r={c['short_code']}",
+                'Created': datetime.strptime(c['created_at'], '%Y-%m-%d %H:%M:%S').strftime('%Y-%m-%d'),
+                'Total Clicks': c['total_clicks'],
+                'Status': 'Active' if c['is_active'] else 'Inactive',
+                'Actions': c['short_code']
+            } for c in campaigns
+        ])
+
+        # Display table
+        st.dataframe(
+            df,
+            column_config={
+                "Campaign Name": st.column_config.TextColumn("Campaign Name", width="medium"),
+                "Short URL": st.column_config.LinkColumn("Short URL", width="medium"),
+                "Total Clicks": st.column_config.NumberColumn("Clicks", format="%d"),
+                "Created": st.column_config.DateColumn("Created", format="MMM DD, YYYY"),
+                "Status": st.column_config.TextColumn("Status", width="small")
+            },
+            hide_index=True,
+            use_container_width=True
+        )
+        render_page_controls("active_campaigns", page)
+
+        # Action buttons for each campaign
+        for _, row in df.iterrows():
+            cols = st.columns([1,1,1,1])
+            with cols[0]:
+                if st.button("📊 Analytics", key=f"stats_{row['Actions']}"):
+                    st.json(self.db.get_campaign_stats(row['Actions']))
+            with cols[1]:
+                if st.button("✏️ Edit", key=f"edit_{row['Actions']}"):
+                    st.session_state.editing_campaign = row['Actions']
+            with cols[2]:
+                if st.button("🔗 Copy", key=f"copy_{row['Actions']}"):
+                    st.code(row['Short URL'])
+            with cols[3]:
+                if st.button("🗑️ Delete", key=f"del_{row['Actions']}"):
+                    if self.db.delete_campaign(row['Actions']):
+                        st.success("Deleted!")
+                        st.rerun()
+
+    def render_campaign_editor(self, campaign: Dict[str, Any]):
+        """Render campaign editing interface"""
+        st.subheader(f"Edit Campaign: {campaign.get('campaign_name', campaign['short_code'])}")
+        
+        with st.form(key=f"edit_campaign_{campaign['short_code']}"):
+            campaign_name = st.text_input("Campaign Name", value=campaign.get('campaign_name', ''))
+            campaign_type = st.selectbox("Campaign Type", 
+                                       list(CAMPAIGN_TYPES.keys()),
+                                       index=list(CAMPAIGN_TYPES.keys()).index(campaign.get('campaign_type', 'Other')))
+            
+            # UTM Parameters
+            st.markdown("### UTM Parameters")
+            col1, col2 = st.columns(2)
+            with col1:
+                utm_source = st.text_input("Source", value=campaign.get('utm_source', ''))
+                utm_medium = st.text_input("Medium", value=campaign.get('utm_medium', ''))
+            with col2:
+                utm_campaign = st.text_input("Campaign", value=campaign.get('utm_campaign', ''))
+                utm_content = st.text_input("Content", value=campaign.get('utm_content', ''))
+            
+            # Additional settings
+            expiry_date = st.date_input("Expiry Date", 
+                                       value=datetime.strptime(campaign.get('expiry_date', '2099-12-31'), '%Y-%m-%d') if campaign.get('expiry_date') else None)
+            
+            notes = st.text_area("Notes", value=campaign.get('notes', ''))
+            tags = st.text_input("Tags (comma-separated)", value=','.join(campaign.get('tags', [])))
+            
+            if st.form_submit_button("Update Campaign"):
+                update_data = {
+                    'campaign_name': campaign_name,
+                    'campaign_type': campaign_type,
+                    'utm_source': utm_source,
+                    'utm_medium': utm_medium,
+                    'utm_campaign': utm_campaign,
+                    'utm_content': utm_content,
+                    'expiry_date': expiry_date.strftime('%Y-%m-%d'),
+                    'notes': notes,
+                    'tags': tags
+                }
+                
+                if self.db.update_campaign(campaign['short_code'], update_data):
+                    st.success("Campaign updated successfully!")
+                    st.rerun()
+                else:
+                    st.error("Failed to update campaign")
+
+    def create_campaign_url(self, form_data: dict) -> Optional[str]:
+        """Create a new campaign URL"""
+        try:
+            url = form_data['url']
+            campaign_name = form_data['campaign_name']
+            
+            logger.info(f"Starting campaign creation process...")
+            logger.info(f"URL: {url}")
+            logger.info(f"Campaign Name: {campaign_name}")
+            
+            # Clean and validate URL
+            if not url.startswith(('http://', 'https://')):
+                url = 'https://' + url
+                logger.info(f"Modified URL: {url}")
+
+            # Generate short code
+            short_code = form_data.get('custom_code') or self.generate_short_code()
+            logger.info(f"Generated short code: {short_code}")
+            
+            # Prepare UTM parameters
+            utm_params = {
+                'utm_source': form_data.get('utm_source'),
+                'utm_medium': form_data.get('utm_medium'),
+                'utm_campaign': form_data.get('utm_campaign'),
+                'utm_content': form_data.get('utm_content'),
+                'utm_term': form_data.get('utm_term')
+            }
+            
+            # Filter out empty UTM parameters
+            utm_params = {k: v for k, v in utm_params.items() if v}
+            logger.info(f"UTM parameters: {utm_params}")
+            
+            # Add UTM parameters to URL if any exist
+            if utm_params:
+                parsed_url = urlparse(url)
+                existing_params = parse_qs(parsed_url.query)
+                all_params = {**existing_params, **utm_params}
+                new_query = urlencode(all_params, doseq=True)
+                url = parsed_url._replace(query=new_query).geturl()
+                logger.info(f"Final URL with UTM parameters: {url}")
+            
+            # Save to database
+            logger.info("Attempting to save to database...")
+            success = self.db.save_campaign_url(
+                url=url,
+                short_code=short_code,
+                campaign_name=campaign_name,
+                campaign_type=form_data.get('campaign_type'),
+                utm_params=utm_params
+            )
+            
+            if success:
+                logger.info(f"Successfully created campaign '{campaign_name}' with short code: {short_code}")
+                return short_code
+            else:
+                logger.error("Database save operation failed")
+                return None
+            
+        except Exception as e:
+            logger.error(f"Error creating campaign URL: {str(e)}", exc_info=True)
+            return None
+
+    def render_demographics(self, short_code: str):
+        """Render demographic analytics"""
+        st.subheader("📊 Visitor Demographics")
+        
+        # Get demographic data
+        demo_data = self.db.get_demographics(short_code)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            # Country distribution
+            st.markdown("### Geographic Distribution")
+            country_data = pd.DataFrame(demo_data['countries'].items(), 
+                                      columns=['Country', 'Visits'])
+            fig = px.choropleth(country_data, 
+                               locations='Country', 
+                               locationmode='country names',
+                               color='Visits',
+                               title='Visitor Locations')
+            st.plotly_chart(fig, use_container_width=True)
+            
+        with col2:
+            # Device breakdown
+            st.markdown("### Device Types")
+            device_data = pd.DataFrame(demo_data['devices'].items(), 
+                                     columns=['Device', 'Count'])
+            fig = px.pie(device_data, values='Count', names='Device',
+                        title='Device Distribution')
+            st.plotly_chart(fig, use_container_width=True)
+        
+        # Browser and OS data
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("### Browsers")
+            browser_data = pd.DataFrame(demo_data['browsers'].items(),
+                                      columns=['Browser', 'Count'])
+            fig = px.bar(browser_data, x='Browser', y='Count',
+                        title='Browser Usage')
+            st.plotly_chart(fig, use_container_width=True)
+            
+        with col2:
+            st.markdown("### Operating Systems")
+            os_data = pd.DataFrame(demo_data['os'].items(),
+                                 columns=['OS', 'Count'])
+            fig = px.bar(os_data, x='OS', y='Count',
+                        title='OS Distribution')
+            st.plotly_chart(fig, use_container_width=True)
+
+    def render_click_heatmap(self, short_code: str):
+        """Render click heatmap visualization"""
+        st.subheader("🎯 Click Heatmap")
+        
+        # Get click coordinate data
+        click_data = self.db.get_click_coordinates(short_code)
+        
+        if click_data:
+            # Create heatmap using plotly
+            fig = go.Figure(data=go.Heatmap(
+                x=click_data['x'],
+                y=click_data['y'],
+                colorscale='Viridis'
+            ))
+            
+            fig.update_layout(
+                title='Click Distribution Heatmap',
+                xaxis_title='X Coordinate',
+                yaxis_title='Y Coordinate',
+                height=400
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("No click data available for heatmap visualization")
+
+    def render_recent_links(self):
+        """Display the most recently created links"""
+        st.subheader("🕒 Recently Created Links")
+        
+        # Get recent links from database (last 5)
+        recent_links = self.db.get_recent_links(limit=5)
+        
+        if not recent_links:
+            st.info("No links created yet. Create your first campaign above!")
+            return
+        
+        # Create columns for the metrics overview
+        total_clicks = sum(link['total_clicks'] for link in recent_links)
+        
+        metrics_col1, metrics_col2 = st.columns(2)
+        with metrics_col1:
+            st.metric("Total Clicks (Recent)", total_clicks)
+        with metrics_col2:
+            st.metric("Recent Links", len(recent_links))  # Changed from unique visitors
+        
+        # Display recent links in a modern table
+        last_clicks = self.db.get_last_click_dates([link['short_code'] for link in recent_links])
+        df = pd.DataFrame([
+            {
+                'Campaign': link.get('campaign_name', link['short_code']),
+                'Short URL': f"{BASE_URL}?r={link['short_code']}",
+                'Created': datetime.strptime(link['created_at'], '%Y-%m-%d %H:%M:%S').strftime('%Y-%m-%d %H:%M'),
+                'Clicks': link['total_clicks'],
+                'Last Click': last_clicks[link['short_code']].strftime('%Y-%m-%d %H:%M') if link['short_code'] in last_clicks else "Never"
+            } for link in recent_links
+        ])
+        
+        st.dataframe(
+            df,
+            column_config={
+                "Campaign": st.column_config.TextColumn("Campaign", width="medium"),
+                "Short URL": st.column_config.LinkColumn("Short URL", width="medium"),
+                "Created": st.column_config.DatetimeColumn("Created", format="D MMM, HH:mm"),
+                "Clicks": st.column_config.NumberColumn("Clicks", format="%d"),
+                "Last Click": st.column_config.DatetimeColumn("Last Activity", format="D MMM, HH:mm")
+            },
+            hide_index=True,
+            use_container_width=True
+        )
+
+    def render_recent_activity(self, activities):
+        """Render recent campaign activities with enhanced styling"""
+        st.markdown("### 📊 Recent Activity")
+        
+        for activity in activities:
+            st.markdown(f"""
+                <div class="activity-item">
+                    <div class="activity-icon">🔗</div>
+                    <div class="activity-content">
+                        <div class="activity-title">{activity['campaign_name']}</div>
+                        <div class="activity-meta">
+                            <span class="activity-time">{activity['clicked_at']}</span>
+                            <span class="activity-state">{activity['state']}</span>
+                            <span>{activity['device_type']}</span>
+                        </div>
+                    </div>
+                </div>
+            """, unsafe_allow_html=True)
+
+            
+
+    def render_campaign_manager(self):
+        """Render the campaign manager with full management capabilities"""
+        st.markdown("### 📊 Campaign Manager")
+        
+        # Add filters
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            campaign_type_filter = st.multiselect(
+                "Campaign Type",
+                list(CAMPAIGN_TYPES.keys()),
+                placeholder="Filter by type"
+            )
+        with col2:
+            status_filter = st.multiselect(
+                "Status",
+                ["Active", "Inactive"],
+                placeholder="Filter by status"
+            )
+        with col3:
+            search = st.text_input("Search campaigns", placeholder="Search by name...")
+        
+        # Filters run in the database, one page at a time
+        filters = (tuple(campaign_type_filter), tuple(status_filter), search)
+        page = self.db.get_urls_page(
+            limit=CAMPAIGN_PAGE_SIZE,
+            cursor=page_cursor("campaign_manager", filters),
+            search=search,
+            campaign_types=campaign_type_filter,
+            is_active=('Active' in status_filter) if len(status_filter) == 1 else None
+        )
+        campaigns = page['items']
+        
+        if not campaigns:
+            st.info("No campaigns yet. Create your first campaign to get started!")
+            return
+        
+        # Create DataFrame for campaign data
+        df = pd.DataFrame(campaigns)
+        
+        # Convert datetime strings to datetime objects
+        df['created_at'] = pd.to_datetime(df['created_at'])
+        df['last_clicked'] = pd.to_datetime(df['last_clicked'])
+        
+        # Add short URL column
+        df['short_url'] = df['short_code'].apply(lambda x: f"{BASE_URL}?r={x}")
+        filtered_df = df.copy()
+        
+        # Configure columns
+        columns_config = {
+            "campaign_name": st.column_config.TextColumn(
+                "Campaign Name",
+                width="medium",
+                help="Name of the campaign"
+            ),
+            "campaign_type": st.column_config.SelectboxColumn(
+                "Type",
+                width="small",
+                options=list(CAMPAIGN_TYPES.keys()),
+                help="Campaign type"
+            ),
+            "short_url": st.column_config.LinkColumn(
+                "Short URL",
+                width="medium",
+                help="Click to copy or visit"
+            ),
+            "original_url": st.column_config.LinkColumn(
+                "Original URL",
+                width="medium"
+            ),
+            "total_clicks": st.column_config.NumberColumn(
+                "Clicks",
+                width="small",
+                help="Total number of clicks",
+                format="%d"
+            ),
+            "created_at": st.column_config.DatetimeColumn(
+                "Created",
+                width="medium",
+                format="MMM DD, YYYY HH:mm"
+            ),
+            "last_clicked": st.column_config.DatetimeColumn(
+                "Last Click",
+                width="medium",
+                format="MMM DD, YYYY HH:mm"
+            ),
+            "is_active": st.column_config.CheckboxColumn(
+                "Active",
+                width="small",
+                help="Campaign status"
+            )
+        }
+        
+        # Display editable table with pagination
+        edited_df = st.data_editor(
+            filtered_df,
+            column_config=columns_config,
+            use_container_width=True,
+            hide_index=True,
+            num_rows="dynamic",
+            key="campaign_manager_table",
+            disabled=["short_url", "original_url", "total_clicks", "created_at", "last_clicked"],
+            column_order=[
+                "campaign_name",
+                "campaign_type",
+                "short_url",
+                "original_url",
+                "total_clicks",
+                "created_at",
+                "last_clicked",
+                "is_active"
+            ]
+        )
+        render_page_controls("campaign_manager", page)
+        
+        # Handle edits
+        if not filtered_df.equals(edited_df):
+            try:
+                # Get the changed rows
+                changed_mask = (filtered_df != edited_df).any(axis=1)
+                changed_rows = edited_df[changed_mask]
+                
+                for idx, row in changed_rows.iterrows():
+                    # Update campaign in database
+                    self.db.update_campaign(
+                        short_code=df.loc[idx, 'short_code'],
+                        campaign_name=row['campaign_name'],
+                        campaign_type=row['campaign_type'],
+                        is_active=row['is_active']
+                    )
+                
+                st.success("Campaign(s) updated successfully!")
+                time.sleep(1)
+                st.rerun()
+                
+            except Exception as e:
+                st.error(f"Error updating campaign(s): {str(e)}")
+
+    def generate_report(self, report_type: str, format: str, metrics: list, **kwargs):
+        """Generate analytics report based on parameters"""
+        try:
+            # Get filtered data
+            data = self.db.get_analytics_summary(**kwargs)
+            
+            # Create DataFrame based on report type
+            if report_type == "Campaign Summary":
+                df = pd.DataFrame(data['campaign_stats'])
+            elif report_type == "Geographic Analysis":
+                df = pd.DataFrame(list(data['state_stats'].items()), 
+                                columns=['State', 'Visits'])
+            elif report_type == "Time-based Analysis":
+                df = pd.DataFrame(list(data['daily_stats'].items()),
+                                columns=['Date', 'Clicks'])
+            else:  # Custom Report
+                # Combine all requested metrics
+                df = pd.DataFrame()
+                if "Clicks" in metrics:
+                    df['Clicks'] = data['daily_stats'].values()
+                if "Geographic Data" in metrics:
+                    df['Geographic'] = data['state_stats'].values()
+                # Add more metric combinations as needed
+            
+            # Generate report in requested format
+            if format == "Excel":
+                output = BytesIO()
+                df.to_excel(output, index=False)
+                return output.getvalue()
+            elif format == "CSV":
+                return df.to_csv(index=False).encode('utf-8')
+            elif format == "PDF":
+                # Implement PDF generation using reportlab or another PDF library
+                pass
+            
+        except Exception as e:
+            logger.error(f"Error generating report: {str(e)}")
+            raise
@@ -0,0 +1,9 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Keep test databases free of side effects: no JSONL click log, no enrichment thread
+os.environ.setdefault('CLICK_LOG_ENABLED', '0')
+os.environ.setdefault('ENRICHMENT_IN_PROCESS', '0')
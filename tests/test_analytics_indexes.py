@@ -0,0 +1,90 @@
+"""
+The analytics reads behind the dashboard must be served by the idx_analytics_*
+indexes, never by a full scan of the analytics table.
+
+Each test builds a fresh database through MIGRATIONS, records every statement
+a Database method sends to SQLite, and checks the EXPLAIN QUERY PLAN of those
+that read analytics.
+"""
+import re
+import sqlite3
+
+import pytest
+
+import db_pool
+from migrations import MIGRATIONS, get_schema_version, migrate
+
+ANALYTICS_ALIAS = re.compile(r'\banalytics\s+(?:AS\s+)?(\w+)', re.IGNORECASE)
+PLAN_ACCESS = re.compile(r'^(SCAN|SEARCH) (\w+)')
+NOT_ALIASES = {'WHERE', 'JOIN', 'LEFT', 'INNER', 'ON', 'GROUP', 'ORDER', 'LIMIT', 'SET', 'USING'}
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Migrated Database whose connections log every statement they run"""
+    db_path = str(tmp_path / 'urls.db')
+    migrate(db_path)
+    with sqlite3.connect(db_path) as conn:
+        assert get_schema_version(conn) == len(MIGRATIONS)
+
+    statements = []
+    connect = db_pool.connect
+
+    def traced_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(db_pool, 'connect', traced_connect)
+    from database import Database
+    database = Database(db_path)
+    database.statements = statements
+    return database
+
+
+def analytics_plans(db):
+    """Query plans of the analytics reads the database has run so far"""
+    plans = []
+    with sqlite3.connect(db.db_path) as conn:
+        for statement in db.statements:
+            if not re.search(r'\banalytics\b', statement) or not statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+                continue
+            aliases = {'analytics'} | {
+                alias for alias in ANALYTICS_ALIAS.findall(statement) if alias.upper() not in NOT_ALIASES
+            }
+            detail = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}")]
+            plans.append((statement, aliases, detail))
+    return plans
+
+
+def assert_uses_analytics_indexes(db):
+    plans = analytics_plans(db)
+    assert plans, "no analytics reads were issued"
+    for statement, aliases, detail in plans:
+        accesses = [line for line in detail if (m := PLAN_ACCESS.match(line)) and m.group(2) in aliases]
+        assert accesses, f"analytics is not read in plan {detail} of:\n{statement}"
+        for line in accesses:
+            assert re.search(r'USING (COVERING )?INDEX idx_analytics_', line), \
+                f"analytics read without an idx_analytics_* index ({line}) in:\n{statement}"
+            assert not re.fullmatch(r'SCAN \w+', line), f"full scan of analytics ({line}) in:\n{statement}"
+
+
+def test_unfiltered_analytics_summary_skips_analytics(db):
+    # Clicks come from the rollups and unique visitors from link_visitors
+    db.get_analytics_summary()
+    assert not analytics_plans(db)
+
+
+def test_filtered_analytics_summary_uses_indexes(db):
+    db.get_analytics_summary(start_date='2026-01-01', end_date='2026-01-31', campaigns=['Launch'], states=['Delhi'])
+    assert_uses_analytics_indexes(db)
+
+
+def test_dashboard_stats_use_indexes(db):
+    db.get_dashboard_stats()
+    assert_uses_analytics_indexes(db)
+
+
+def test_recent_activity_uses_indexes(db):
+    db.get_recent_activity()
+    assert_uses_analytics_indexes(db)
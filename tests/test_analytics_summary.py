@@ -0,0 +1,20 @@
+"""
+The analytics summary's breakdowns must add up to its click total, including
+clicks the enrichment worker has not given a state yet.
+"""
+from click_writer import stop_click_writers
+from database import Database
+
+
+def test_state_totals_match_clicks_before_enrichment(tmp_path):
+    db = Database(str(tmp_path / 'urls.db'))
+    short_code = db.create_short_url('https://example.com/summary', 'summary')
+    for n in range(5):
+        db.record_click(short_code, {'ip_address': f"10.0.0.{n}"})
+    stop_click_writers()
+
+    summary = db.get_analytics_summary()
+    assert summary['total_clicks'] == 5
+    assert summary['state_stats'] == {'Unknown': 5}
+    assert sum(summary['state_stats'].values()) == summary['total_clicks']
+    assert sum(summary['daily_stats'].values()) == summary['total_clicks']
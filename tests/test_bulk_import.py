@@ -0,0 +1,100 @@
+"""
+Bulk CSV import: per-row validation and error report, duplicate handling,
+and the chunked insert through create_short_urls_bulk.
+"""
+import csv
+import io
+import sqlite3
+
+import pytest
+
+import database
+from bulk_import import CREATED_FIELDS, ERROR_FIELDS, parse_rows, write_report
+from database import Database
+
+CSV = """URL,Campaign Name,Type,UTM Source,utm_medium
+https://example.com/spring,Spring Sale,Email,newsletter,email
+example.com/summer,Summer Sale,Social,,
+not a url,Broken Link,Email,,
+https://example.com/nameless,,Email,,
+https://example.com/spring-again,Spring Sale,Email,,
+https://example.com/taken,Existing Campaign,Email,,
+,,,,
+https://example.com/autumn,Autumn Sale,,,
+"""
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'urls.db'))
+    db.create_short_url('https://example.com/old', 'Existing Campaign')
+    return db
+
+
+def stored_links(db):
+    with sqlite3.connect(db.db_path) as conn:
+        return {row[0]: row[1:] for row in conn.execute(
+            "SELECT campaign_name, original_url, campaign_type, utm_source, short_code FROM urls"
+        )}
+
+
+def test_import_reports_invalid_rows_and_inserts_the_rest(db, tmp_path):
+    result = db.create_short_urls_bulk(parse_rows(io.StringIO(CSV)), chunk_size=2)
+
+    # Rows are numbered from the first data row; the blank line is skipped
+    errors = sorted(result['errors'], key=lambda error: error['row'])
+    assert [(error['row'], error['campaign_name'], error['error']) for error in errors] == [
+        (3, 'Broken Link', 'Invalid URL format'),
+        (4, '', 'Missing campaign name'),
+        (5, 'Spring Sale', 'Duplicate campaign name in import'),
+        (6, 'Existing Campaign', 'Campaign name already exists')
+    ]
+    assert [(link['row'], link['campaign_name']) for link in result['created']] == [
+        (1, 'Spring Sale'), (2, 'Summer Sale'), (7, 'Autumn Sale')
+    ]
+
+    links = stored_links(db)
+    assert set(links) == {'Existing Campaign', 'Spring Sale', 'Summer Sale', 'Autumn Sale'}
+    assert links['Existing Campaign'][0] == 'https://example.com/old'
+    spring_url, spring_type, spring_source, spring_code = links['Spring Sale']
+    assert spring_url == 'https://example.com/spring?utm_source=newsletter&utm_medium=email'
+    assert (spring_type, spring_source) == ('Email', 'newsletter')
+    assert links['Summer Sale'][0] == 'https://example.com/summer'
+    assert links['Autumn Sale'][1] is None
+    created_codes = {link['campaign_name']: link['short_code'] for link in result['created']}
+    assert created_codes['Spring Sale'] == spring_code
+
+    errors_path = str(tmp_path / 'errors.csv')
+    write_report(errors_path, result['errors'], ERROR_FIELDS)
+    with open(errors_path, newline='', encoding='utf-8') as f:
+        report = list(csv.DictReader(f))
+    assert [row['row'] for row in report] == ['3', '4', '5', '6']
+    assert report[0] == {'row': '3', 'campaign_name': 'Broken Link', 'error': 'Invalid URL format'}
+
+    created_path = str(tmp_path / 'created.csv')
+    write_report(created_path, result['created'], CREATED_FIELDS)
+    with open(created_path, newline='', encoding='utf-8') as f:
+        assert [row['campaign_name'] for row in csv.DictReader(f)] == ['Spring Sale', 'Summer Sale', 'Autumn Sale']
+
+
+def test_failed_chunk_is_rolled_back_and_retried_row_by_row(db, monkeypatch):
+    taken_code = stored_links(db)['Existing Campaign'][3]
+    allocator = database.get_code_allocator(db.db_path)
+
+    class CollidingAllocator:
+        """Hands out a code that is already stored, as a racing writer could"""
+
+        def allocate_many(self, count):
+            return [taken_code] + allocator.allocate_many(count - 1)
+
+    monkeypatch.setattr(database, 'get_code_allocator', lambda db_path: CollidingAllocator())
+    rows = [{'url': f"https://example.com/{n}", 'campaign_name': f"Batch {n}"} for n in range(1, 4)]
+    result = db.create_short_urls_bulk(rows)
+
+    # The chunk insert failed as a whole; only the colliding row is rejected
+    assert [(error['row'], error['campaign_name']) for error in result['errors']] == [(1, 'Batch 1')]
+    assert 'short_code' in result['errors'][0]['error']
+    assert [link['campaign_name'] for link in result['created']] == ['Batch 2', 'Batch 3']
+    links = stored_links(db)
+    assert set(links) == {'Existing Campaign', 'Batch 2', 'Batch 3'}
+    assert links['Existing Campaign'][0] == 'https://example.com/old'
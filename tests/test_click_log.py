@@ -0,0 +1,53 @@
+"""
+Replaying the click log must be idempotent: clicks analytics already holds
+are skipped, so counters, rollups and visitors are not bumped twice.
+"""
+import sqlite3
+
+from click_log import ClickLog, replay_clicks
+from click_writer import stop_click_writers
+from database import Database
+
+
+def snapshot(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return {
+            'analytics': conn.execute("SELECT COUNT(*) FROM analytics").fetchone()[0],
+            'total_clicks': conn.execute("SELECT SUM(total_clicks) FROM urls").fetchone()[0],
+            'unique_visitors': conn.execute("SELECT SUM(unique_visitors) FROM urls").fetchone()[0],
+            'rollup_clicks': conn.execute("SELECT SUM(clicks) FROM click_rollup_daily").fetchone()[0],
+            'link_visitors': conn.execute("SELECT COUNT(*) FROM link_visitors").fetchone()[0]
+        }
+
+
+def test_replay_skips_stored_clicks(tmp_path, monkeypatch):
+    log_dir = str(tmp_path / 'click_logs')
+    click_log = ClickLog(directory=log_dir, compress=False)
+    click_log.start()
+    monkeypatch.setattr('click_log.get_click_log', lambda: click_log)
+
+    db = Database(str(tmp_path / 'urls.db'))
+    short_code = db.create_short_url('https://example.com/replay', 'replay')
+    for n in range(6):
+        db.record_click(short_code, {'ip_address': f"10.0.0.{n % 3}", 'session_id': f"s{n}"})
+    click_log.stop()
+    stop_click_writers()
+
+    # The live database already holds every logged click
+    before = snapshot(db.db_path)
+    assert replay_clicks(db.db_path, log_dir) == 0
+    assert snapshot(db.db_path) == before
+
+    # Rebuild from the log into a fresh database holding only the link
+    replay_db = str(tmp_path / 'replay.db')
+    Database(replay_db).create_short_url('https://example.com/replay', 'replay')
+    with sqlite3.connect(replay_db) as conn:
+        conn.execute("UPDATE urls SET short_code = ?", (short_code,))
+
+    assert replay_clicks(replay_db, log_dir) == 6
+    after_first = snapshot(replay_db)
+    assert after_first['analytics'] == after_first['total_clicks'] == after_first['rollup_clicks'] == 6
+    assert after_first['unique_visitors'] == after_first['link_visitors'] == 3
+
+    assert replay_clicks(replay_db, log_dir) == 0
+    assert snapshot(replay_db) == after_first
@@ -0,0 +1,48 @@
+"""
+Click times are reported in IST whatever the server's timezone is.
+"""
+import os
+import time
+from datetime import timedelta
+
+import pytest
+
+from click_time import IST, click_day, ist_datetime
+from click_writer import ClickWriter
+from database import Database
+
+# 2026-03-10 20:00 UTC is already 2026-03-11 01:30 in IST
+EPOCH = 1773172800
+
+
+@pytest.fixture
+def server_timezone(monkeypatch):
+    """Run the test with the process in a timezone far from IST"""
+    monkeypatch.setenv('TZ', 'America/New_York')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_ist_datetime(server_timezone):
+    moment = ist_datetime(EPOCH)
+    assert moment.utcoffset() == timedelta(hours=5, minutes=30)
+    assert moment.strftime('%Y-%m-%d %H:%M') == '2026-03-11 01:30'
+    assert click_day(EPOCH) == '2026-03-11'
+
+
+def test_last_click_dates_are_ist(tmp_path, server_timezone):
+    db = Database(str(tmp_path / 'urls.db'))
+    short_code = db.create_short_url('https://example.com/last', 'last')
+    unclicked = db.create_short_url('https://example.com/never', 'never')
+    ClickWriter(db.db_path).write_now([
+        {'short_code': short_code, 'clicked_at_epoch': epoch, 'ip_address': '10.0.0.1', 'session_id': str(epoch)}
+        for epoch in (EPOCH - 3600, EPOCH)
+    ])
+
+    last_clicks = db.get_last_click_dates([short_code, unclicked])
+    assert list(last_clicks) == [short_code]
+    assert last_clicks[short_code] == ist_datetime(EPOCH)
+    assert last_clicks[short_code].tzinfo == IST
+    assert last_clicks[short_code].strftime('%Y-%m-%d %H:%M') == '2026-03-11 01:30'
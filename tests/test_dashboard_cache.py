@@ -0,0 +1,87 @@
+"""
+Dashboard payload cache: invalidation by data version and
+stale-while-revalidate with a single background refresh.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dashboard_cache import DashboardCache, dashboard_cache
+from database import Database
+
+
+def test_write_through_execute_query_forces_reload(tmp_path, monkeypatch):
+    # Serve nothing stale, so a version change always reloads
+    monkeypatch.setattr(dashboard_cache, 'max_staleness', 0)
+    db = Database(str(tmp_path / 'urls.db'))
+    short_code = db.create_short_url('https://example.com/cache', 'cache', 'Email')
+
+    loads = []
+    load = db._load_campaign_type_stats
+    monkeypatch.setattr(db, '_load_campaign_type_stats', lambda: loads.append(1) or load())
+
+    assert [row['campaign_type'] for row in db.get_campaign_type_stats()] == ['Email']
+    assert [row['campaign_type'] for row in db.get_campaign_type_stats()] == ['Email']
+    assert len(loads) == 1
+
+    version = db.get_data_version()
+    db.execute_query("UPDATE urls SET campaign_type = ? WHERE short_code = ?", ('Social', short_code))
+    assert db.get_data_version() == version + 1
+
+    assert [row['campaign_type'] for row in db.get_campaign_type_stats()] == ['Social']
+    assert len(loads) == 2
+
+
+def test_reads_do_not_bump_data_version(tmp_path):
+    db = Database(str(tmp_path / 'urls.db'))
+    version = db.get_data_version()
+    db.execute_query("SELECT COUNT(*) FROM urls")
+    assert db.get_data_version() == version
+
+
+def test_stale_entry_is_served_while_one_refresh_runs():
+    cache = DashboardCache(max_staleness=60)
+    assert cache.get('stats', 1, lambda: {'clicks': 1}) == {'clicks': 1}
+
+    release = threading.Event()
+    refreshes = []
+
+    def slow_loader():
+        refreshes.append(threading.current_thread().name)
+        assert release.wait(5)
+        return {'clicks': 2}
+
+    # Many readers see the newer version at once: all get the stale payload without waiting
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: cache.get('stats', 2, slow_loader), range(16)))
+    assert results == [{'clicks': 1}] * 16
+    assert cache.stats()['stale_hits'] == 16
+    assert cache.stats()['refreshes'] == 1
+
+    release.set()
+    for _ in range(100):
+        if not cache.stats()['inflight']:
+            break
+        time.sleep(0.01)
+    assert refreshes == ['dashboard-refresh']
+
+    # The refreshed payload is now current; no further load happens
+    assert cache.get('stats', 2, lambda: pytest.fail("reloaded a current entry")) == {'clicks': 2}
+    assert cache.stats()['hits'] == 1
+
+
+def test_entry_past_staleness_budget_is_recomputed_by_caller():
+    cache = DashboardCache(max_staleness=0)
+    cache.get('stats', 1, lambda: {'clicks': 1})
+    assert cache.get('stats', 2, lambda: {'clicks': 2}) == {'clicks': 2}
+    assert cache.stats()['stale_hits'] == 0
+    assert cache.stats()['misses'] == 2
+
+
+def test_payloads_are_copies():
+    cache = DashboardCache()
+    payload = cache.get('stats', 1, lambda: {'daily': {'2026-01-01': 3}})
+    payload['daily']['2026-01-01'] = 99
+    assert cache.get('stats', 1, lambda: pytest.fail("reloaded")) == {'daily': {'2026-01-01': 3}}
@@ -0,0 +1,32 @@
+"""
+Import-time budgets: every entry point must load within its budget and
+without pulling in the modules it defers.
+
+Set IMPORT_TIME_BUDGET_SCALE (e.g. 2) on slow machines to loosen the time
+budgets; forbidden modules are enforced regardless.
+"""
+import argparse
+import os
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+import import_time  # noqa: E402
+
+
+@pytest.mark.parametrize('entry_point', list(import_time.ENTRY_POINTS))
+def test_import_time_budget(entry_point):
+    args = argparse.Namespace(
+        only=[entry_point],
+        repeat=3,
+        budget_scale=float(os.environ.get('IMPORT_TIME_BUDGET_SCALE', '1')),
+        top=5
+    )
+    data = import_time.run_benchmark(args)['entry_points'][entry_point]
+    assert not data['forbidden_loaded'], \
+        f"import {entry_point} loads deferred modules: {', '.join(data['forbidden_loaded'])}"
+    assert data['ok'], \
+        f"import {entry_point} took {data['total_ms']} ms (budget {data['budget_ms']} ms); heaviest: {data['heaviest']}"
@@ -0,0 +1,181 @@
+"""
+IPLookupClient against local stub providers: hedging, per-provider
+timeouts, circuit breakers and response normalization.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ip_lookup_client import CircuitBreaker, IPLookupClient, Provider, normalize_ip_response
+
+# Provider kind -> a response in that provider's format
+PAYLOADS = {
+    'ip-api': {'status': 'success', 'country': 'India', 'regionName': 'Maharashtra', 'city': 'Mumbai',
+               'isp': 'Stub ISP', 'org': 'Stub Org', 'lat': 19.07, 'lon': 72.87,
+               'timezone': 'Asia/Kolkata', 'as': 'AS64500 Stub'},
+    'ipapi.co': {'country_name': 'India', 'region': 'Maharashtra', 'city': 'Mumbai', 'org': 'Stub ISP',
+                 'latitude': 19.07, 'longitude': 72.87, 'timezone': 'Asia/Kolkata', 'asn': 'AS64500'},
+    'ipinfo': {'country': 'IN', 'region': 'Maharashtra', 'city': 'Mumbai', 'org': 'AS64500 Stub ISP',
+               'loc': '19.07,72.87', 'timezone': 'Asia/Kolkata'}
+}
+
+URL_TEMPLATES = {
+    'ip-api': 'http://127.0.0.1:{port}/json/{{ip}}',
+    'ipapi.co': 'http://127.0.0.1:{port}/{{ip}}/json/',
+    'ipinfo': 'http://127.0.0.1:{port}/{{ip}}/json'
+}
+
+
+class StubProvider:
+    """A local provider whose latency and status can change between requests"""
+
+    def __init__(self, kind: str, latency: float = 0.0, status: int = 200):
+        self.kind = kind
+        self.latency = latency
+        self.status = status
+        self.hits = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.hits += 1
+                time.sleep(stub.latency)
+                body = json.dumps(PAYLOADS[stub.kind]).encode('utf-8') if stub.status == 200 else b''
+                self.send_response(stub.status)
+                self.send_header('content-type', 'application/json')
+                self.send_header('content-length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), name=f"stub:{kind}", daemon=True).start()
+
+    def provider(self, **kwargs) -> Provider:
+        template = URL_TEMPLATES[self.kind].format(port=self.server.server_port)
+        return Provider(f"stub-{self.kind}", template, kind=self.kind, **kwargs)
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stubs():
+    """Factory for stub providers, all stopped after the test"""
+    started = []
+
+    def start(kind: str, **kwargs) -> StubProvider:
+        stub = StubProvider(kind, **kwargs)
+        started.append(stub)
+        return stub
+
+    yield start
+    for stub in started:
+        stub.stop()
+
+
+@pytest.fixture
+def clients():
+    """Factory for lookup clients, all closed after the test"""
+    created = []
+
+    def create(providers, **kwargs) -> IPLookupClient:
+        client = IPLookupClient(providers, **kwargs)
+        created.append(client)
+        return client
+
+    yield create
+    for client in created:
+        client.close()
+
+
+def test_fast_provider_is_not_hedged(stubs, clients):
+    primary, backup = stubs('ip-api'), stubs('ipinfo')
+    client = clients([primary.provider(), backup.provider()], hedge_delay=0.5)
+
+    assert client.lookup('203.0.113.7')['region'] == 'Maharashtra'
+    assert client.stats()['hedged'] == 0
+    assert backup.hits == 0
+
+
+def test_slow_provider_is_hedged_after_delay(stubs, clients):
+    primary, backup = stubs('ip-api', latency=1.0), stubs('ipinfo')
+    client = clients([primary.provider(), backup.provider()], hedge_delay=0.1)
+
+    started = time.monotonic()
+    result = client.lookup('203.0.113.7')
+    elapsed = time.monotonic() - started
+
+    # The backup's answer (ipinfo format) wins long before the primary replies
+    assert result == normalize_ip_response('ipinfo', PAYLOADS['ipinfo'])
+    assert 0.1 <= elapsed < 0.8
+    assert client.stats()['hedged'] == 1
+    assert backup.hits == 1
+
+
+def test_provider_timeout_is_respected(stubs, clients):
+    slow = stubs('ip-api', latency=1.5)
+    provider = slow.provider(timeout=0.2)
+    client = clients([provider], hedge_delay=0.05)
+
+    started = time.monotonic()
+    assert client.lookup('203.0.113.7') is None
+    assert time.monotonic() - started < 1.0
+    assert client.stats()['failures'] == 1
+    assert provider.breaker.failures == 1
+
+
+def test_breaker_opens_and_half_opens_after_cooldown(stubs, clients):
+    failing = stubs('ipapi.co', status=503)
+    provider = failing.provider(breaker=CircuitBreaker(failure_threshold=2, reset_timeout=0.3))
+    client = clients([provider], hedge_delay=0.05)
+
+    assert client.lookup('203.0.113.7') is None
+    assert provider.breaker.state == 'closed'
+    assert client.lookup('203.0.113.7') is None
+    assert provider.breaker.state == 'open'
+
+    # Open: requests are short-circuited without reaching the provider
+    assert client.lookup('203.0.113.7') is None
+    assert failing.hits == 2
+    assert client.stats()['short_circuited'] == 1
+
+    time.sleep(0.35)
+    assert provider.breaker.state == 'half-open'
+    failing.status = 200
+    assert client.lookup('203.0.113.7')['country'] == 'India'
+    assert failing.hits == 3
+    assert provider.breaker.state == 'closed'
+
+
+def test_failed_half_open_trial_reopens_breaker(stubs, clients):
+    failing = stubs('ipinfo', status=503)
+    provider = failing.provider(breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.2))
+    client = clients([provider], hedge_delay=0.05)
+
+    assert client.lookup('203.0.113.7') is None
+    assert provider.breaker.state == 'open'
+    time.sleep(0.25)
+    assert provider.breaker.state == 'half-open'
+    assert client.lookup('203.0.113.7') is None
+    assert provider.breaker.state == 'open'
+    assert failing.hits == 2
+
+
+@pytest.mark.parametrize('kind', list(PAYLOADS))
+def test_provider_payload_is_normalized(stubs, clients, kind):
+    client = clients([stubs(kind).provider()])
+
+    result = client.lookup('203.0.113.7')
+    assert result == normalize_ip_response(kind, PAYLOADS[kind])
+    assert result['region'] == 'Maharashtra'
+    assert result['city'] == 'Mumbai'
+    assert result['latitude'] == 19.07
+    assert result['longitude'] == 72.87
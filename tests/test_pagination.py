@@ -0,0 +1,89 @@
+"""
+Keyset pagination of the link list: walking forward and back over rows that
+tie on the sort key returns every row exactly once, page by page.
+"""
+import sqlite3
+
+import pytest
+
+from database import URL_SORT_COLUMNS, Database
+from pagination import AFTER, BEFORE, decode_cursor, encode_cursor
+
+LINKS = 23
+PAGE_SIZE = 4
+
+
+@pytest.fixture(scope='module')
+def db(tmp_path_factory):
+    db = Database(str(tmp_path_factory.mktemp('pagination') / 'urls.db'))
+    db.create_short_urls_bulk([
+        {'url': f"https://example.com/{n}", 'campaign_name': f"Campaign {n:02d}",
+         'campaign_type': 'Email' if n % 2 else 'Social'}
+        for n in range(LINKS)
+    ])
+    # Only a few distinct creation times and click counts, so most rows tie on the sort key
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute("""
+            UPDATE urls
+            SET created_at = datetime('2026-01-01', '+' || (id % 4) || ' days'),
+                total_clicks = id % 3
+        """)
+    return db
+
+
+def expected_ids(db, sort, descending, campaign_type=None):
+    column = URL_SORT_COLUMNS[sort]
+    with sqlite3.connect(db.db_path) as conn:
+        rows = conn.execute(f"SELECT {column}, id, campaign_type FROM urls").fetchall()
+    rows = [row for row in rows if campaign_type is None or row[2] == campaign_type]
+    return [row[1] for row in sorted(rows, key=lambda row: (row[0], row[1]), reverse=descending)]
+
+
+def walk(db, direction, cursor=None, **kwargs):
+    """Follow next (or prev) cursors from a page; returns the ids of every page in visiting order"""
+    pages = []
+    while True:
+        page = db.get_urls_page(limit=PAGE_SIZE, cursor=cursor, **kwargs)
+        pages.append(page)
+        cursor = page['next_cursor' if direction == AFTER else 'prev_cursor']
+        if cursor is None:
+            return pages
+
+
+def page_ids(page):
+    return [item['id'] for item in page['items']]
+
+
+@pytest.mark.parametrize('sort', list(URL_SORT_COLUMNS))
+@pytest.mark.parametrize('descending', [True, False])
+def test_walk_forward_and_back(db, sort, descending):
+    forward = walk(db, AFTER, sort=sort, descending=descending)
+    ids = [item_id for page in forward for item_id in page_ids(page)]
+
+    assert ids == expected_ids(db, sort, descending)
+    assert len(set(ids)) == LINKS
+    assert all(len(page['items']) == PAGE_SIZE for page in forward[:-1])
+    assert forward[0]['prev_cursor'] is None
+    assert forward[-1]['next_cursor'] is None
+
+    # From the last page, prev cursors revisit the same pages in reverse
+    backward = walk(db, BEFORE, cursor=forward[-2]['next_cursor'], sort=sort, descending=descending)
+    assert [page_ids(page) for page in backward] == [page_ids(page) for page in reversed(forward)]
+    assert backward[-1]['prev_cursor'] is None
+
+
+def test_walk_with_filter(db):
+    forward = walk(db, AFTER, sort='clicks', descending=True, campaign_types=['Email'])
+    ids = [item_id for page in forward for item_id in page_ids(page)]
+    assert ids == expected_ids(db, 'clicks', True, campaign_type='Email')
+
+    backward = walk(db, BEFORE, cursor=forward[-2]['next_cursor'], sort='clicks', descending=True,
+                    campaign_types=['Email'])
+    assert [page_ids(page) for page in backward] == [page_ids(page) for page in reversed(forward)]
+
+
+def test_invalid_cursor_starts_at_first_page(db):
+    assert decode_cursor('not a cursor') == (AFTER, None)
+    assert decode_cursor(encode_cursor('sideways', [1, 2])) == (AFTER, None)
+    first = db.get_urls_page(limit=PAGE_SIZE, cursor='not a cursor')
+    assert page_ids(first) == page_ids(db.get_urls_page(limit=PAGE_SIZE))
@@ -0,0 +1,42 @@
+"""
+Redirect responses must always be encodable: Location headers are latin-1
+on the wire, so non-ASCII targets are IDNA/percent-encoded first.
+"""
+import asyncio
+
+import pytest
+
+import redirect_server
+from redirect_server import location_header
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('https://example.com/landing?utm_source=mail&x=%20', 'https://example.com/landing?utm_source=mail&x=%20'),
+    ('https://example.com/café?q=ü#tëil', 'https://example.com/caf%C3%A9?q=%C3%BC#t%C3%ABil'),
+    ('https://bücher.example:8443/ä', 'https://xn--bcher-kva.example:8443/%C3%A4'),
+    ('https://user@bücher.example/', 'https://user@xn--bcher-kva.example/'),
+])
+def test_location_header(url, expected):
+    assert location_header(url) == expected
+    location_header(url).encode('latin-1')
+
+
+def test_redirect_to_non_latin1_url(tmp_path, monkeypatch):
+    from database import Database
+    db = Database(str(tmp_path / 'urls.db'))
+    short_code = db.create_short_url('https://例え.jp/パス?q=値', 'unicode-target')
+    monkeypatch.setattr(redirect_server, '_db', db)
+    monkeypatch.setattr(db, 'record_click', lambda *args: None)
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {'type': 'http', 'method': 'GET', 'path': f'/{short_code}', 'query_string': b'', 'headers': []}
+    asyncio.run(redirect_server.app(scope, None, send))
+
+    start = messages[0]
+    assert start['status'] == redirect_server.REDIRECT_STATUS
+    location = dict(start['headers'])[b'location'].decode('ascii')
+    assert location == 'https://xn--r8jz45g.jp/%E3%83%91%E3%82%B9?q=%E5%80%A4'
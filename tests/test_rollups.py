@@ -0,0 +1,128 @@
+"""
+The hourly and daily rollups must match raw analytics after the enrichment
+worker moves clicks from the pending state to their resolved state, and a
+rebuild from analytics must reproduce the incrementally maintained rows.
+"""
+import sqlite3
+
+import pytest
+
+from click_time import IST_SQL_MODIFIER
+from click_writer import ClickWriter
+from database import Database
+from enrichment_worker import EnrichmentWorker
+from rollups import ROLLUP_TABLES, rebuild
+
+# IP -> region answered by the stub lookup; None fails the lookup
+LOOKUPS = {
+    '10.0.0.1': 'Maharashtra',
+    '10.0.0.2': 'Delhi',
+    '10.0.0.3': 'Maharashtra',
+    '10.0.0.9': None
+}
+
+
+class StubIPTracker:
+    """Answers IP lookups from LOOKUPS without the network"""
+
+    def has_offline_index(self) -> bool:
+        return False
+
+    def lookup_ip_details(self, ip_address):
+        region = LOOKUPS.get(ip_address)
+        return {'region': region, 'city': f"{region} City", 'isp': 'Stub ISP'} if region else None
+
+
+class StubGeoService:
+    """Fallback location for local IPs and lookups that gave up"""
+
+    def get_location_from_ip(self, ip_address):
+        return {'country': 'India', 'state': 'Karnataka', 'city': 'Bengaluru', 'isp': 'Fallback ISP'}
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'urls.db'))
+    codes = [db.create_short_url(f"https://example.com/{name}", name) for name in ('alpha', 'beta')]
+    ips = list(LOOKUPS) + ['', '127.0.0.1']
+    events = [{
+        'short_code': codes[n % 2],
+        # Spread clicks over hours on both sides of the IST day boundary
+        'clicked_at': f"2026-03-{10 + n % 3:02d} {(n * 5) % 24:02d}:15:00",
+        'ip_address': ips[n % len(ips)],
+        'device_type': 'Mobile' if n % 3 else 'Desktop',
+        'browser': 'Chrome',
+        'os': 'Android',
+        'referrer': 'https://www.google.com/' if n % 4 else '',
+        'session_id': f"s{n}",
+        'is_bounce': n % 2,
+        'enrichment_status': 'pending'
+    } for n in range(60)]
+    ClickWriter(db.db_path).write_now(events)
+    return db
+
+
+def enrich(db_path):
+    worker = EnrichmentWorker(db_path, batch_size=7, workers=2, max_attempts=1)
+    worker.ip_tracker = StubIPTracker()
+    worker.geo_service = StubGeoService()
+    while worker.run_once():
+        pass
+    return worker
+
+
+def rollup_totals(conn, table, bucket):
+    """Clicks per (campaign, bucket, state) from a rollup table and from raw analytics"""
+    rolled = conn.execute(f"""
+        SELECT u.campaign_name, r.bucket, r.state, SUM(r.clicks)
+        FROM {table} r
+        JOIN urls u ON u.short_code = r.short_code
+        GROUP BY 1, 2, 3
+        HAVING SUM(r.clicks) != 0
+    """).fetchall()
+    raw = conn.execute(f"""
+        SELECT u.campaign_name, {bucket}, COALESCE(a.state, ''), COUNT(*)
+        FROM analytics a
+        JOIN urls u ON u.short_code = a.short_code
+        GROUP BY 1, 2, 3
+    """).fetchall()
+    return sorted(rolled), sorted(raw)
+
+
+def assert_rollups_match(db_path):
+    with sqlite3.connect(db_path) as conn:
+        for table, bucket_format in ROLLUP_TABLES.items():
+            bucket = f"strftime('{bucket_format}', a.clicked_at_epoch, 'unixepoch', '{IST_SQL_MODIFIER}')"
+            rolled, raw = rollup_totals(conn, table, bucket)
+            assert rolled == raw, table
+
+
+def test_rollups_match_analytics_after_enrichment(db):
+    assert_rollups_match(db.db_path)
+    with sqlite3.connect(db.db_path) as conn:
+        assert conn.execute("SELECT DISTINCT state FROM click_rollup_daily").fetchall() == [('',)]
+
+    worker = enrich(db.db_path)
+    assert worker.processed == 60
+    assert worker.failed == 10
+
+    with sqlite3.connect(db.db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM analytics WHERE enrichment_status = 'pending'").fetchone()[0] == 0
+        states = dict(conn.execute("SELECT state, SUM(clicks) FROM click_rollup_daily GROUP BY state HAVING SUM(clicks)"))
+    assert states == {'Maharashtra': 20, 'Delhi': 10, 'Karnataka': 30}
+    assert_rollups_match(db.db_path)
+
+
+def test_rebuild_reproduces_incremental_rollups(db):
+    enrich(db.db_path)
+
+    def snapshot():
+        with sqlite3.connect(db.db_path) as conn:
+            return {
+                table: sorted(conn.execute(f"SELECT * FROM {table} WHERE clicks != 0"))
+                for table in ROLLUP_TABLES
+            }
+
+    incremental = snapshot()
+    rebuild(db.db_path)
+    assert snapshot() == incremental
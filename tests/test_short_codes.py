@@ -0,0 +1,76 @@
+"""
+Short codes must be unique across allocators sharing a database, and the
+keyed permutation must not reveal the sequence behind them.
+"""
+import sqlite3
+import threading
+
+import pytest
+
+from short_codes import ALPHABET, CODE_LENGTH, CODE_SPACE, ShortCodeAllocator, derive_key, encode_code, permute
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    from database import Database
+    return Database(str(tmp_path / 'urls.db')).db_path
+
+
+def test_two_allocators_never_share_codes(db_path):
+    first = ShortCodeAllocator(db_path, block_size=7)
+    second = ShortCodeAllocator(db_path, block_size=5)
+    codes = []
+
+    def allocate(allocator):
+        for _ in range(40):
+            codes.extend(allocator.allocate_many(3))
+
+    threads = [threading.Thread(target=allocate, args=(allocator,)) for allocator in (first, second, first, second)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(codes) == 480
+    assert len(set(codes)) == len(codes)
+    assert all(len(code) == CODE_LENGTH and set(code) <= set(ALPHABET) for code in codes)
+
+
+def test_allocators_share_the_stored_secret(db_path, monkeypatch):
+    monkeypatch.delenv('SHORT_CODE_SECRET', raising=False)
+    first = ShortCodeAllocator(db_path, block_size=3)
+    second = ShortCodeAllocator(db_path, block_size=3)
+    # Both allocators map the sequence with the same key: blocks 0-2 and 3-5
+    assert first.allocate_many(3) + second.allocate_many(3) == [
+        encode_code(n, derive_key(stored_secret(db_path))) for n in range(6)
+    ]
+
+
+def test_existing_codes_are_skipped(db_path, monkeypatch):
+    monkeypatch.setenv('SHORT_CODE_SECRET', 'test-secret')
+    taken = encode_code(1, derive_key('test-secret'))
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("INSERT INTO urls (short_code, original_url, campaign_name) VALUES (?, ?, ?)",
+                     (taken, 'https://example.com/custom', 'custom'))
+
+    allocator = ShortCodeAllocator(db_path, block_size=3)
+    assert taken not in allocator.allocate_many(2)
+    assert allocator.stats()['skipped_collisions'] == 1
+
+
+def test_permutation_depends_on_the_key():
+    key, other_key = derive_key('one'), derive_key('two')
+    sample = range(0, CODE_SPACE, CODE_SPACE // 5000)
+    permuted = [permute(n, key) for n in sample]
+    assert len(set(permuted)) == len(permuted)
+    assert all(0 <= n < CODE_SPACE for n in permuted)
+    assert permuted != [permute(n, other_key) for n in sample]
+
+    # Consecutive numbers must not map to codes a fixed step apart, as an affine scramble would
+    steps = {(permute(n + 1, key) - permute(n, key)) % CODE_SPACE for n in range(50)}
+    assert len(steps) == 50
+
+
+def stored_secret(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT secret FROM code_secret WHERE name = 'urls'").fetchone()[0]
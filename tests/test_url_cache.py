@@ -0,0 +1,60 @@
+"""
+Link edits made by another process must reach this process's url_cache
+within LINKS_VERSION_CHECK_INTERVAL, while clicks must not invalidate it.
+"""
+import sqlite3
+
+import pytest
+
+import database
+from database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    return Database(str(tmp_path / 'urls.db'))
+
+
+def read_links_version(db):
+    with sqlite3.connect(db.db_path) as conn:
+        return conn.execute("SELECT version FROM links_version WHERE id = 1").fetchone()[0]
+
+
+def test_other_process_edit_drops_cached_link(db, monkeypatch):
+    short_code = db.create_short_url('https://example.com/a', 'cache-edit')
+    assert db.get_url_info(short_code)['is_active']
+
+    # Another process deactivates the link; this one never calls invalidate_url_cache
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute("UPDATE urls SET is_active = 0 WHERE short_code = ?", (short_code,))
+
+    monkeypatch.setattr(database, 'LINKS_VERSION_CHECK_INTERVAL', 3600)
+    assert db.get_url_info(short_code)['is_active']
+    assert db.get_cached_url_info(short_code)[0]
+
+    monkeypatch.setattr(database, 'LINKS_VERSION_CHECK_INTERVAL', 0)
+    assert db.get_cached_url_info(short_code) == (False, None)
+    assert not db.get_url_info(short_code)['is_active']
+
+
+def test_other_process_delete_drops_cached_link(db, monkeypatch):
+    short_code = db.create_short_url('https://example.com/b', 'cache-delete')
+    assert db.get_url_info(short_code)
+
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute("DELETE FROM urls WHERE short_code = ?", (short_code,))
+
+    monkeypatch.setattr(database, 'LINKS_VERSION_CHECK_INTERVAL', 0)
+    assert db.get_url_info(short_code) is None
+
+
+def test_clicks_do_not_bump_links_version(db):
+    short_code = db.create_short_url('https://example.com/c', 'cache-clicks')
+    before = read_links_version(db)
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute("""
+            UPDATE urls
+            SET total_clicks = total_clicks + 1, last_clicked = CURRENT_TIMESTAMP, unique_visitors = unique_visitors + 1
+            WHERE short_code = ?
+        """, (short_code,))
+    assert read_links_version(db) == before
@@ -0,0 +1,135 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+_MISSING = object()
+
+
+class _Flight:
+    """An in-progress load that concurrent callers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TTLCache:
+    """Thread-safe bounded LRU cache with per-entry TTL, negative-result caching and single-flight loads"""
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 60.0, negative_ttl: float = 5.0):
+        """Initialize cache limits and counters"""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.loads = 0
+        self.load_errors = 0
+        self.coalesced = 0
+
+    def get(self, key: Hashable, default: Any = _MISSING) -> Any:
+        """Return a cached value, or default (a sentinel if not given) on miss or expiry"""
+        with self._lock:
+            value = self._get_locked(key)
+            return default if value is _MISSING else value
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return a cached value, calling loader once on a miss; concurrent misses share that call"""
+        with self._lock:
+            value = self._get_locked(key)
+            if value is not _MISSING:
+                return value
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            value = loader()
+            self.set(key, value)
+            flight.value = value
+            return value
+        except Exception as e:
+            flight.error = e
+            with self._lock:
+                self.load_errors += 1
+            raise
+        finally:
+            with self._lock:
+                self.loads += 1
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value; None is cached as a negative result with the shorter TTL"""
+        ttl = self.negative_ttl if value is None else self.ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        """Drop a single entry"""
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self.invalidations += len(self._data)
+            self._data.clear()
+
+    def _get_locked(self, key: Hashable) -> Any:
+        """Look up a live entry; the caller must hold the lock"""
+        entry = self._data.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._data[key]
+        self.misses += 1
+        return _MISSING
+
+    def is_missing(self, value: Any) -> bool:
+        """Check whether a get() result was a cache miss"""
+        return value is _MISSING
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups * 100, 2) if lookups else 0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'loads': self.loads,
+                'load_errors': self.load_errors,
+                'coalesced': self.coalesced,
+                'inflight': len(self._inflight)
+            }
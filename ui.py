@@ -1,11 +1,7 @@
 import streamlit as st
-import pandas as pd
 from typing import Dict, Any, List
 from datetime import datetime, timedelta
 import io
-import plotly.express as px
-import qrcode
-from PIL import Image
 import json
 import uuid
 from io import BytesIO
@@ -1,17 +1,10 @@
 import streamlit as st
+from functools import lru_cache
 from styles import get_styles
 from ui_styles import load_ui_styles
 
-def apply_styles():
-    """Apply all styles to the app"""
-    # Apply base styles
-    st.markdown(get_styles(), unsafe_allow_html=True)
-    
-    # Apply UI-specific styles
-    st.markdown(load_ui_styles(), unsafe_allow_html=True)
-    
-    # Enhanced UI Styles
-    st.markdown("""
+# Enhanced UI Styles
+APP_STYLES = """
         <style>
             /* Global Styles */
             .stApp {
@@ -251,7 +244,18 @@ def apply_styles():
                 --vbg-accent: #0891b2;
             }
         </style>
-    """, unsafe_allow_html=True)
+    """
+
+@lru_cache(maxsize=1)
+def page_styles() -> str:
+    """Base, UI-specific and enhanced styles joined once per process"""
+    return get_styles() + load_ui_styles() + APP_STYLES
+
+def apply_styles():
+    """Apply all styles to the app"""
+    # Streamlit drops elements that are not re-emitted, so the styles are
+    # written on every run; only building them is done once
+    st.markdown(page_styles(), unsafe_allow_html=True)
 
 def init_theme():
     """Initialize theme settings"""
@@ -5,12 +5,14 @@ import json
 from dataclasses import dataclass
 from enum import Enum
 import uuid
-from google.analytics.data_v1beta import BetaAnalyticsDataClient
-from google.analytics.data_v1beta.types import RunReportRequest
-import requests
-from user_agents import parse
 import os
 
+from lazy_imports import LazyModule
+
+# Loaded when the first GA4 event is sent / the first journey starts
+requests = LazyModule('requests')
+user_agents = LazyModule('user_agents')
+
 # Setup logging
 logging.basicConfig(
     level=logging.DEBUG,
@@ -66,9 +68,8 @@ class JourneyEvent:
 
 class UserJourneyTracker:
     def __init__(self, db=None):  # Make database parameter optional
-        """Initialize journey tracker"""
+        """Initialize journey tracker (shared by every session, so it keeps no per-user state)"""
         self.db = db
-        self.current_journey = {}
 
     def _send_ga4_event(self, event_name: str, event_params: Dict):
         """Send event to Google Analytics 4"""
@@ -104,7 +105,7 @@ class UserJourneyTracker:
             
             # Parse user agent using user-agents library
             user_agent_string = user_data.get('user_agent', '')
-            user_agent = parse(user_agent_string)
+            user_agent = user_agents.parse(user_agent_string)
             
             # Determine device type with more detailed logging
             device_type = 'Other'
@@ -172,7 +173,8 @@ class UserJourneyTracker:
             logger.error(f"Error starting journey tracking: {e}")
             raise
 
-    def track_event(self, event_type: JourneyEventType, event_name: str, custom_params: Dict = None) -> bool:
+    def track_event(self, event_type: JourneyEventType, event_name: str, custom_params: Dict = None,
+                    session_id: str = None) -> bool:
         """Track a user journey event"""
         try:
             # Create default device and location info
@@ -193,7 +195,7 @@ class UserJourneyTracker:
             }
             
             # Get session ID or create new one
-            session_id = str(uuid.uuid4())
+            session_id = session_id or str(uuid.uuid4())
             
             # Create event data
             event_data = {
@@ -0,0 +1,36 @@
+"""
+Page registry for the dashboard.
+
+Each page is its own module under views/ with a render(shortener) function.
+A page module is imported the first time it is selected and then stays in
+sys.modules, so a rerun only executes the code of the visible page instead
+of redefining every page in app.py.
+"""
+import importlib
+from typing import List
+from views.common import render_header
+
+# Navigation label -> (module under views/, header title or None if the page draws its own)
+PAGES = {
+    "🏠 Dashboard": ('dashboard', "Campaign Dashboard"),
+    "🔗 Create Campaign": ('create_campaign', "Create Campaign"),
+    "📈 Analytics": ('analytics', "Analytics Overview"),
+    "🏢 Organization": ('organization', None),
+    "⚙️ Settings": ('settings', "Settings")
+}
+
+ADMIN_PAGES = {"🏢 Organization"}
+
+
+def page_labels(role: str) -> List[str]:
+    """Navigation labels visible to a user role"""
+    return [label for label in PAGES if role == 'admin' or label not in ADMIN_PAGES]
+
+
+def render_page(label: str, shortener):
+    """Import the selected page on first use and render it"""
+    module_name, title = PAGES[label]
+    page = importlib.import_module(f"{__name__}.{module_name}")
+    if title:
+        render_header(title)
+    page.render(shortener)
@@ -0,0 +1,307 @@
+import streamlit as st
+import logging
+from datetime import datetime, timedelta
+from lazy_imports import LazyModule
+from constants import INDIAN_STATES, METRICS_REFRESH_SECONDS
+from views.common import dashboard_fragment
+from views.panels import dashboard_stats, render_activity_feed, render_campaign_mix, render_insight_cards
+
+pd = LazyModule('pandas')
+px = LazyModule('plotly.express')
+go = LazyModule('plotly.graph_objects')
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+def render(shortener):
+    """Render enhanced analytics dashboard with detailed insights"""
+    # Filters only rerun the filtered section; the panels below show the
+    # dashboard stats and refresh on their own
+    render_filtered_analytics(shortener)
+    render_insight_cards(shortener)
+    render_device_insights(shortener)
+    render_campaign_mix(shortener)
+    render_activity_feed(shortener)
+
+@dashboard_fragment()
+def render_filtered_analytics(shortener):
+    """Render the analytics filters and the metrics, trends and campaign tables they drive"""
+    try:
+        # Filters Section with better styling
+        with st.expander("🔍 Filter Analytics", expanded=False):
+            filter_col1, filter_col2, filter_col3 = st.columns(3)
+        
+            with filter_col1:
+                # Date Range Filter (optional)
+                use_date_filter = st.checkbox("Filter by Date", value=False)
+                if use_date_filter:
+                    date_range = st.date_input(
+                        "Select Date Range",
+                        value=(datetime.now() - timedelta(days=30), datetime.now()),
+                        max_value=datetime.now(),
+                        help="Select date range for analysis"
+                    )
+                else:
+                    date_range = None
+        
+            with filter_col2:
+                # Campaign Filter (optional)
+                use_campaign_filter = st.checkbox("Filter by Campaigns", value=False)
+                if use_campaign_filter:
+                    campaigns = shortener.db.get_campaign_names()
+                    selected_campaigns = st.multiselect(
+                        "Select Campaigns",
+                        campaigns,
+                        placeholder="Choose campaigns",
+                        help="Filter by specific campaigns"
+                    )
+                else:
+                    selected_campaigns = None
+        
+            with filter_col3:
+                # State Filter (optional)
+                use_state_filter = st.checkbox("Filter by States", value=False)
+                if use_state_filter:
+                    selected_states = st.multiselect(
+                        "Select States",
+                        INDIAN_STATES,
+                        placeholder="Choose states",
+                        help="Filter by geographic location"
+                    )
+                else:
+                    selected_states = None
+
+        # Get analytics data based on filters
+        analytics_data = shortener.db.get_analytics_summary(
+            start_date=date_range[0] if use_date_filter and date_range else None,
+            end_date=date_range[1] if use_date_filter and date_range else None,
+            campaigns=selected_campaigns if use_campaign_filter else None,
+            states=selected_states if use_state_filter else None
+        )
+
+        # Show active filters if any
+        active_filters = []
+        if use_date_filter and date_range:
+            active_filters.append(f"📅 Date: {date_range[0].strftime('%Y-%m-%d')} to {date_range[1].strftime('%Y-%m-%d')}")
+        if use_campaign_filter and selected_campaigns:
+            active_filters.append(f"🎯 Campaigns: {len(selected_campaigns)} selected")
+        if use_state_filter and selected_states:
+            active_filters.append(f"📍 States: {len(selected_states)} selected")
+    
+        if active_filters:
+            st.markdown("**Active Filters:** " + " | ".join(active_filters))
+
+        # Key Metrics Section
+        st.markdown("### 📈 Key Performance Metrics")
+    
+        metrics_col1, metrics_col2, metrics_col3, metrics_col4 = st.columns(4)
+        with metrics_col1:
+            st.metric(
+                "Total Clicks",
+                analytics_data.get('total_clicks', 0),
+                help="Total number of clicks"
+            )
+        with metrics_col2:
+            st.metric(
+                "Unique Visitors",
+                analytics_data.get('unique_visitors', 0),
+                help="Number of unique visitors"
+            )
+        with metrics_col3:
+            st.metric(
+                "Active Days",
+                analytics_data.get('active_days', 0),
+                help="Days with recorded activity"
+            )
+        with metrics_col4:
+            engagement = analytics_data.get('engagement_rate', 0)
+            st.metric(
+                "Engagement Rate",
+                f"{engagement:.1f}%",
+                help="Unique visitors / Total clicks"
+            )
+
+        # Trends Analysis Section
+        st.markdown("### 📊 Performance Analysis")
+    
+        trend_tab1, trend_tab2 = st.tabs(["📈 Click Trends", "🗺️ Geographic Distribution"])
+    
+        with trend_tab1:
+            if analytics_data.get('daily_stats'):
+                df_daily = pd.DataFrame(list(analytics_data['daily_stats'].items()), 
+                                      columns=['Date', 'Clicks'])
+                df_daily['7_Day_MA'] = df_daily['Clicks'].rolling(window=7).mean()
+            
+                fig = go.Figure()
+                fig.add_trace(go.Scatter(
+                    x=df_daily['Date'],
+                    y=df_daily['Clicks'],
+                    name='Daily Clicks',
+                    mode='lines',
+                    line=dict(color='#0891b2')
+                ))
+                fig.add_trace(go.Scatter(
+                    x=df_daily['Date'],
+                    y=df_daily['7_Day_MA'],
+                    name='7-Day Average',
+                    line=dict(color='#f59e0b', dash='dash')
+                ))
+                fig.update_layout(
+                    title='Click Trends',
+                    xaxis_title='Date',
+                    yaxis_title='Clicks',
+                    hovermode='x unified'
+                )
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("No click data available for the selected filters")
+
+        with trend_tab2:
+            if analytics_data.get('state_stats'):
+                df_state = pd.DataFrame(list(analytics_data['state_stats'].items()),
+                                      columns=['State', 'Visits'])
+                df_state = df_state.sort_values('Visits', ascending=True)
+            
+                fig = px.bar(
+                    df_state,
+                    x='Visits',
+                    y='State',
+                    orientation='h',
+                    title='Geographic Distribution',
+                    color='Visits',
+                    color_continuous_scale='Viridis'
+                )
+                fig.update_layout(height=400)
+                st.plotly_chart(fig, use_container_width=True)
+            
+                # State metrics table
+                st.markdown("#### State-wise Metrics")
+                df_state['Percentage'] = (df_state['Visits'] / df_state['Visits'].sum() * 100)
+                st.dataframe(
+                    df_state,
+                    column_config={
+                        "State": "State",
+                        "Visits": st.column_config.NumberColumn("Visits", format="%d"),
+                        "Percentage": st.column_config.NumberColumn("% of Total", format="%.1f%%")
+                    },
+                    hide_index=True,
+                    use_container_width=True
+                )
+            else:
+                st.info("No geographic data available for the selected filters")
+
+        # Campaign Performance Section
+        st.markdown("### 🎯 Campaign Performance")
+    
+        if analytics_data.get('campaign_stats'):
+            df_campaigns = pd.DataFrame(analytics_data['campaign_stats'])
+            st.dataframe(
+                df_campaigns,
+                column_config={
+                    "campaign_name": "Campaign",
+                    "total_clicks": st.column_config.NumberColumn("Total Clicks"),
+                    "unique_visitors": st.column_config.NumberColumn("Unique Visitors"),
+                    "conversion_rate": st.column_config.NumberColumn("Conversion Rate", format="%.2f%%"),
+                    "avg_time_on_page": "Avg. Time",
+                    "bounce_rate": st.column_config.NumberColumn("Bounce Rate", format="%.2f%%")
+                },
+                hide_index=True,
+                use_container_width=True
+            )
+        else:
+            st.info("No campaign data available for the selected filters")
+
+    except Exception as e:
+        logger.error(f"Error rendering analytics: {str(e)}")
+        st.error("Error loading dashboard data. Please try refreshing the page.")
+
+@dashboard_fragment(run_every=METRICS_REFRESH_SECONDS)
+def render_device_insights(shortener):
+    """Render device and browser charts next to the engagement metrics"""
+    try:
+        stats = dashboard_stats(shortener)
+        # Device Analytics and Campaign Distribution
+        st.markdown("### 📱 Analytics Overview")
+    
+        # First row - Device and Browser stats
+        device_cols = st.columns(2)
+        with device_cols[0]:
+            # Combined Device and Browser Stats
+            if stats.get('device_stats') and stats.get('browser_stats'):
+                # Create tabs for different views
+                device_tabs = st.tabs(["📱 Devices", "🌐 Browsers"])
+            
+                with device_tabs[0]:
+                    device_df = pd.DataFrame(list(stats['device_stats'].items()), 
+                                        columns=['Device', 'Count'])
+                    fig = px.pie(
+                        device_df,
+                        values='Count',
+                        names='Device',
+                        title='Device Distribution',
+                        color_discrete_sequence=['#10B981', '#3B82F6', '#8B5CF6', '#F59E0B'],
+                        hole=0.4
+                    )
+                    fig.update_traces(textposition='outside', textinfo='percent+label')
+                    fig.update_layout(
+                        showlegend=True,
+                        height=400,
+                        margin=dict(t=30, b=0, l=0, r=0)
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
+            
+                with device_tabs[1]:
+                    browser_df = pd.DataFrame(list(stats['browser_stats'].items()),
+                                            columns=['Browser', 'Count'])
+                    fig = px.pie(
+                        browser_df,
+                        values='Count',
+                        names='Browser',
+                        title='Browser Distribution',
+                        color_discrete_sequence=['#3B82F6', '#8B5CF6', '#F59E0B', '#10B981'],
+                        hole=0.4
+                    )
+                    fig.update_traces(textposition='outside', textinfo='percent+label')
+                    fig.update_layout(
+                        showlegend=True,
+                        height=400,
+                        margin=dict(t=30, b=0, l=0, r=0)
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("No device/browser data available yet")
+
+        with device_cols[1]:
+            # Campaign Performance Metrics
+            st.markdown("#### Campaign Insights")
+        
+            # Engagement Metrics as regular metrics
+            st.metric(
+                "Avg. Time on Page",
+                f"{stats.get('avg_time', 0):.1f}s",
+                delta="+12%",
+                help="Average time users spend on landing pages"
+            )
+            st.metric(
+                "Bounce Rate",
+                f"{stats.get('bounce_rate', 0):.1f}%",
+                delta="-5%",
+                delta_color="inverse",
+                help="Percentage of single-page visits"
+            )
+            st.metric(
+                "CTR",
+                f"{(stats.get('total_clicks', 0) / max(1, stats.get('impressions', 1)) * 100):.1f}%",
+                delta="+8%",
+                help="Click-through rate"
+            )
+            st.metric(
+                "Conversion Rate",
+                f"{stats.get('conversion_rate', 0):.1f}%",
+                delta="+15%",
+                help="Percentage of visitors who complete desired actions"
+            )
+
+    except Exception as e:
+        logger.error(f"Error rendering analytics: {str(e)}")
+        st.error("Error loading dashboard data. Please try refreshing the page.")
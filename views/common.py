@@ -0,0 +1,49 @@
+import streamlit as st
+import functools
+from typing import Callable, Optional, Dict, Any
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+def dashboard_fragment(run_every: Optional[float] = None) -> Callable:
+    """Turn a panel taking the shortener into a fragment that reruns on its own"""
+    def decorate(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def panel(shortener, *args, **kwargs):
+            # A fragment-only rerun skips main(), where the per-run read memo
+            # is reset, so start a fresh one here to read current data
+            ctx = get_script_run_ctx()
+            if ctx is not None and ctx.fragment_ids_this_run and hasattr(shortener.db, 'begin_run'):
+                shortener.db.begin_run()
+            return func(shortener, *args, **kwargs)
+        return st.fragment(panel, run_every=run_every or None)
+    return decorate
+
+def page_cursor(state_key: str, filters: tuple) -> Optional[str]:
+    """Get the saved cursor of a paginated table, back to the first page when its filters change"""
+    if st.session_state.get(f"{state_key}_filters") != filters:
+        st.session_state[f"{state_key}_filters"] = filters
+        st.session_state[f"{state_key}_cursor"] = None
+    return st.session_state.get(f"{state_key}_cursor")
+
+def set_page_cursor(state_key: str, cursor: Optional[str]):
+    """Move a paginated table to the page at cursor"""
+    st.session_state[f"{state_key}_cursor"] = cursor
+
+def render_page_controls(state_key: str, page: Dict[str, Any]):
+    """Render previous/next buttons for a paginated table"""
+    # Callbacks run before the rerun the click triggers, which stays inside
+    # the table's fragment when it has one
+    prev_col, _, next_col = st.columns([1, 4, 1])
+    with prev_col:
+        st.button("← Previous", key=f"{state_key}_prev", disabled=not page['prev_cursor'],
+                  on_click=set_page_cursor, args=(state_key, page['prev_cursor']))
+    with next_col:
+        st.button("Next →", key=f"{state_key}_next", disabled=not page['next_cursor'],
+                  on_click=set_page_cursor, args=(state_key, page['next_cursor']))
+
+def render_header(title: str):
+    """Render a consistent header with deep green styling"""
+    st.markdown(f"""
+        <div class="main-header">
+            <h1>{title}</h1>
+        </div>
+    """, unsafe_allow_html=True)
@@ -0,0 +1,408 @@
+import streamlit as st
+import logging
+import time
+from datetime import datetime
+from io import BytesIO, TextIOWrapper
+from lazy_imports import LazyModule
+from bulk_import import parse_rows
+from constants import BASE_URL, CAMPAIGN_PAGE_SIZE, CAMPAIGN_TYPES
+from views.common import dashboard_fragment, page_cursor, render_page_controls
+
+pd = LazyModule('pandas')
+qrcode = LazyModule('qrcode')
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+def render(shortener):
+    """Create new campaign form"""
+    st.markdown("### 🎯 Campaign Details")
+    
+    # Add custom CSS for green button
+    st.markdown("""
+        <style>
+        div.stButton > button[kind="primary"] {
+            background-color: #10B981;
+            border-color: #10B981;
+        }
+        div.stButton > button[kind="primary"]:hover {
+            background-color: #059669;
+            border-color: #059669;
+        }
+        div.stButton > button[kind="primary"]:active {
+            background-color: #047857;
+            border-color: #047857;
+        }
+        </style>
+    """, unsafe_allow_html=True)
+    
+    with st.form("create_campaign", clear_on_submit=True):
+        # Campaign Info Section
+        st.markdown("#### Basic Information")
+        campaign_name = st.text_input(
+            "Campaign Name",
+            key="campaign_name",
+            placeholder="Enter campaign name",
+            help="A unique name for your campaign"
+        )
+        
+        campaign_type = st.selectbox(
+            "Campaign Type",
+            options=list(CAMPAIGN_TYPES.keys()),
+            format_func=lambda x: f"{CAMPAIGN_TYPES[x]} {x}",
+            help="Select the type of campaign"
+        )
+        
+        original_url = st.text_input(
+            "Original URL",
+            key="original_url",
+            placeholder="https://your-url.com",
+            help="The URL you want to shorten"
+        )
+
+        # Add QR Code option
+        generate_qr = st.checkbox("Generate QR Code", value=False, help="Create a QR code for this link")
+
+        # UTM Parameters Section
+        st.markdown("#### 🎯 UTM Parameters")
+        with st.expander("Configure UTM Parameters", expanded=True):
+            col1, col2 = st.columns(2)
+            with col1:
+                utm_source = st.text_input(
+                    "Source",
+                    placeholder="e.g., facebook",
+                    help="The referrer (e.g., facebook, newsletter)"
+                )
+                utm_campaign = st.text_input(
+                    "Campaign",
+                    placeholder="e.g., summer_sale",
+                    help="Campaign specific identifier"
+                )
+            with col2:
+                utm_medium = st.text_input(
+                    "Medium",
+                    placeholder="e.g., social",
+                    help="Marketing medium (e.g., cpc, social)"
+                )
+                utm_content = st.text_input(
+                    "Content",
+                    placeholder="e.g., blue_banner",
+                    help="Use to differentiate ads"
+                )
+
+        # Submit button
+        submitted = st.form_submit_button(
+            "Create Campaign",
+            type="primary",
+            use_container_width=True
+        )
+
+    if submitted:
+        if not campaign_name or not original_url:
+            st.error("Please fill in all required fields")
+            return
+
+        try:
+            # Create campaign
+            short_code = shortener.create_short_url(
+                url=original_url,
+                campaign_name=campaign_name,
+                campaign_type=campaign_type,
+                utm_params={
+                    'source': utm_source,
+                    'medium': utm_medium,
+                    'campaign': utm_campaign,
+                    'content': utm_content
+                }
+            )
+            
+            # Generate short URL
+            short_url = f"{BASE_URL}?r={short_code}"
+            
+            # Show success message with two cards side by side
+            st.success("Campaign created successfully!")
+
+            col1, col2 = st.columns(2)
+
+            # Short URL Card
+            with col1:
+                st.markdown("""
+                <div style='
+                    background-color: #f0f9ff;
+                    padding: 1rem;
+                    border-radius: 0.5rem;
+                    margin: 1rem 0;
+                    height: 100%;
+                    border: 1px solid #e2e8f0;
+                    box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+                '>
+                    <div style='display: flex; align-items: center; margin-bottom: 0.5rem;'>
+                        <span style='font-size: 1.25rem; margin-right: 0.5rem;'>🔗</span>
+                        <span style='font-weight: 600; color: #1a202c;'>Short URL</span>
+                    </div>
+                    <a href='{url}' target='_blank' style='color: #0891b2; text-decoration: none; word-break: break-all;'>{url}</a>
+                    <p style='margin-top: 0.5rem; font-size: 0.875rem; color: #64748b;'>
+                        Click to test the link and track analytics
+                    </p>
+                    <div style='display: flex; gap: 0.5rem; margin-top: 1rem;'>
+                        <a href="{url}" target="_blank" style='
+                            background-color: #0891b2;
+                            color: white;
+                            padding: 0.5rem 1rem;
+                            border-radius: 0.375rem;
+                            text-decoration: none;
+                            font-size: 0.875rem;
+                        '>Open Link</a>
+                    </div>
+                </div>
+                """.format(url=short_url), unsafe_allow_html=True)
+
+            # Campaign Details Card with QR Code
+            with col2:
+                st.markdown("""
+                <div style='
+                    background-color: #f0f9ff;
+                    padding: 1rem;
+                    border-radius: 0.5rem;
+                    margin: 1rem 0;
+                    height: 100%;
+                    border: 1px solid #e2e8f0;
+                    box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+                '>
+                    <div style='display: flex; align-items: center; margin-bottom: 0.5rem;'>
+                        <span style='font-size: 1.25rem; margin-right: 0.5rem;'>📱</span>
+                        <span style='font-weight: 600; color: #1a202c;'>Campaign Details</span>
+                    </div>
+                    <div style='font-size: 0.875rem; color: #4b5563;'>
+                        <p style='margin: 0.25rem 0;'><strong>Campaign:</strong> {name}</p>
+                        <p style='margin: 0.25rem 0;'><strong>Type:</strong> {type}</p>
+                        <p style='margin: 0.25rem 0;'><strong>Created:</strong> {date}</p>
+                    </div>
+                """.format(
+                    name=campaign_name,
+                    type=campaign_type,
+                    date=datetime.now().strftime("%b %d, %Y")
+                ), unsafe_allow_html=True)
+
+                # Generate and display QR code if requested
+                if generate_qr:
+                    qr = qrcode.QRCode(
+                        version=1,
+                        error_correction=qrcode.constants.ERROR_CORRECT_L,
+                        box_size=10,
+                        border=4,
+                    )
+                    qr.add_data(short_url)
+                    qr.make(fit=True)
+
+                    # Create QR code image
+                    img = qr.make_image(fill_color="black", back_color="white")
+                    
+                    # Convert to bytes
+                    img_bytes = BytesIO()
+                    img.save(img_bytes, format='PNG')
+                    
+                    # Display QR code
+                    st.image(img_bytes, caption="Scan QR Code", width=200)
+                
+                st.markdown("""
+                    <div style='display: flex; gap: 0.5rem; margin-top: 1rem;'>
+                        <button onclick="navigator.clipboard.writeText('{url}')" style='
+                            background-color: #0891b2;
+                            color: white;
+                            padding: 0.5rem 1rem;
+                            border-radius: 0.375rem;
+                            border: none;
+                            cursor: pointer;
+                            font-size: 0.875rem;
+                        '>Copy Link</button>
+                    </div>
+                </div>
+                """.format(url=short_url), unsafe_allow_html=True)
+
+            # Test click button
+            if st.button("Test Click (Record Only)", type="secondary"):
+                if shortener.db.record_click(
+                    short_code=short_code,
+                    ip_address="127.0.0.1",
+                    user_agent="Test Click",
+                    referrer="Test",
+                    state="Test",
+                    device_type="Test",
+                    browser="Test",
+                    os="Test"
+                ):
+                    st.success("Test click recorded! Check the analytics.")
+                    time.sleep(1)
+                    st.rerun()
+
+        except ValueError as e:
+            st.error(str(e))
+        except Exception as e:
+            st.error(f"Error creating campaign: {str(e)}")
+
+    # Bulk import section
+    with st.expander("📤 Bulk Import from CSV"):
+        st.caption("Columns: url, campaign_name, and optionally campaign_type, utm_source, utm_medium, utm_campaign, utm_content, utm_term")
+        uploaded_file = st.file_uploader("Upload CSV", type=["csv"], key="bulk_import_file")
+        if uploaded_file is not None and st.button("Import Links", type="primary"):
+            try:
+                rows = parse_rows(TextIOWrapper(uploaded_file, encoding='utf-8-sig'))
+                with st.spinner("Creating links..."):
+                    result = shortener.db.create_short_urls_bulk(rows)
+
+                created, errors = result['created'], result['errors']
+                if created:
+                    st.success(f"Created {len(created)} links")
+                    created_df = pd.DataFrame(created)
+                    created_df['short_url'] = created_df['short_code'].apply(lambda x: f"{BASE_URL}?r={x}")
+                    st.download_button(
+                        "Download Created Links",
+                        created_df.to_csv(index=False),
+                        file_name="created_links.csv",
+                        mime="text/csv"
+                    )
+                if errors:
+                    st.warning(f"{len(errors)} rows were rejected")
+                    st.dataframe(pd.DataFrame(errors), use_container_width=True, hide_index=True)
+            except Exception as e:
+                st.error(f"Error importing links: {str(e)}")
+
+    # Add Campaign Manager Section below the form
+    render_campaign_table(shortener)
+
+@dashboard_fragment()
+def render_campaign_table(shortener):
+    """Render the filterable, editable campaign table"""
+    # Filtering, paging and edits rerun only this table, not the form above
+    st.markdown("---")  # Add a divider
+    st.markdown("### 📋 Manage Campaigns")
+    
+    # Add quick filters in a single row
+    filter_col1, filter_col2, filter_col3 = st.columns(3)
+    with filter_col1:
+        campaign_type_filter = st.selectbox(
+            "Filter by Type",
+            ["All Types"] + list(CAMPAIGN_TYPES.keys())
+        )
+    with filter_col2:
+        status_filter = st.selectbox(
+            "Filter by Status",
+            ["All", "Active", "Inactive"]
+        )
+    with filter_col3:
+        search = st.text_input("Search Campaigns", placeholder="Search by name...")
+    
+    # Filters run in the database, one page at a time
+    filters = (campaign_type_filter, status_filter, search)
+    page = shortener.db.get_urls_page(
+        limit=CAMPAIGN_PAGE_SIZE,
+        cursor=page_cursor("campaign_table", filters),
+        search=search,
+        campaign_types=None if campaign_type_filter == "All Types" else [campaign_type_filter],
+        is_active=None if status_filter == "All" else status_filter == "Active"
+    )
+    campaigns = page['items']
+    
+    if not campaigns:
+        st.info("No campaigns yet. Create your first campaign above!")
+        return
+    
+    # Create DataFrame for campaign data
+    df = pd.DataFrame(campaigns)
+    
+    # Convert datetime strings to datetime objects
+    df['created_at'] = pd.to_datetime(df['created_at'])
+    df['last_clicked'] = pd.to_datetime(df['last_clicked'])
+    
+    # Add short URL column
+    df['short_url'] = df['short_code'].apply(lambda x: f"{BASE_URL}?r={x}")
+    filtered_df = df.copy()
+    
+    # Configure columns for the data editor
+    columns_config = {
+        "campaign_name": st.column_config.TextColumn(
+            "Campaign Name",
+            width="medium",
+            help="Name of the campaign"
+        ),
+        "campaign_type": st.column_config.SelectboxColumn(
+            "Type",
+            width="small",
+            options=list(CAMPAIGN_TYPES.keys())
+        ),
+        "short_url": st.column_config.LinkColumn(
+            "Short URL",
+            width="medium",
+            help="Click to open"
+        ),
+        "original_url": st.column_config.LinkColumn(
+            "Original URL",
+            width="medium"
+        ),
+        "total_clicks": st.column_config.NumberColumn(
+            "Clicks",
+            width="small",
+            help="Total number of clicks",
+            format="%d"
+        ),
+        "created_at": st.column_config.DatetimeColumn(
+            "Created",
+            width="medium",
+            format="MMM DD, YYYY"
+        ),
+        "last_clicked": st.column_config.DatetimeColumn(
+            "Last Click",
+            width="medium",
+            format="MMM DD, YYYY"
+        ),
+        "is_active": st.column_config.CheckboxColumn(
+            "Active",
+            width="small"
+        )
+    }
+    
+    # Display editable table
+    edited_df = st.data_editor(
+        filtered_df,
+        column_config=columns_config,
+        use_container_width=True,
+        hide_index=True,
+        num_rows="dynamic",
+        key="campaign_table",
+        disabled=["short_url", "original_url", "total_clicks", "created_at", "last_clicked"],
+        column_order=[
+            "campaign_name",
+            "campaign_type",
+            "short_url",
+            "original_url",
+            "total_clicks",
+            "created_at",
+            "last_clicked",
+            "is_active"
+        ]
+    )
+    render_page_controls("campaign_table", page)
+    
+    # Handle edits
+    if not filtered_df.equals(edited_df):
+        try:
+            # Get the changed rows
+            changed_mask = (filtered_df != edited_df).any(axis=1)
+            changed_rows = edited_df[changed_mask]
+            
+            for idx, row in changed_rows.iterrows():
+                # Update campaign in database
+                shortener.db.update_campaign(
+                    short_code=df.loc[idx, 'short_code'],
+                    campaign_name=row['campaign_name'],
+                    campaign_type=row['campaign_type'],
+                    is_active=row['is_active']
+                )
+            
+            st.success("Campaign(s) updated successfully!")
+            time.sleep(1)
+            st.rerun(scope="fragment")
+            
+        except Exception as e:
+            st.error(f"Error updating campaign(s): {str(e)}")
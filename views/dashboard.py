@@ -0,0 +1,262 @@
+import streamlit as st
+import logging
+from datetime import datetime
+from lazy_imports import LazyModule
+from constants import BASE_URL, CAMPAIGN_TYPES, METRICS_REFRESH_SECONDS
+from views.common import dashboard_fragment
+from views.panels import dashboard_stats, render_activity_feed, render_campaign_mix, render_insight_cards
+
+pd = LazyModule('pandas')
+px = LazyModule('plotly.express')
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+def render(shortener):
+    """Render the main dashboard with enhanced details"""
+    # Each panel is a fragment, so an interaction or refresh timer only
+    # reruns the panel it belongs to
+    render_key_metrics(shortener)
+    render_quick_actions(shortener)
+    render_insight_cards(shortener)
+    render_device_charts(shortener)
+    render_campaign_mix(shortener)
+    render_activity_feed(shortener)
+
+@dashboard_fragment(run_every=METRICS_REFRESH_SECONDS)
+def render_key_metrics(shortener):
+    """Render the headline metric cards"""
+    try:
+        stats = dashboard_stats(shortener)
+        # Main Metrics Display
+        st.markdown("### 📊 Key Metrics")
+        metric_cols = st.columns(4)
+        
+        with metric_cols[0]:
+            st.markdown(f"""
+                <div class="metric-card">
+                    <div class="metric-title">
+                        <span class="metric-icon">👆</span>
+                        Total Clicks
+                    </div>
+                    <div class="metric-value">
+                        {stats.get('total_clicks', 0):,}
+                        <span class="unit">clicks</span>
+                    </div>
+                </div>
+            """, unsafe_allow_html=True)
+
+        with metric_cols[1]:
+            st.markdown(f"""
+                <div class="metric-card">
+                    <div class="metric-title">
+                        <span class="metric-icon">👥</span>
+                        Unique Users
+                    </div>
+                    <div class="metric-value">
+                        {stats.get('unique_visitors', 0):,}
+                        <span class="unit">users</span>
+                    </div>
+                </div>
+            """, unsafe_allow_html=True)
+
+        with metric_cols[2]:
+            st.markdown(f"""
+                <div class="metric-card">
+                    <div class="metric-title">
+                        <span class="metric-icon">📈</span>
+                        Conversion Rate
+                    </div>
+                    <div class="metric-value">
+                        {stats.get('conversion_rate', 0):.1f}
+                        <span class="unit">%</span>
+                    </div>
+                </div>
+            """, unsafe_allow_html=True)
+
+        with metric_cols[3]:
+            st.markdown(f"""
+                <div class="metric-card">
+                    <div class="metric-title">
+                        <span class="metric-icon">⚡</span>
+                        Active Campaigns
+                    </div>
+                    <div class="metric-value">
+                        {stats.get('active_campaigns', 0)}
+                        <span class="unit">active</span>
+                    </div>
+                </div>
+            """, unsafe_allow_html=True)
+
+    except Exception as e:
+        logger.error(f"Error rendering dashboard: {str(e)}")
+        st.error("Error loading dashboard data. Please try refreshing the page.")
+
+@dashboard_fragment()
+def render_quick_actions(shortener):
+    """Render the new campaign, export and quick link actions"""
+    try:
+        # Quick Actions Bar with Quick Link
+        quick_action_cols = st.columns(3)
+        with quick_action_cols[0]:
+            if st.button("New Campaign", key="new_campaign", use_container_width=True):
+                st.session_state.page = "create_campaign"
+                
+        with quick_action_cols[1]:
+            if st.button("Export Report", key="export_report", use_container_width=True):
+                export_analytics(shortener)
+
+        with quick_action_cols[2]:
+            # Quick Link expander - closed by default
+            with st.expander("Create Quick Link", expanded=False):
+                with st.form("quick_link_form", clear_on_submit=True):
+                    quick_url = st.text_input("URL to Shorten", placeholder="https://")
+                    quick_submitted = st.form_submit_button("Create Quick Link", use_container_width=True)
+                    if quick_submitted and quick_url:
+                        try:
+                            short_code = shortener.create_short_url(quick_url, "Quick Link")
+                            if short_code:
+                                st.success(f"Short URL created: {BASE_URL}?r={short_code}")
+                        except Exception as e:
+                            st.error(f"Error creating short URL: {str(e)}")
+
+    except Exception as e:
+        logger.error(f"Error rendering dashboard: {str(e)}")
+        st.error("Error loading dashboard data. Please try refreshing the page.")
+
+@dashboard_fragment()
+def render_device_charts(shortener):
+    """Render the device and browser distribution charts"""
+    try:
+        stats = dashboard_stats(shortener)
+        # Device Analytics and Campaign Distribution
+        st.markdown("### 📱 Analytics Overview")
+        
+        # First row - Device and Browser stats
+        device_cols = st.columns(2)
+        with device_cols[0]:
+            # Combined Device and Browser Stats
+            if stats.get('device_stats'):
+                device_df = pd.DataFrame(list(stats['device_stats'].items()), 
+                                    columns=['Device', 'Count'])
+                fig = px.pie(
+                    device_df,
+                    values='Count',
+                    names='Device',
+                    title='Device Distribution',
+                    color_discrete_sequence=['#10B981', '#3B82F6', '#8B5CF6', '#F59E0B'],
+                    hole=0.4
+                )
+                fig.update_traces(textposition='outside', textinfo='percent+label')
+                fig.update_layout(
+                    showlegend=True,
+                    height=400,
+                    margin=dict(t=30, b=0, l=0, r=0)
+                )
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("No device data available yet")
+
+        with device_cols[1]:
+            if stats.get('browser_stats'):
+                browser_df = pd.DataFrame(list(stats['browser_stats'].items()),
+                                        columns=['Browser', 'Count'])
+                fig = px.pie(
+                    browser_df,
+                    values='Count',
+                    names='Browser',
+                    title='Browser Distribution',
+                    color_discrete_sequence=['#3B82F6', '#8B5CF6', '#F59E0B', '#10B981'],
+                    hole=0.4
+                )
+                fig.update_traces(textposition='outside', textinfo='percent+label')
+                fig.update_layout(
+                    showlegend=True,
+                    height=400,
+                    margin=dict(t=30, b=0, l=0, r=0)
+                )
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("No browser data available yet")
+
+    except Exception as e:
+        logger.error(f"Error rendering dashboard: {str(e)}")
+        st.error("Error loading dashboard data. Please try refreshing the page.")
+
+def export_analytics(shortener):
+    """Export analytics data to CSV"""
+    stats = shortener.db.get_dashboard_stats()
+    
+    # Create DataFrame for export
+    export_data = pd.DataFrame(stats['top_campaigns'])
+    
+    # Add timestamp to filename
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"campaign_analytics_{timestamp}.csv"
+    
+    # Convert to CSV
+    csv = export_data.to_csv(index=False)
+    
+    # Create download button
+    st.download_button(
+        label="📥 Download CSV",
+        data=csv,
+        file_name=filename,
+        mime="text/csv"
+    )
+
+def show_quick_link_creator(shortener):
+    """Show quick link creation form"""
+    with st.form("quick_link"):
+        url = st.text_input("Enter URL")
+        campaign_name = st.text_input("Campaign Name (Optional)")
+        submitted = st.form_submit_button("Create Link")
+        
+        if submitted and url:
+            short_code = shortener.create_short_url(
+                url=url,
+                campaign_name=campaign_name or f"Quick_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            )
+            st.success(f"Short URL created: {BASE_URL}?r={short_code}")
+
+def render_activity_item(activity: dict):
+    """Render a single activity item with enhanced styling"""
+    try:
+        # Format timestamp
+        try:
+            timestamp = datetime.strptime(activity['clicked_at'], '%Y-%m-%d %H:%M:%S')
+            formatted_time = timestamp.strftime('%b %d, %Y %I:%M %p')
+        except:
+            formatted_time = str(activity.get('clicked_at', 'Unknown'))
+        
+        campaign_emoji = CAMPAIGN_TYPES.get(activity.get('campaign_type', 'Other'), '🔗')
+        device_emoji = {
+            "Desktop": "💻",
+            "Mobile": "📱",
+            "Tablet": "📱",
+            "Unknown": "❓"
+        }.get(activity.get('device_type', 'Unknown'), '❓')
+        
+        st.markdown(f"""
+            <div class="activity-item">
+                <div style="display: flex; justify-content: space-between; align-items: center;">
+                    <div style="display: flex; align-items: center; gap: 0.5rem;">
+                        <span style="font-size: 1.5rem;">{campaign_emoji}</span>
+                        <div>
+                            <div style="font-weight: 600; color: #0891b2;">
+                                {activity.get('campaign_name', 'Unknown Campaign')}
+                            </div>
+                            <div style="display: flex; gap: 1rem; color: #64748b; font-size: 0.875rem;">
+                                <span>{device_emoji} {activity.get('device_type', 'Unknown')}</span>
+                                <span>📍 {activity.get('state', 'Unknown')}</span>
+                            </div>
+                        </div>
+                    </div>
+                    <div style="color: #94a3b8; font-size: 0.875rem;">
+                        {formatted_time}
+                    </div>
+                </div>
+            </div>
+        """, unsafe_allow_html=True)
+    except Exception as e:
+        logger.error(f"Error rendering activity item: {str(e)}")
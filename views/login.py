@@ -0,0 +1,49 @@
+import streamlit as st
+import logging
+import time
+from services import get_auth
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+def render():
+    """Render the login page"""
+    st.markdown("""
+        <div class="login-container">
+            <div class="login-header">
+                <h1>🎯 Campaign Dashboard</h1>
+                <p>Sign in to your account</p>
+            </div>
+        </div>
+    """, unsafe_allow_html=True)
+
+    col1, col2, col3 = st.columns([1,2,1])
+    with col2:
+        with st.form("login_form"):
+            username = st.text_input("Username")
+            password = st.text_input("Password", type="password")
+            submitted = st.form_submit_button("Sign In", use_container_width=True)
+
+            if submitted:
+                if username and password:
+                    user_data = get_auth().login(username, password)
+                    if user_data:
+                        # Store user data in session state
+                        st.session_state.user = user_data
+                        st.success("Login successful!")
+                        time.sleep(1)  # Give time for success message
+                        st.rerun()
+                    else:
+                        st.error("Invalid username or password")
+                        logger.warning(f"Failed login attempt for user: {username}")
+                else:
+                    st.error("Please enter both username and password")
+
+        # Show demo credentials
+        st.markdown("""
+            <div style="text-align: center; margin-top: 2rem;">
+                <p style="color: #666;">Demo Credentials:</p>
+                <p>Admin: admin / admin123</p>
+                <p>User: nandan / nandan123</p>
+            </div>
+        """, unsafe_allow_html=True)
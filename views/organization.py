@@ -0,0 +1,3 @@
+def render(shortener):
+    """Render the organization settings page"""
+    shortener.organization.render_organization_settings()
@@ -0,0 +1,209 @@
+"""
+Dashboard panels shared by the dashboard and analytics pages.
+
+Every panel is a fragment: a widget inside it, or its refresh timer, reruns
+only that panel. Panels read the server-wide cached dashboard stats, so a
+timed refresh costs one data-version check until clicks arrive.
+"""
+import streamlit as st
+import logging
+from typing import Dict, Any
+from lazy_imports import LazyModule
+from constants import METRICS_REFRESH_SECONDS, ACTIVITY_REFRESH_SECONDS
+from views.common import dashboard_fragment
+
+pd = LazyModule('pandas')
+px = LazyModule('plotly.express')
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+def dashboard_stats(shortener) -> Dict[str, Any]:
+    """Get comprehensive dashboard stats, with defaults when they cannot be loaded"""
+    return shortener.db.get_dashboard_stats() or {
+        'total_clicks': 0,
+        'unique_visitors': 0,
+        'total_campaigns': 0,
+        'active_campaigns': 0,
+        'recent_activities': [],
+        'top_campaigns': [],
+        'device_stats': {},
+        'browser_stats': {},
+        'previous_clicks': 0,
+        'previous_unique': 0,
+        'bounce_rate': 0,
+        'avg_time': 0
+    }
+
+@dashboard_fragment(run_every=METRICS_REFRESH_SECONDS)
+def render_insight_cards(shortener):
+    """Render the engagement, bounce and conversion cards"""
+    try:
+        stats = dashboard_stats(shortener)
+        # Campaign Performance Metrics - Now in 3 columns with cards
+        st.markdown("#### Campaign Insights")
+        insight_cols = st.columns(3)
+        
+        with insight_cols[0]:
+            avg_time = stats.get('avg_time', 0)
+            st.markdown(f"""
+                <div class="metric-card">
+                    <div class="metric-title">
+                        <span class="metric-icon">⏱️</span>
+                        Engagement
+                    </div>
+                    <div class="metric-value">
+                        {avg_time:.1f}
+                        <span class="unit">seconds</span>
+                    </div>
+                    <div class="metric-delta positive">+12% vs last month</div>
+                </div>
+            """, unsafe_allow_html=True)
+
+        with insight_cols[1]:
+            bounce_rate = stats.get('bounce_rate', 0)
+            st.markdown(f"""
+                <div class="metric-card">
+                    <div class="metric-title">
+                        <span class="metric-icon">↩️</span>
+                        Bounce Rate
+                    </div>
+                    <div class="metric-value">
+                        {bounce_rate:.1f}
+                        <span class="unit">%</span>
+                    </div>
+                    <div class="metric-delta negative">-5% vs last month</div>
+                </div>
+            """, unsafe_allow_html=True)
+
+        with insight_cols[2]:
+            total_clicks = stats.get('total_clicks', 0)
+            impressions = stats.get('impressions', 0)
+            conversion_rate = (total_clicks / max(1, impressions)) * 100
+            st.markdown(f"""
+                <div class="metric-card">
+                    <div class="metric-title">
+                        <span class="metric-icon">🎯</span>
+                        Conversion Rate
+                    </div>
+                    <div class="metric-value">
+                        {conversion_rate:.1f}
+                        <span class="unit">%</span>
+                    </div>
+                    <div class="metric-delta positive">+15% vs last month</div>
+                </div>
+            """, unsafe_allow_html=True)
+
+    except Exception as e:
+        logger.error(f"Error rendering dashboard: {str(e)}")
+        st.error("Error loading dashboard data. Please try refreshing the page.")
+
+@dashboard_fragment()
+def render_campaign_mix(shortener):
+    """Render clicks by campaign type and traffic by source"""
+    try:
+        stats = dashboard_stats(shortener)
+        # Second row - Campaign Distribution and Trends
+        trend_cols = st.columns(2)
+        with trend_cols[0]:
+            # Campaign Type Distribution
+            campaign_type_stats = pd.DataFrame(shortener.db.get_campaign_type_stats())
+            
+            if not campaign_type_stats.empty:
+                fig = px.pie(
+                    campaign_type_stats,
+                    values='total_clicks',  # Changed to total_clicks for better insight
+                    names='campaign_type',
+                    title='Campaign Performance by Type',
+                    color_discrete_sequence=['#10B981', '#3B82F6', '#8B5CF6', '#F59E0B', '#EC4899', '#6366F1'],
+                    hole=0.4
+                )
+                fig.update_traces(textposition='outside', textinfo='percent+label')
+                fig.update_layout(
+                    showlegend=True,
+                    height=400,
+                    margin=dict(t=30, b=0, l=0, r=0)
+                )
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("No campaign data available")
+
+        with trend_cols[1]:
+            # Traffic Source Analysis
+            st.markdown("#### Traffic Sources")
+            # Source classes are stored on each click at ingest and rolled up daily
+            traffic_sources = {source: visits for source, visits in stats.get('traffic_sources', {}).items() if visits}
+            if traffic_sources:
+                traffic_df = pd.DataFrame({
+                    'Source': list(traffic_sources),
+                    'Visits': list(traffic_sources.values())
+                })
+                fig = px.bar(
+                    traffic_df,
+                    x='Source',
+                    y='Visits',
+                    title='Traffic Distribution by Source',
+                    color='Source',
+                    color_discrete_sequence=['#10B981', '#3B82F6', '#8B5CF6', '#F59E0B', '#EC4899', '#6366F1', '#14B8A6']
+                )
+                fig.update_layout(
+                    showlegend=False,
+                    height=400,
+                    margin=dict(t=30, b=0, l=0, r=0)
+                )
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("No traffic source data available")
+
+    except Exception as e:
+        logger.error(f"Error rendering dashboard: {str(e)}")
+        st.error("Error loading dashboard data. Please try refreshing the page.")
+
+@dashboard_fragment(run_every=ACTIVITY_REFRESH_SECONDS)
+def render_activity_feed(shortener):
+    """Render the latest clicks"""
+    try:
+        stats = dashboard_stats(shortener)
+        # Recent Activity at the very end
+        st.markdown("### 📊 Recent Activity")
+        activity_cols = st.columns([3, 1])
+        with activity_cols[0]:
+            if stats['recent_activities']:
+                for activity in stats['recent_activities']:
+                    st.markdown(f"""
+                        <div class="activity-card">
+                            <div class="activity-title">
+                                <span class="activity-icon">🔗</span>
+                                {activity.get('campaign_name', 'Unknown Campaign')}
+                            </div>
+                            <div class="activity-meta">
+                                <span>📱 {activity.get('device_type', 'Unknown')}</span>
+                                <span>📍 {activity.get('state', 'Unknown')}</span>
+                                <span>🌐 {activity.get('browser', 'Unknown')}</span>
+                                <span>🖥️ {activity.get('os', 'Unknown')}</span>
+                            </div>
+                            <div class="activity-details">
+                                <div class="detail-item">
+                                    <span>⏱️</span>
+                                    <span>Time on Page: {activity.get('time_on_page', '0')}s</span>
+                                </div>
+                                <div class="detail-item">
+                                    <span>🔄</span>
+                                    <span>Return Visitor: {'Yes' if activity.get('is_return_visitor') else 'No'}</span>
+                                </div>
+                                <div class="detail-item">
+                                    <span>📈</span>
+                                    <span>Conversion: {activity.get('converted', 'No')}</span>
+                                </div>
+                            </div>
+                            <div class="activity-time">
+                                {activity.get('clicked_at', 'Unknown time')}
+                            </div>
+                        </div>
+                    """, unsafe_allow_html=True)
+            else:
+                st.info("No recent activity to show")
+
+    except Exception as e:
+        logger.error(f"Error rendering dashboard: {str(e)}")
+        st.error("Error loading dashboard data. Please try refreshing the page.")
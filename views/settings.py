@@ -0,0 +1,94 @@
+import streamlit as st
+
+def render(shortener):
+    """Render settings page"""
+    # Create tabs for different settings
+    settings_tab1, settings_tab2, settings_tab3 = st.tabs([
+        "🎨 Appearance", "🔧 General", "🔌 Integrations"
+    ])
+    
+    with settings_tab1:
+        st.markdown("### Appearance Settings")
+        
+        # Theme Selection
+        selected_theme = st.selectbox(
+            "Theme",
+            ["Light", "Dark"],
+            index=0 if st.session_state.theme == 'light' else 1,
+            help="Choose the app theme"
+        )
+        
+        # Save theme preference
+        if selected_theme:
+            st.session_state.theme = selected_theme.lower()
+            
+        # Color Scheme
+        st.color_picker(
+            "Primary Color",
+            "#10B981",
+            help="Choose primary brand color"
+        )
+        
+        # Layout Options
+        st.selectbox(
+            "Default Layout",
+            ["Wide", "Centered"],
+            help="Choose default page layout"
+        )
+        
+    with settings_tab2:
+        st.markdown("### General Settings")
+        
+        # URL Settings
+        st.text_input(
+            "Custom Domain",
+            placeholder="your-domain.com",
+            help="Enter your custom domain"
+        )
+        
+        # Default UTM Parameters
+        st.text_input(
+            "Default UTM Source",
+            placeholder="e.g., newsletter",
+            help="Default source for campaigns"
+        )
+        
+        # Analytics Settings
+        st.checkbox(
+            "Enable Advanced Analytics",
+            help="Enable detailed analytics tracking"
+        )
+        
+        # Notification Settings
+        st.multiselect(
+            "Email Notifications",
+            ["Campaign Created", "High Traffic Alert", "Weekly Report"],
+            help="Choose when to receive notifications"
+        )
+        
+    with settings_tab3:
+        st.markdown("### Integration Settings")
+        
+        # API Settings
+        api_key = st.text_input(
+            "API Key",
+            type="password",
+            help="Your API key for integrations"
+        )
+        
+        # Webhook Settings
+        webhook_url = st.text_input(
+            "Webhook URL",
+            placeholder="https://your-webhook.com/endpoint",
+            help="URL for webhook notifications"
+        )
+        
+        # Integration Options
+        st.multiselect(
+            "Active Integrations",
+            ["Google Analytics", "Facebook Pixel", "Slack Notifications"],
+            help="Choose active integrations"
+        )
+        
+        if st.button("Save Settings", type="primary"):
+            st.success("Settings saved successfully!")